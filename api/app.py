@@ -1,529 +1,632 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from flask import Flask, Response, request, jsonify, g
 import logging
+import math
+import re
+import secrets
 import mysql.connector
 from mysql.connector import Error
-import jwt
-import datetime
-import hashlib
+import threading
+import time
+from functools import partial, wraps
+
+from api.config import DEFAULT_SECRET_KEY, as_dict, configure_logging, load_settings
+from api.db import migrations
+from api.db.instrumented import InstrumentedConnection
+from api.db.jobs import JobQueue, JobWorker
+from api.db.pool import ConnectionPool, PoolError
+from api.db.routing import ReplicaRouter
+from api.tasks import create_handlers
+from api.utils.cache import ResponseCache, create_backend, make_key
+from api.utils.mail import Mailer
+from api.utils.metrics import COUNT_BUCKETS, SIZE_BUCKETS, MetricsRegistry, RequestStats
+from api.utils.passwords import HasherBusyError, PasswordHasher
+from api.utils.ratelimit import AdmissionController, AdmissionRejected, RateLimiter, create_bucket_store
+from api.utils.search_index import SeekerSearchIndex
+from api.utils.tokens import TokenService
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Database configuration for XAMPP
-db_config = {
-    'host': 'localhost',
-    'user': 'freelancer',  # Updated username
-    'password': 'parthiv',  # Updated password
-    'database': 'freelancer',
-    'port': 3308  # Updated port
+# Typed settings from defaults, the FREELANCER_CONFIG file and FREELANCER_*
+# environment variables (see api/config.py), validated once at import
+settings = load_settings()
+
+# Database connection settings
+db_config = as_dict(settings.db)
+
+# Connection pool settings (connections kept idle, burst overflow, seconds)
+pool_config = as_dict(settings.pool)
+
+# Read replicas: each entry in 'replicas' overrides db_config keys (usually 'host'
+# and 'port') for one replica; empty sends every query to the primary. Reads within
+# 'stickiness' seconds of a write by the same user or to the same seeker go to
+# the primary, and replicas more than 'max_lag' seconds behind are skipped
+# (lag is checked every 'check_interval' seconds); keep 'stickiness' at least
+# 'max_lag'. A replica that refuses connections is retried after 'retry_after' seconds, and
+# one whose pool is exhausted is given up on after 'acquire_timeout' seconds.
+replica_config = {
+    'replicas': settings.replicas.hosts,
+    'stickiness': settings.replicas.stickiness,
+    'max_lag': settings.replicas.max_lag,
+    'check_interval': settings.replicas.check_interval,
+    'retry_after': settings.replicas.retry_after,
+    'acquire_timeout': settings.replicas.acquire_timeout
+}
+
+# Token-bucket limits on login and registration, as (requests per minute, burst):
+# per client IP across both, and per email address. Set 'backend' to 'redis'
+# (with a 'url') to share the buckets between workers. 'proxy_hops' is the
+# number of trusted reverse proxies whose X-Forwarded-For entry names the client.
+rate_limit_config = as_dict(settings.rate_limit)
+
+# Admission control for database-bound requests, per worker: at most
+# 'max_inflight' run at once, and the others wait up to 'queue_timeout' seconds
+# for a slot before a 503. Only requests that already hold one of the worker's
+# server.threads get this far, so the wait queue is at most server.threads -
+# max_inflight long and the timeout is what sheds load; requests beyond the
+# threads wait in the server's backlog. The default leaves one thread spare
+# (and stays within the pool).
+admission_config = {
+    'max_inflight': settings.admission.max_inflight or max(1, min(settings.server.threads - 1,
+                                                                   pool_config['size'] + pool_config['max_overflow'])),
+    'queue_timeout': settings.admission.queue_timeout
 }
 
+# Response cache settings; set 'backend' to 'redis' (with a 'url') to share it between workers.
+# *_ttl is how long the server keeps an entry, *_max_age what browsers are told.
+cache_config = as_dict(settings.cache)
+
 # Secret key for JWT
-SECRET_KEY = "freelancer_secret_key"
+SECRET_KEY = settings.jwt.secret_key
+
+# JWT signing keys by key id ('kid'). To rotate: add a new key, point
+# 'active_kid' at it, and drop the old key once its refresh tokens expire.
+# Lifetimes are in seconds; 'cache_size' bounds the decoded-claims cache.
+# Each refresh token is good for one refresh: used ones are remembered in a
+# backend of the response cache's kind until they expire (per worker with
+# 'memory', so use 'redis' when several workers serve the API).
+jwt_config = {
+    'keys': settings.jwt.signing_keys(),
+    'active_kid': settings.jwt.active_kid,
+    'access_ttl': settings.jwt.access_ttl,
+    'refresh_ttl': settings.jwt.refresh_ttl,
+    'cache_size': settings.jwt.cache_size
+}
 
 # ----- DATABASE FUNCTIONS -----
 
-# Helper function to create a database connection
+# Helper function to open a new physical database connection (to the primary unless
+# another server's settings are given)
+def open_connection(config=None):
+    connection = mysql.connector.connect(**(config or db_config))
+    logger.debug("MySQL Database connection successful")
+    return connection
+
+# Helper function to create a standalone (unpooled) database connection
 def create_connection():
     connection = None
     try:
-        connection = mysql.connector.connect(**db_config)
-        logger.info("MySQL Database connection successful")
+        connection = open_connection()
     except Error as e:
         logger.error(f"Error: '{e}'")
     return connection
 
+# Shared pool; connections are opened lazily, so importing this module
+# never touches the database
+db_pool = ConnectionPool(open_connection, name='primary', **pool_config)
+
+# One pool per read replica, sized like the primary's
+replica_pools = [
+    ConnectionPool(partial(open_connection, {**db_config, **replica}), name=f"replica-{number}", **pool_config)
+    for number, replica in enumerate(replica_config['replicas'], start=1)
+]
+
+# ----- METRICS -----
+
+metrics = MetricsRegistry()
+REQUEST_COUNT = metrics.counter('http_requests_total', 'HTTP requests served', ('method', 'route', 'status'))
+REQUEST_LATENCY = metrics.histogram('http_request_duration_seconds', 'HTTP request latency', ('method', 'route'))
+RESPONSE_SIZE = metrics.histogram('http_response_size_bytes', 'HTTP response body size', ('route',), SIZE_BUCKETS)
+SEARCH_LATENCY = metrics.histogram('seeker_search_duration_seconds', '/api/seekers latency by filter combination', ('variant',))
+DB_QUERIES = metrics.histogram('db_queries_per_request', 'Database queries issued per request', ('route',), COUNT_BUCKETS)
+DB_QUERY_LATENCY = metrics.histogram('db_query_duration_seconds', 'Time spent in individual query execute/fetch calls', ('route',))
+DB_ROWS = metrics.counter('db_rows_fetched_total', 'Rows fetched from the database', ('route',))
+POOL_WAIT = metrics.histogram('db_pool_acquire_seconds', 'Time spent waiting to check out a pooled connection')
+metrics.gauge('db_pool_connections', 'Pooled connections by state',
+              lambda: {(state,): db_pool.stats()[state] for state in ('open', 'idle', 'in_use', 'waiting')}, ('state',))
+metrics.gauge('db_pool_checkout_timeouts', 'Checkouts that timed out since the worker started', lambda: db_pool.stats()['timeouts'])
+
+# Helper function to get the database stats collector for the current request
+def request_stats():
+    if 'request_stats' not in g:
+        g.request_stats = RequestStats()
+    return g.request_stats
+
+# Helper function to label metrics with the matched route template rather than the raw path
+def route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+# Helper function to borrow a pooled connection for the current request.
+# read_only=True lets the router use a replica unless one of 'scopes' was
+# written recently. The connection is returned to its pool by release_db() on teardown.
+def get_db(read_only=False, scopes=()):
+    if 'db_connection' in g and g.db_read_only and not read_only:
+        # A write after a replica read in the same request needs the primary
+        release_db()
+    if 'db_connection' not in g:
+        stats = request_stats()
+        started = time.perf_counter()
+        try:
+            g.db_pool, g.db_connection = db_router.acquire(read_only, scopes)
+            g.db_read_only = read_only
+        except (PoolError, Error) as e:
+            logger.error(f"Error: '{e}'")
+            return None
+        finally:
+            waited = time.perf_counter() - started
+            stats.acquire_seconds += waited
+            POOL_WAIT.observe(waited)
+        route = route_label()
+        g.db_handle = InstrumentedConnection(
+            g.db_connection, stats, lambda elapsed: DB_QUERY_LATENCY.observe(elapsed, route=route)
+        )
+    return g.db_handle
+
+# Teardown hook returning the request's connection to the pool
+def release_db(exception=None):
+    g.pop('db_handle', None)
+    connection = g.pop('db_connection', None)
+    if connection is not None:
+        g.pop('db_pool').release(connection, discard=isinstance(exception, Error))
+
+# Helper function to keep the request's connection for a response streamed from the
+# unbuffered 'cursor'. Flask tears the request down as soon as the view returns, so the
+# connection is handed to the response and released when the server closes it.
+# 'finished()' tells whether every row was read: if the stream ended early (the client
+# went away, or a query failed), mysql-connector will neither close the cursor nor reuse
+# the connection until the remaining rows are read, so the connection is dropped instead
+# of reading what may be most of a table.
+def release_with_response(response, cursor, finished):
+    g.pop('db_handle', None)
+    pool, connection = g.pop('db_pool'), g.pop('db_connection')
+
+    def release():
+        discard = not finished()
+        try:
+            cursor.close()
+        except Error as e:
+            logger.debug(f"Closing a streamed cursor with rows unread: {e}")
+            discard = True
+        pool.release(connection, discard=discard)
+
+    response.call_on_close(release)
+    return response
+
 # Function to test database connection
 def test_connection():
-    connection = create_connection()
-    if connection and connection.is_connected():
-        db_info = connection.get_server_info()
-        cursor = connection.cursor()
-        cursor.execute("SELECT DATABASE();")
-        database_name = cursor.fetchone()[0]
-        cursor.close()
-        connection.close()
-        return {
-            "connected": True,
-            "server_info": db_info,
-            "database_name": database_name
-        }
+    try:
+        with db_pool.connection() as connection:
+            db_info = connection.get_server_info()
+            cursor = connection.cursor()
+            cursor.execute("SELECT DATABASE();")
+            database_name = cursor.fetchone()[0]
+            cursor.close()
+            return {
+                "connected": True,
+                "server_info": db_info,
+                "database_name": database_name
+            }
+    except (PoolError, Error) as e:
+        logger.error(f"Error: '{e}'")
     return {"connected": False}
 
-# Function to initialize database tables
-def init_database():
-    logger.info("Starting database initialization...")
-    connection = create_connection()
-    if connection:
+# Readiness probes reuse one result for this many seconds so a busy
+# orchestrator cannot turn health checks into database load
+READINESS_TTL = 2.0
+_readiness = {'checked_at': None, 'ready': False, 'error': None}
+_readiness_lock = threading.Lock()
+
+# Function to check whether this worker can currently serve database traffic
+def check_readiness():
+    with _readiness_lock:
+        checked_at = _readiness['checked_at']
+        if checked_at is not None and time.monotonic() - checked_at < READINESS_TTL:
+            return _readiness['ready'], _readiness['error']
         try:
-            cursor = connection.cursor()
-            
-            # Create provider table
-            logger.info("Creating provider table...")
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS provider (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    phone_number VARCHAR(20) NOT NULL,
-                    email VARCHAR(255) NOT NULL UNIQUE,
-                    password VARCHAR(255) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create seeker table
-            logger.info("Creating seeker table...")
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS seeker (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    phone_number VARCHAR(20) NOT NULL,
-                    email VARCHAR(255) NOT NULL UNIQUE,
-                    skill VARCHAR(255) NOT NULL,
-                    years_of_experience INT NOT NULL,
-                    location VARCHAR(255) NOT NULL,
-                    time_period VARCHAR(50) NOT NULL,
-                    base_price DECIMAL(10, 2) NOT NULL,
-                    rating DECIMAL(3, 1) DEFAULT 0,
-                    reviews INT DEFAULT 0,
-                    password VARCHAR(255) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            connection.commit()
-            logger.info("Database initialization completed successfully")
-            cursor.close()
-            connection.close()
-            return True
-        except Error as e:
-            logger.error(f"Error initializing database: {e}")
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-            return False
-    logger.error("Could not establish database connection for initialization")
-    return False
+            # Reading the schema version doubles as the connectivity check
+            with db_pool.connection(timeout=1) as connection:
+                migrations.check_schema(connection)
+            ready, error = True, None
+        except (PoolError, Error, migrations.SchemaMismatchError) as e:
+            ready, error = False, str(e)
+        _readiness.update(checked_at=time.monotonic(), ready=ready, error=error)
+        return ready, error
+
+# Whether create_app() refuses to start against a database that needs migrations
+CHECK_SCHEMA_ON_STARTUP = settings.server.check_schema_on_startup
+
+# Function to compare the database schema version with the migrations this code ships
+def check_schema():
+    with db_pool.connection(timeout=5) as connection:
+        return migrations.check_schema(connection)
+
+# ----- LOAD SHEDDING -----
+
+rate_limiter = RateLimiter(create_bucket_store(rate_limit_config), rate_limit_config['limits'])
+admission = AdmissionController(**admission_config)
+metrics.gauge('rate_limit_rejected', 'Requests refused by each rate limit since the worker started',
+              lambda: {(name,): count for name, count in rate_limiter.stats()['rejected'].items()}, ('limit',))
+metrics.gauge('admission_requests', 'Database-bound requests running or waiting for admission',
+              lambda: {(state,): admission.stats()[state] for state in ('inflight', 'queued')}, ('state',))
+metrics.gauge('admission_rejected', 'Requests shed by admission control since the worker started',
+              lambda: {(reason,): admission.stats()[f"rejected_{reason}"] for reason in ('timeout',)},
+              ('reason',))
+
+# Endpoints that bypass admission control: they never touch the database, or (readyz)
+# are probes that must keep answering under load
+ADMISSION_EXEMPT = {
+    'system.index', 'system.healthz', 'system.readyz', 'system.prometheus_metrics', 'system.pool_stats',
+    'system.cache_stats', 'tokens.current_user'
+}
+
+# Helper function to find the client address, skipping 'proxy_hops' trusted proxies
+def forwarded_client_ip(remote_addr, forwarded_for):
+    hops = rate_limit_config['proxy_hops']
+    if hops and forwarded_for:
+        chain = [address.strip() for address in forwarded_for.split(',')] + [remote_addr]
+        return chain[max(0, len(chain) - 1 - hops)]
+    return remote_addr
+
+# Function to apply the login/registration limits; returns 0 or the seconds to wait
+def auth_rate_limit_wait(action, client_ip, email):
+    if not rate_limit_config['enabled']:
+        return 0
+    wait = rate_limiter.check('auth_ip', client_ip)
+    if not wait and isinstance(email, str) and email.strip():
+        wait = rate_limiter.check(f"{action}_email", email.strip().lower())
+    return wait
+
+# Helper function to build a load-shedding response telling the client when to retry
+def retry_later(message, status, wait):
+    response = jsonify({"error": message})
+    response.headers['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response, status
+
+# Decorator rate-limiting a login ('login') or registration ('register') route
+def rate_limited(action):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True) or {}
+            client_ip = forwarded_client_ip(request.remote_addr, request.headers.get('X-Forwarded-For'))
+            wait = auth_rate_limit_wait(action, client_ip, data.get('email'))
+            if wait:
+                return retry_later("Too many attempts, please retry later", 429, wait)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ----- CACHE FUNCTIONS -----
+
+response_cache = ResponseCache(create_backend(cache_config))
+
+# Helper function to serve a cache entry, answering 304 when the client's ETag still matches
+def cached_response(entry, max_age):
+    response = Response(entry['body'], mimetype='application/json')
+    response.set_etag(entry['etag'])
+    response.headers['Cache-Control'] = f"public, max-age={max_age}"
+    response.headers.update(entry['headers'])
+    return response.make_conditional(request)
+
+# Helper function to build the search cache key; None disables caching for this request
+def seeker_search_cache_key(*parts):
+    generation = response_cache.generation('seekers')
+    if generation is None:
+        return None
+    return make_key(f"search:{generation}", *parts)
+
+# Function to drop cached data derived from seeker rows after a write
+def invalidate_seeker_cache(seeker_id=None):
+    if seeker_id is not None:
+        response_cache.delete(f"seeker:{seeker_id}")
+        db_router.mark_written(f"seeker:{seeker_id}")
+    # Any search may now match differently, so retire every cached result at once
+    response_cache.bump_generation('seekers')
+    # ...and keep replicas that have not caught up from caching pre-write results again
+    db_router.mark_written('seekers')
+
+# ----- REPLICA ROUTING -----
+
+# Read-your-writes marks use a backend of the response cache's kind (but not
+# its LRU, which could evict them), so with redis a write on one worker pins
+# the writer's next reads on every worker
+db_router = ReplicaRouter(
+    db_pool, replica_pools, marks=create_backend(cache_config),
+    stickiness=replica_config['stickiness'], max_lag=replica_config['max_lag'],
+    check_interval=replica_config['check_interval'], retry_after=replica_config['retry_after'],
+    acquire_timeout=replica_config['acquire_timeout']
+)
+metrics.gauge('db_replica_healthy', 'Whether each read replica is in rotation (1) or not (0)',
+              lambda: {(name,): int(healthy) for name, healthy in db_router.healthy().items()}, ('replica',))
+metrics.gauge('db_reads', 'Read-only checkouts by where they were routed since the worker started',
+              lambda: {(target,): db_router.stats()[f"{target}_reads"] for target in ('replica', 'primary', 'sticky')},
+              ('target',))
+
+# Helper function to name the calling user's read-your-writes scope (None if anonymous)
+def user_scope():
+    if 'user' in g:
+        return f"user:{g.user['type']}:{g.user['id']}"
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    claims = verify_token(token.strip()) if scheme.lower() == 'bearer' and token else None
+    return f"user:{claims['type']}:{claims['sub']}" if claims else None
+
+# Cookie naming the client that made a write, so its anonymous reads (e.g. a search right
+# after registering) see that write too. Browsers only send it to the API from the same
+# origin; a front end served elsewhere reads anonymously from replicas as before.
+STICKY_COOKIE = 'freelancer_rw'
+STICKY_COOKIE_PATTERN = re.compile(r'[A-Za-z0-9_-]{16,64}')
+
+# Helper function to name the calling client's read-your-writes scope from its cookie (None if unset)
+def client_scope():
+    client = request.cookies.get(STICKY_COOKIE, '')
+    return f"client:{client}" if STICKY_COOKIE_PATTERN.fullmatch(client) else None
+
+# Helper function to list the scopes whose recent writes a read must see: the caller's own plus any given
+def read_scopes(*scopes):
+    own = tuple(scope for scope in (user_scope(), client_scope()) if scope)
+    return (*own, *scopes)
+
+# Helper function to pin the calling user's (or a new account's) next reads to the primary,
+# along with those of the client that made the write
+def record_write(scope=None):
+    scope = scope or user_scope()
+    if scope:
+        db_router.mark_written(scope)
+    if not db_router.replicas:
+        return
+    if 'sticky_client' not in g:
+        client = request.cookies.get(STICKY_COOKIE, '')
+        g.sticky_client = client if STICKY_COOKIE_PATTERN.fullmatch(client) else secrets.token_urlsafe(16)
+    db_router.mark_written(f"client:{g.sticky_client}")
+
+# Helper function to tell whether a result read in this request may be cached:
+# a replica read shortly after a seeker write may predate that write
+def cacheable_read():
+    return g.get('db_pool', db_pool) is db_pool or not db_router.is_sticky('seekers')
 
 # ----- AUTH FUNCTIONS -----
 
-# Helper function to hash passwords
+# Password hashing settings. The KDF runs on 'processes' worker processes per
+# server worker (0 hashes in the request thread); at most 'max_pending' hashes
+# run or wait at once, and callers wait 'queue_timeout' seconds for a slot
+# before getting a 503. Raising the cost upgrades stored hashes on next login.
+password_config = as_dict(settings.password)
+
+password_hasher = PasswordHasher(**password_config)
+metrics.gauge('password_hash_queue', 'Password hashes running or waiting for a worker process',
+              lambda: {(state,): password_hasher.stats()[state] for state in ('running', 'queued')}, ('state',))
+metrics.gauge('password_hash_rejected', 'Password hashes refused because the queue was full',
+              lambda: password_hasher.stats()['rejected'])
+
+# Helper function to hash passwords (salted scrypt, computed off the request thread)
 def hash_password(password):
-    # Use a consistent hashing method for both registration and login
-    return hashlib.sha256(password.encode()).hexdigest()
+    return password_hasher.hash(password)
 
-# Helper function to verify password
+# Helper function to verify password; returns (valid, new_hash) where new_hash
+# replaces a legacy SHA-256 or outdated stored hash. Pass None when no account was
+# found: a dummy hash is checked instead, so unknown emails cannot be told apart by timing.
 def verify_password(input_password, stored_password):
-    # Hash the input password and compare with stored hash
-    hashed_input = hash_password(input_password)
-    return hashed_input == stored_password
+    if stored_password is None:
+        password_hasher.verify(input_password, password_hasher.dummy_hash())
+        return False, None
+    return password_hasher.verify(input_password, stored_password)
 
-# Helper function to generate JWT token
+# Helper function to store an upgraded password hash; failure only postpones the upgrade
+def store_password_hash(connection, query, user_id, new_hash):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, (new_hash, user_id))
+        connection.commit()
+    except Error as e:
+        logger.warning(f"Could not upgrade password hash for user {user_id}: {e}")
+    finally:
+        cursor.close()
+
+token_service = TokenService(**jwt_config, spent=create_backend(cache_config))
+metrics.gauge('auth_token_cache', 'Decoded-claims cache entries and lookups since the worker started',
+              lambda: {(field,): token_service.stats()[field] for field in ('cached_tokens', 'cache_hits', 'cache_misses')},
+              ('field',))
+
+# Helper function to generate a short-lived JWT access token
 def generate_token(user_id, user_type):
-    payload = {
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1),
-        'iat': datetime.datetime.utcnow(),
-        'sub': user_id,
-        'type': user_type
+    return token_service.issue_access_token(user_id, user_type)
+
+# Helper function to verify JWT token (claims are cached until the token expires)
+def verify_token(token, token_use='access'):
+    return token_service.verify(token, token_use)
+
+# Helper function to use up a verified refresh token; False if it was already used
+def spend_refresh_token(claims):
+    return token_service.spend(claims)
+
+# Helper function to build the token part of a login or refresh response
+def issue_tokens(user_id, user_type):
+    return {
+        "token": token_service.issue_access_token(user_id, user_type),
+        "refreshToken": token_service.issue_refresh_token(user_id, user_type),
+        "expiresIn": token_service.access_ttl
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
 
-# Helper function to verify JWT token
-def verify_token(token):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+# Decorator for routes that need a logged-in user; sets g.user to {"id", "type", "claims"}.
+# Pass user types (e.g. 'provider') to restrict the route to them.
+def require_auth(*user_types):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Verify at most once per request, even if decorated views call each other
+            if 'user' not in g:
+                header = request.headers.get('Authorization', '')
+                scheme, _, token = header.partition(' ')
+                if scheme.lower() != 'bearer' or not token:
+                    return jsonify({"error": "Authentication required"}), 401
+                claims = verify_token(token.strip())
+                if claims is None:
+                    return jsonify({"error": "Invalid or expired token"}), 401
+                g.user = {"id": int(claims['sub']), "type": claims['type'], "claims": claims}
+            if user_types and g.user['type'] not in user_types:
+                return jsonify({"error": "Not allowed for this account type"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Provider accounts trusted with bulk imports and seekers' contact details; anyone can register
+# as a provider, so the provider role alone is not enough
+ADMIN_PROVIDERS = frozenset(settings.admin.providers)
+
+def is_admin(user):
+    return user['type'] == 'provider' and user['id'] in ADMIN_PROVIDERS
+
+# Decorator for operator-only routes: a provider token whose id is in admin.providers
+def require_admin(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin(g.user):
+            return jsonify({"error": "Administrator access required"}), 403
+        return view(*args, **kwargs)
+    return require_auth('provider')(wrapper)
+
+# ----- SEARCH SETTINGS -----
+
+# Typeahead index over distinct skills and locations, reloaded every 5 minutes
+seeker_search_index = SeekerSearchIndex(ttl=300)
+
+# ----- BACKGROUND JOBS -----
+
+# Follow-up work (notification emails...) is queued in the primary's 'job' table
+# and run by 'workers' job threads in each server worker, or by `python -m api.worker`
+# when 'workers' is 0. A failing job is retried up to 'max_attempts' times, waiting
+# about 'backoff_base' seconds, doubling per attempt up to 'backoff_max'. A job
+# whose worker dies is retried once its 'lease' (seconds) expires.
+job_config = as_dict(settings.jobs)
+
+job_queue = JobQueue(
+    db_pool, max_attempts=job_config['max_attempts'], backoff_base=job_config['backoff_base'],
+    backoff_max=job_config['backoff_max'], lease=job_config['lease'], retention_days=job_config['retention_days']
+)
+job_worker = JobWorker(job_queue, create_handlers(Mailer(**as_dict(settings.mail))),
+                       threads=job_config['workers'], poll_interval=job_config['poll_interval'])
+metrics.gauge('background_jobs', "Jobs run by this worker's job threads since it started, by outcome",
+              lambda: {(outcome,): job_worker.stats()[outcome] for outcome in ('completed', 'retried', 'failed')},
+              ('outcome',))
+
+# Helper function to queue a job in the current request's transaction; it runs
+# only if the request commits, and the job threads are woken once the request ends
+def enqueue_job(cursor, kind, payload=None):
+    job_id = job_queue.enqueue(cursor, kind, payload)
+    g.jobs_enqueued = True
+    return job_id
 
 # ----- MAIN APP SETUP -----
 
 def create_app():
     """Create and configure the Flask app"""
+    # Imported here so tools that only need the settings or helpers (migrations,
+    # benchmarks, the ASGI app) never load them
+    from flask_cors import CORS
+    from api.routes import register_blueprints
+    
+    configure_logging(settings.server.log_level)
+    if SECRET_KEY == DEFAULT_SECRET_KEY and not settings.jwt.keys:
+        logger.warning("Signing tokens with the default development secret; set FREELANCER_JWT_SECRET_KEY")
+    if admission_config['max_inflight'] >= settings.server.threads:
+        logger.warning(f"admission.max_inflight ({admission_config['max_inflight']}) is not below server.threads "
+                       f"({settings.server.threads}); excess requests wait in the server's backlog, where "
+                       f"they are never shed")
+    
+    # Refuse to start against a database that still needs migrations. If it is
+    # unreachable, start anyway: /readyz fails until it is up and up to date.
+    if CHECK_SCHEMA_ON_STARTUP:
+        try:
+            check_schema()
+        except (PoolError, Error) as e:
+            logger.warning(f"Skipping startup schema check, database unavailable: {e}")
+    
     app = Flask(__name__)
-    CORS(app)  # Enable CORS for all routes
+    CORS(app, expose_headers=['X-Next-Cursor', 'ETag', 'Server-Timing'])  # Enable CORS for all routes
+    app.teardown_appcontext(release_db)
     
-    # Root route
-    @app.route('/', methods=['GET'])
-    def index():
-        return jsonify({
-            "message": "Welcome to the Freelancer API",
-            "status": "running",
-            "available_endpoints": [
-                "/api/init-db",
-                "/api/test-db-connection",
-                "/api/provider/register",
-                "/api/provider/login",
-                "/api/seeker/register",
-                "/api/seeker/login",
-                "/api/seeker/<seeker_id>",
-                "/api/seekers"
-            ]
-        }), 200
+    # Shed login/registration load instead of queueing without bound
+    @app.errorhandler(HasherBusyError)
+    def hasher_busy(error):
+        response = jsonify({"error": "Server busy, please retry shortly"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
     
-    # ----- SYSTEM ROUTES -----
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
     
-    @app.route('/api/init-db', methods=['GET'])
-    def init_db():
-        logger.info("Init-db endpoint called")
-        success = init_database()
-        if success:
-            return jsonify({"message": "Database initialized successfully"}), 200
-        else:
-            # Check if database exists first
-            try:
-                test_conn = mysql.connector.connect(
-                    host=db_config['host'],
-                    user=db_config['user'],
-                    password=db_config['password'],
-                    port=db_config['port']
-                )
-                cursor = test_conn.cursor()
-                
-                # Check if database exists
-                cursor.execute(f"SHOW DATABASES LIKE '{db_config['database']}'")
-                result = cursor.fetchone()
-                
-                if not result:
-                    logger.info(f"Database '{db_config['database']}' doesn't exist. Creating it.")
-                    cursor.execute(f"CREATE DATABASE {db_config['database']}")
-                    logger.info(f"Database '{db_config['database']}' created successfully")
-                    cursor.close()
-                    test_conn.close()
-                    
-                    # Try initialization again
-                    success = init_database()
-                    if success:
-                        return jsonify({"message": "Database created and initialized successfully"}), 200
-                else:
-                    cursor.close()
-                    test_conn.close()
-                    
-                return jsonify({
-                    "error": "Database initialization failed", 
-                    "details": "Database exists but tables could not be created. Check permissions and server logs."
-                }), 500
-                
-            except Error as e:
-                logger.error(f"Error checking/creating database: {e}")
-                return jsonify({
-                    "error": "Database initialization failed",
-                    "details": str(e)
-                }), 500
-
-    @app.route('/api/test-db-connection', methods=['GET'])
-    def test_db_connection():
-        result = test_connection()
-        if result["connected"]:
-            return jsonify({
-                "message": "Database connection successful",
-                "server_info": result["server_info"],
-                "database_name": result["database_name"]
-            }), 200
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
+    # Job threads start on a worker's first request, so each forked server worker runs its own
+    @app.before_request
+    def start_job_worker():
+        job_worker.ensure_started()
     
-    # ----- PROVIDER ROUTES -----
+    # Cap concurrent database-bound requests; beyond a short bounded queue, shed load
+    @app.before_request
+    def admit_request():
+        if request.method == 'OPTIONS' or request.endpoint in ADMISSION_EXEMPT:
+            return None
+        try:
+            admission.acquire()
+        except AdmissionRejected as e:
+            return retry_later("Server busy, please retry shortly", 503, e.retry_after)
+        g.admitted = True
     
-    @app.route('/api/provider/register', methods=['POST'])
-    def provider_register():
-        data = request.json
-        name = data.get('name')
-        phone_number = data.get('phone_number')
-        email = data.get('email')
-        password = data.get('password')
-        
-        # Validate required fields
-        if not all([name, phone_number, email, password]):
-            return jsonify({"error": "All fields are required"}), 400
-        
-        # Hash the password
-        hashed_password = hash_password(password)
-        
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                
-                # Check if email already exists
-                cursor.execute("SELECT * FROM provider WHERE email = %s", (email,))
-                if cursor.fetchone():
-                    return jsonify({"error": "Email already registered"}), 400
-                
-                # Insert new provider
-                cursor.execute(
-                    "INSERT INTO provider (name, phone_number, email, password) VALUES (%s, %s, %s, %s)",
-                    (name, phone_number, email, hashed_password)
-                )
-                connection.commit()
-                return jsonify({"message": "Registration successful"}), 201
-            except Error as e:
-                logger.error(f"Error registering provider: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
-
-    @app.route('/api/provider/login', methods=['POST'])
-    def provider_login():
-        data = request.json
-        email = data.get('email')
-        password = data.get('password')
-        
-        # Validate required fields
-        if not all([email, password]):
-            return jsonify({"error": "Email and password are required"}), 400
-        
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor(dictionary=True)
-                
-                # Get the stored password hash
-                cursor.execute(
-                    "SELECT id, name, email, password FROM provider WHERE email = %s",
-                    (email,)
-                )
-                user = cursor.fetchone()
-                
-                if user and verify_password(password, user['password']):
-                    # Generate JWT token
-                    token = generate_token(user['id'], 'provider')
-                    return jsonify({
-                        "message": "Login successful",
-                        "token": token,
-                        "user": {
-                            "id": user['id'],
-                            "name": user['name'],
-                            "email": user['email'],
-                            "userType": "provider"
-                        }
-                    }), 200
-                else:
-                    return jsonify({"error": "Invalid credentials"}), 401
-            except Error as e:
-                logger.error(f"Error during provider login: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
+    # Runs once the response (including a streamed body) is finished
+    @app.teardown_request
+    def release_admission(exception=None):
+        if g.pop('admitted', False):
+            admission.release()
     
-    # ----- SEEKER ROUTES -----
+    # By now the request's transaction is over, so its jobs are visible to the job threads
+    @app.teardown_request
+    def wake_job_worker(exception=None):
+        if g.pop('jobs_enqueued', False):
+            job_worker.wake()
     
-    @app.route('/api/seeker/register', methods=['POST'])
-    def seeker_register():
-        data = request.json
-        name = data.get('name')
-        phone_number = data.get('phone_number')
-        email = data.get('email')
-        skill = data.get('skill')
-        years_of_experience = data.get('years_of_experience')
-        location = data.get('location')
-        time_period = data.get('time_period')
-        base_price = data.get('base_price')
-        password = data.get('password')
-        
-        # Validate required fields
-        if not all([name, phone_number, email, skill, years_of_experience, location, time_period, base_price, password]):
-            return jsonify({"error": "All fields are required"}), 400
-        
-        # Hash the password
-        hashed_password = hash_password(password)
-        
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                
-                # Check if email already exists
-                cursor.execute("SELECT * FROM seeker WHERE email = %s", (email,))
-                if cursor.fetchone():
-                    return jsonify({"error": "Email already registered"}), 400
-                
-                # Insert new seeker
-                cursor.execute(
-                    """INSERT INTO seeker 
-                    (name, phone_number, email, skill, years_of_experience, location, time_period, base_price, password, rating, reviews) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-                    (name, phone_number, email, skill, years_of_experience, location, time_period, base_price, hashed_password, 0, 0)
-                )
-                connection.commit()
-                return jsonify({"message": "Registration successful"}), 201
-            except Error as e:
-                logger.error(f"Error registering seeker: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
-
-    @app.route('/api/seeker/login', methods=['POST'])
-    def seeker_login():
-        data = request.json
-        email = data.get('email')
-        password = data.get('password')
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = route_label()
+        stats = request_stats()
         
-        # Validate required fields
-        if not all([email, password]):
-            return jsonify({"error": "Email and password are required"}), 400
+        REQUEST_COUNT.inc(method=request.method, route=route, status=response.status_code)
+        REQUEST_LATENCY.observe(elapsed, method=request.method, route=route)
+        DB_QUERIES.observe(stats.queries, route=route)
+        if stats.rows:
+            DB_ROWS.inc(stats.rows, route=route)
+        if 'search_variant' in g:
+            SEARCH_LATENCY.observe(elapsed, variant=g.search_variant)
+        # Streamed responses have no length up front; skip them rather than buffering
+        if response.content_length is not None:
+            RESPONSE_SIZE.observe(response.content_length, route=route)
         
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor(dictionary=True)
-                
-                # Get stored password hash too
-                cursor.execute(
-                    "SELECT id, name, email, password, skill, years_of_experience, location, time_period, base_price, rating, reviews FROM seeker WHERE email = %s",
-                    (email,)
-                )
-                user = cursor.fetchone()
-                
-                if user and verify_password(password, user['password']):
-                    # Generate JWT token
-                    token = generate_token(user['id'], 'seeker')
-                    return jsonify({
-                        "message": "Login successful",
-                        "token": token,
-                        "user": {
-                            "id": user['id'],
-                            "name": user['name'],
-                            "email": user['email'],
-                            "skill": user['skill'],
-                            "experience": user['years_of_experience'],
-                            "location": user['location'],
-                            "timePeriod": user['time_period'],
-                            "basePrice": user['base_price'],
-                            "rating": user['rating'],
-                            "reviews": user['reviews'] or 0,
-                            "userType": "seeker"
-                        }
-                    }), 200
-                else:
-                    return jsonify({"error": "Invalid credentials"}), 401
-            except Error as e:
-                logger.error(f"Error during seeker login: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
-
-    @app.route('/api/seeker/<int:seeker_id>', methods=['GET'])
-    def get_seeker(seeker_id):
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor(dictionary=True)
-                cursor.execute(
-                    "SELECT id, name, email, skill, years_of_experience, location, time_period, base_price, rating, reviews FROM seeker WHERE id = %s",
-                    (seeker_id,)
-                )
-                seeker = cursor.fetchone()
-                
-                if seeker:
-                    return jsonify({
-                        "id": seeker['id'],
-                        "name": seeker['name'],
-                        "email": seeker['email'],
-                        "skill": seeker['skill'],
-                        "experience": seeker['years_of_experience'],
-                        "location": seeker['location'],
-                        "timePeriod": seeker['time_period'],
-                        "basePrice": seeker['base_price'],
-                        "rating": seeker['rating'],
-                        "reviews": seeker['reviews'] or 0
-                    }), 200
-                else:
-                    return jsonify({"error": "Seeker not found"}), 404
-            except Error as e:
-                logger.error(f"Error getting seeker profile: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
+        response.headers['Server-Timing'] = stats.server_timing(elapsed)
+        return response
     
-    # ----- SEARCH ROUTES -----
+    # Hand a client that just wrote the cookie its reads are pinned by, for as long as the pin lasts
+    @app.after_request
+    def set_sticky_cookie(response):
+        client = g.get('sticky_client')
+        if client:
+            response.set_cookie(STICKY_COOKIE, client, max_age=math.ceil(db_router.stickiness),
+                                httponly=True, samesite='Lax', secure=request.is_secure)
+        return response
     
-    @app.route('/api/seekers', methods=['GET'])
-    def get_seekers():
-        # Get query parameters
-        skill = request.args.get('skill', '')
-        location = request.args.get('location', '')
-        time_period = request.args.get('time_period', '') or request.args.get('timePeriod', '')
-        rating = request.args.get('rating', '')
-        
-        # Construct the base query
-        query = "SELECT * FROM seeker WHERE 1=1"
-        params = []
-        
-        # Add filters
-        if skill:
-            query += " AND skill LIKE %s"
-            params.append(f"%{skill}%")
-        
-        if location:
-            query += " AND location LIKE %s"
-            params.append(f"%{location}%")
-        
-        if time_period:
-            query += " AND time_period LIKE %s"
-            params.append(f"%{time_period}%")
-        
-        if rating:
-            query += " AND rating >= %s"
-            params.append(rating)
-        
-        connection = create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor(dictionary=True)
-                cursor.execute(query, params)
-                seekers = cursor.fetchall()
-                
-                # Format the data
-                formatted_seekers = []
-                for seeker in seekers:
-                    formatted_seekers.append({
-                        "id": seeker['id'],
-                        "name": seeker['name'],
-                        "skill": seeker['skill'],
-                        "experience": seeker['years_of_experience'],
-                        "location": seeker['location'],
-                        "timePeriod": seeker['time_period'],
-                        "basePrice": seeker['base_price'],
-                        "rating": seeker['rating'],
-                        "reviews": seeker['reviews'] or 0
-                    })
-                
-                return jsonify(formatted_seekers), 200
-            except Error as e:
-                logger.error(f"Error searching seekers: {e}")
-                return jsonify({"error": str(e)}), 500
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
-        else:
-            return jsonify({"error": "Database connection failed"}), 500
+    register_blueprints(app)
     
     return app
 
@@ -0,0 +1,899 @@
+"""ASGI variant of the Freelancer API.
+
+``create_asgi_app()`` serves the same routes and JSON shapes as
+``api.app.create_app()`` but runs every database round trip on an
+``aiomysql`` pool, so one process can keep hundreds of requests in flight
+without a thread per request. Run it with any ASGI server, e.g.::
+
+    uvicorn --factory api.asgi:create_asgi_app --workers 4
+"""
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+
+import aiomysql
+from pymysql import IntegrityError, MySQLError
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from api import app as sync_app
+from api import tasks
+from api.config import configure_logging
+from api.db import migrations, queries
+from api.db.queries import SeekerMatch, SeekerSearch
+from api.routes.bookings import BOOKING_CURSOR_START
+from api.routes.reviews import RETRYABLE_ERRORS, REVIEW_CURSOR_START
+from api.routes.search import AUTOCOMPLETE_LIMIT, SEARCH_STREAM_BATCH
+from api.utils.cache import make_entry
+from api.utils.geo import resolve_point
+from api.utils.jsonstream import dumps
+from api.utils.pagination import decode_cursor, encode_cursor
+from api.utils.passwords import HasherBusyError
+from api.utils.ranking import rank_score
+from api.utils.search_index import SeekerSearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def json_response(payload, status_code=200, headers=None):
+    return Response(dumps(payload), status_code=status_code, headers=headers, media_type='application/json')
+
+
+def cached_response(request, entry, max_age):
+    """Async counterpart of ``api.app.cached_response`` (ETag + 304 handling)."""
+    etag = f'"{entry["etag"]}"'
+    headers = {'ETag': etag, 'Cache-Control': f"public, max-age={max_age}", **entry['headers']}
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+        return Response(status_code=304, headers=headers)
+    return Response(entry['body'], headers=headers, media_type='application/json')
+
+
+async def create_db_pool():
+    """Open the aiomysql pool using the same settings as the sync pool."""
+    db_config = sync_app.db_config
+    pool_config = sync_app.pool_config
+    return await aiomysql.create_pool(
+        host=db_config['host'],
+        port=db_config['port'],
+        user=db_config['user'],
+        password=db_config['password'],
+        db=db_config['database'],
+        minsize=0,
+        maxsize=pool_config['size'] + pool_config['max_overflow'],
+        pool_recycle=pool_config['recycle'],
+        # Reads never leave a transaction open, so connections go straight back to the pool
+        autocommit=True
+    )
+
+
+async def fetchone(pool, query, params=()):
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchone()
+
+
+async def fetchall(pool, query, params=()):
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
+
+async def stream_batches(pool, query, params=(), size=500):
+    """Yield lists of rows from a server-side (unbuffered) cursor, ``size`` rows at a time."""
+    async with pool.acquire() as connection:
+        async with connection.cursor(aiomysql.SSDictCursor) as cursor:
+            await cursor.execute(query, params)
+            while True:
+                rows = await cursor.fetchmany(size)
+                if not rows:
+                    return
+                yield rows
+
+
+async def check_schema(pool):
+    """Async counterpart of ``api.app.check_schema``; raises ``SchemaMismatchError`` if migrations are pending."""
+    try:
+        row = await fetchone(pool, f"SELECT MAX(version) AS version FROM {migrations.MIGRATIONS_TABLE}")
+        version = (row['version'] if row else None) or 0
+    except MySQLError as e:
+        if not e.args or e.args[0] != 1146:  # ER_NO_SUCH_TABLE: never migrated
+            raise
+        version = 0
+    if version < migrations.LATEST_VERSION:
+        raise migrations.SchemaMismatchError(version, migrations.LATEST_VERSION)
+    return version
+
+
+async def execute(pool, query, params=()):
+    """Run a write statement and return ``lastrowid``."""
+    async with pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, params)
+            return cursor.lastrowid
+
+
+@asynccontextmanager
+async def transaction(pool):
+    """A pooled connection in an explicit transaction; whatever the block does not commit is rolled back."""
+    async with pool.acquire() as connection:
+        await connection.begin()
+        try:
+            yield connection
+        finally:
+            await connection.rollback()
+
+
+def create_asgi_app():
+    """Create and configure the ASGI app"""
+    configure_logging(sync_app.settings.server.log_level)
+    cache_config = sync_app.cache_config
+    response_cache = sync_app.response_cache
+    seeker_search_index = sync_app.seeker_search_index
+    index_lock = asyncio.Lock()
+    # Probe results are reused for sync_app.READINESS_TTL seconds, as in the sync app
+    readiness = {'checked_at': None, 'ready': False, 'error': None}
+    readiness_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.pool = await create_db_pool()
+        # Queued jobs run on the sync app's job threads, with their own pooled connections
+        sync_app.job_worker.ensure_started()
+        if sync_app.CHECK_SCHEMA_ON_STARTUP:
+            try:
+                await check_schema(app.state.pool)
+            except (MySQLError, OSError) as e:
+                logger.warning(f"Skipping startup schema check, database unavailable: {e}")
+        try:
+            yield
+        finally:
+            await run_in_threadpool(sync_app.job_worker.stop, 10)
+            app.state.pool.close()
+            await app.state.pool.wait_closed()
+
+    async def read_json(request):
+        try:
+            data = await request.json()
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    # Root route
+    async def index(request):
+        return json_response({
+            "message": "Welcome to the Freelancer API",
+            "status": "running",
+            "available_endpoints": [
+                "/api/init-db",
+                "/api/test-db-connection",
+                "/api/provider/register",
+                "/api/provider/login",
+                "/api/seeker/register",
+                "/api/seeker/login",
+                "/api/seeker/<seeker_id>",
+                "/api/seekers/batch",
+                "/api/seeker/<seeker_id>/reviews",
+                "/api/seekers",
+                "/api/seekers/autocomplete",
+                "/api/seekers/match",
+                "/api/seeker/<seeker_id>/slots",
+                "/api/bookings",
+                "/api/bookings/<booking_id>",
+                "/api/bookings/<booking_id>/cancel",
+                "/api/token/refresh",
+                "/api/me",
+                "/api/pool-stats",
+                "/api/cache-stats",
+                "/healthz",
+                "/readyz"
+            ]
+        })
+
+    # ----- SYSTEM ROUTES -----
+
+    # Read-only, as in the sync app: migrations run from `python -m api.migrate`
+    async def init_db(request):
+        try:
+            version = await check_schema(request.app.state.pool)
+        except migrations.SchemaMismatchError as e:
+            return json_response({"error": "Database schema is out of date", "details": str(e)}, 503)
+        except (MySQLError, OSError) as e:
+            logger.error(f"Error checking schema version: {e}")
+            return json_response({"error": "Database connection failed", "details": str(e)}, 500)
+        return json_response({"message": "Database schema is up to date", "version": version})
+
+    async def test_db_connection(request):
+        try:
+            row = await fetchone(request.app.state.pool, "SELECT VERSION() AS version, DATABASE() AS name")
+        except MySQLError as e:
+            logger.error(f"Error: '{e}'")
+            return json_response({"error": "Database connection failed"}, 500)
+        return json_response({
+            "message": "Database connection successful",
+            "server_info": row['version'],
+            "database_name": row['name']
+        })
+
+    async def healthz(request):
+        return json_response({"status": "alive"})
+
+    # Counterpart of sync_app.check_readiness; concurrent probes wait for one check
+    async def check_readiness(pool):
+        async with readiness_lock:
+            checked_at = readiness['checked_at']
+            if checked_at is not None and time.monotonic() - checked_at < sync_app.READINESS_TTL:
+                return readiness['ready'], readiness['error']
+            try:
+                await asyncio.wait_for(check_schema(pool), timeout=1)
+                ready, error = True, None
+            except (MySQLError, OSError, asyncio.TimeoutError, migrations.SchemaMismatchError) as e:
+                ready, error = False, str(e)
+            readiness.update(checked_at=time.monotonic(), ready=ready, error=error)
+            return ready, error
+
+    async def readyz(request):
+        ready, error = await check_readiness(request.app.state.pool)
+        if ready:
+            return json_response({"status": "ready"})
+        return json_response({"status": "unavailable", "error": error}, 503)
+
+    async def pool_stats(request):
+        pool = request.app.state.pool
+        return json_response({
+            "name": "primary-async",
+            "open": pool.size,
+            "idle": pool.freesize,
+            "in_use": pool.size - pool.freesize,
+            "max_size": pool.maxsize
+        })
+
+    async def cache_stats(request):
+        return json_response(response_cache.stats())
+
+    # ----- PROVIDER ROUTES -----
+
+    # Login/registration limits shared with the sync app; returns a 429 response, or None to proceed
+    async def rate_limited(request, action, data):
+        client_ip = sync_app.forwarded_client_ip(request.client.host if request.client else '',
+                                                 request.headers.get('x-forwarded-for'))
+        # The bucket store may be Redis, so keep it off the event loop
+        wait = await run_in_threadpool(sync_app.auth_rate_limit_wait, action, client_ip, data.get('email'))
+        if wait:
+            return json_response({"error": "Too many attempts, please retry later"}, 429,
+                                 {'Retry-After': str(max(1, math.ceil(wait)))})
+        return None
+
+    # Autocommit queues the job just after the account rather than in one transaction
+    # with it; if that fails the account stands and only the email is lost
+    async def enqueue_welcome_email(pool, email, name, user_type):
+        payload = {"email": email, "name": name, "userType": user_type}
+        try:
+            await execute(pool, queries.JOB_INSERT, sync_app.job_queue.insert_params(tasks.WELCOME_EMAIL, payload))
+        except MySQLError as e:
+            logger.warning(f"Could not queue welcome email for new {user_type}: {e}")
+            return
+        sync_app.job_worker.wake()
+
+    async def provider_register(request):
+        data = await read_json(request) or {}
+        limited = await rate_limited(request, 'register', data)
+        if limited:
+            return limited
+        name = data.get('name')
+        phone_number = data.get('phone_number')
+        email = data.get('email')
+        password = data.get('password')
+
+        # Validate required fields
+        if not all([name, phone_number, email, password]):
+            return json_response({"error": "All fields are required"}, 400)
+
+        pool = request.app.state.pool
+        try:
+            if await fetchone(pool, queries.PROVIDER_EMAIL_EXISTS, (email,)):
+                return json_response({"error": "Email already registered"}, 400)
+            hashed_password = await run_in_threadpool(sync_app.hash_password, password)
+            await execute(pool, queries.PROVIDER_INSERT, (name, phone_number, email, hashed_password))
+            await enqueue_welcome_email(pool, email, name, 'provider')
+        except MySQLError as e:
+            logger.error(f"Error registering provider: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response({"message": "Registration successful"}, 201)
+
+    async def login(request, query, set_password_query, user_type):
+        data = await read_json(request) or {}
+        limited = await rate_limited(request, 'login', data)
+        if limited:
+            return limited
+        email = data.get('email')
+        password = data.get('password')
+
+        # Validate required fields
+        if not all([email, password]):
+            return json_response({"error": "Email and password are required"}, 400)
+
+        try:
+            user = await fetchone(request.app.state.pool, query, (email,))
+        except MySQLError as e:
+            logger.error(f"Error during {user_type} login: {e}")
+            return json_response({"error": str(e)}, 500)
+
+        # Unknown emails still pay for a hash (see sync_app.verify_password)
+        valid, new_hash = await run_in_threadpool(sync_app.verify_password, password,
+                                                  user['password'] if user else None)
+        if valid:
+            if new_hash:
+                try:
+                    await execute(request.app.state.pool, set_password_query, (new_hash, user['id']))
+                except MySQLError as e:
+                    logger.warning(f"Could not upgrade password hash for user {user['id']}: {e}")
+            tokens = sync_app.issue_tokens(user['id'], user_type)
+            return json_response(queries.format_login(tokens, user, user_type))
+        return json_response({"error": "Invalid credentials"}, 401)
+
+    async def provider_login(request):
+        return await login(request, queries.PROVIDER_LOGIN, queries.PROVIDER_SET_PASSWORD, 'provider')
+
+    # ----- SEEKER ROUTES -----
+
+    async def seeker_register(request):
+        data = await read_json(request) or {}
+        limited = await rate_limited(request, 'register', data)
+        if limited:
+            return limited
+        name = data.get('name')
+        phone_number = data.get('phone_number')
+        email = data.get('email')
+        skill = data.get('skill')
+        years_of_experience = data.get('years_of_experience')
+        location = data.get('location')
+        time_period = data.get('time_period')
+        base_price = data.get('base_price')
+        password = data.get('password')
+
+        # Validate required fields
+        if not all([name, phone_number, email, skill, years_of_experience, location, time_period, base_price, password]):
+            return json_response({"error": "All fields are required"}, 400)
+        try:
+            point = resolve_point(location, data.get('latitude'), data.get('longitude'))
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+        try:
+            score = rank_score(0, 0, int(years_of_experience))
+        except (TypeError, ValueError):
+            return json_response({"error": "years_of_experience must be an integer"}, 400)
+
+        pool = request.app.state.pool
+        try:
+            if await fetchone(pool, queries.SEEKER_EMAIL_EXISTS, (email,)):
+                return json_response({"error": "Email already registered"}, 400)
+            hashed_password = await run_in_threadpool(sync_app.hash_password, password)
+            seeker_id = await execute(pool, queries.SEEKER_INSERT, (
+                name, phone_number, email, skill, years_of_experience, location, time_period, base_price,
+                hashed_password, 0, 0, *point, score
+            ))
+            await enqueue_welcome_email(pool, email, name, 'seeker')
+        except MySQLError as e:
+            logger.error(f"Error registering seeker: {e}")
+            return json_response({"error": str(e)}, 500)
+        sync_app.invalidate_seeker_cache(seeker_id)
+        seeker_search_index.add_seeker(skill, location)
+        return json_response({"message": "Registration successful"}, 201)
+
+    async def seeker_login(request):
+        return await login(request, queries.SEEKER_LOGIN, queries.SEEKER_SET_PASSWORD, 'seeker')
+
+    async def get_seeker(request):
+        seeker_id = request.path_params['seeker_id']
+        cache_key = f"seeker:{seeker_id}"
+        entry = response_cache.get(cache_key)
+        if entry:
+            return cached_response(request, entry, cache_config['profile_max_age'])
+
+        try:
+            seeker = await fetchone(request.app.state.pool, queries.SEEKER_PROFILE, (seeker_id,))
+        except MySQLError as e:
+            logger.error(f"Error getting seeker profile: {e}")
+            return json_response({"error": str(e)}, 500)
+        if not seeker:
+            return json_response({"error": "Seeker not found"}, 404)
+
+        entry = make_entry(dumps(queries.format_seeker_profile(seeker)))
+        response_cache.set(cache_key, entry, cache_config['profile_ttl'])
+        return cached_response(request, entry, cache_config['profile_max_age'])
+
+    async def get_seekers_batch(request):
+        if request.method == 'POST':
+            try:
+                data = await request.json()
+            except ValueError:
+                data = None
+            ids = data.get('ids') if isinstance(data, dict) else data
+        else:
+            ids = request.query_params.get('ids', '')
+        try:
+            seeker_ids = queries.parse_seeker_ids(ids)
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+
+        keys = [f"seeker:{seeker_id}" for seeker_id in seeker_ids]
+        entries = response_cache.get_many(keys)
+        uncached = [seeker_id for seeker_id, key in zip(seeker_ids, keys) if key not in entries]
+        if uncached:
+            query = queries.SEEKER_PROFILES.format(placeholders=', '.join(['%s'] * len(uncached)))
+            try:
+                seekers = await fetchall(request.app.state.pool, query, uncached)
+            except MySQLError as e:
+                logger.error(f"Error getting seeker profiles: {e}")
+                return json_response({"error": str(e)}, 500)
+            for seeker in seekers:
+                key = f"seeker:{seeker['id']}"
+                entries[key] = make_entry(dumps(queries.format_seeker_profile(seeker)))
+                response_cache.set(key, entries[key], cache_config['profile_ttl'])
+
+        profiles = [entries[key]['body'] for key in keys if key in entries]
+        missing = [seeker_id for seeker_id, key in zip(seeker_ids, keys) if key not in entries]
+        entry = make_entry(queries.render_seeker_batch(profiles, missing))
+        return cached_response(request, entry, cache_config['profile_max_age'])
+
+    # ----- TOKEN ROUTES -----
+
+    async def refresh_token(request):
+        data = await read_json(request) or {}
+        claims = sync_app.verify_token(data.get('refreshToken', ''), token_use='refresh')
+        if claims is None or claims.get('type') not in queries.ACCOUNT_EXISTS:
+            return json_response({"error": "Invalid or expired refresh token"}, 401)
+        try:
+            account = await fetchone(request.app.state.pool, queries.ACCOUNT_EXISTS[claims['type']], (claims['sub'],))
+        except MySQLError as e:
+            logger.error(f"Error refreshing token: {e}")
+            return json_response({"error": str(e)}, 500)
+        if not account:
+            return json_response({"error": "Account no longer exists"}, 401)
+        if not sync_app.spend_refresh_token(claims):
+            return json_response({"error": "Refresh token was already used"}, 401)
+        return json_response(sync_app.issue_tokens(claims['sub'], claims['type']))
+
+    # Counterpart of sync_app.require_auth: returns (user, None), or (None, an error response)
+    def authenticate(request, *user_types):
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return None, json_response({"error": "Authentication required"}, 401)
+        claims = sync_app.verify_token(token.strip())
+        if claims is None:
+            return None, json_response({"error": "Invalid or expired token"}, 401)
+        if user_types and claims['type'] not in user_types:
+            return None, json_response({"error": "Not allowed for this account type"}, 403)
+        return {"id": int(claims['sub']), "type": claims['type'], "claims": claims}, None
+
+    async def current_user(request):
+        user, error = authenticate(request)
+        if error:
+            return error
+        claims = user['claims']
+        return json_response({"id": user['id'], "userType": claims['type'], "expiresAt": claims['exp']})
+
+    # ----- SEARCH ROUTES -----
+
+    async def get_seekers(request):
+        try:
+            search = SeekerSearch(request.query_params)
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+        if search.stream:
+            return stream_seekers(request, search)
+
+        cache_key = sync_app.seeker_search_cache_key(*search.cache_parts())
+        if cache_key:
+            entry = response_cache.get(cache_key)
+            if entry:
+                return cached_response(request, entry, cache_config['search_max_age'])
+
+        query, params = search.sql()
+        try:
+            rows = await fetchall(request.app.state.pool, query, params)
+        except MySQLError as e:
+            logger.error(f"Error searching seekers: {e}")
+            return json_response({"error": str(e)}, 500)
+
+        seekers, headers = search.page(rows)
+        entry = make_entry(dumps(seekers), headers)
+        if cache_key:
+            response_cache.set(cache_key, entry, cache_config['search_ttl'])
+        return cached_response(request, entry, cache_config['search_max_age'])
+
+    def stream_seekers(request, search):
+        query, params = search.sql()
+
+        async def generate():
+            batches = stream_batches(request.app.state.pool, query, params, SEARCH_STREAM_BATCH)
+            try:
+                if search.stream == 'json':
+                    yield '['
+                separator = ''
+                async for rows in batches:
+                    if search.stream == 'ndjson':
+                        yield ''.join(dumps(search.format_row(row)) + '\n' for row in rows)
+                    else:
+                        yield separator + ','.join(dumps(search.format_row(row)) for row in rows)
+                        separator = ','
+                if search.stream == 'json':
+                    yield ']'
+            except MySQLError as e:
+                # Headers are already sent; all we can do is end the stream early
+                logger.error(f"Error streaming seekers: {e}")
+
+        media_type = 'application/x-ndjson' if search.stream == 'ndjson' else 'application/json'
+        return StreamingResponse(generate(), media_type=media_type)
+
+    async def autocomplete_seekers(request):
+        field = request.query_params.get('field', 'skill')
+        text = request.query_params.get('q', '')
+        if field not in SeekerSearchIndex.FIELDS:
+            return json_response({"error": f"field must be one of: {', '.join(SeekerSearchIndex.FIELDS)}"}, 400)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)), 50))
+        except ValueError:
+            return json_response({"error": "limit must be an integer"}, 400)
+
+        if seeker_search_index.is_stale() and not index_lock.locked():
+            async with index_lock:
+                try:
+                    async with request.app.state.pool.acquire() as connection:
+                        async with connection.cursor() as cursor:
+                            await cursor.execute(queries.SEEKER_TERMS)
+                            seeker_search_index.rebuild(await cursor.fetchall())
+                except MySQLError as e:
+                    # Serve whatever the index already holds rather than failing typeahead
+                    logger.error(f"Error refreshing search index: {e}")
+
+        suggestions = seeker_search_index.complete(field, text, limit)
+        return json_response([{"value": value, "count": count} for value, count in suggestions])
+
+    # ----- REVIEW ROUTES -----
+    # Same rules as api/routes/reviews.py
+
+    # Counterpart of api.routes.reviews.save_review on an aiomysql cursor
+    async def save_review(cursor, seeker_id, provider_id, rating, comment):
+        await cursor.execute(queries.SEEKER_EXISTS_FOR_UPDATE, (seeker_id,))
+        if not await cursor.fetchone():
+            return None
+
+        # Lock this provider's existing review, if any, so concurrent edits fold in once
+        await cursor.execute(queries.REVIEW_FOR_UPDATE, (seeker_id, provider_id))
+        existing = await cursor.fetchone()
+        if existing:
+            await cursor.execute(queries.REVIEW_UPDATE, (rating, comment, existing['id']))
+            review_id = existing['id']
+            stars, count = rating - existing['rating'], 0
+        else:
+            await cursor.execute(queries.REVIEW_INSERT, (seeker_id, provider_id, rating, comment))
+            review_id = cursor.lastrowid
+            stars, count = rating, 1
+        await cursor.execute(queries.SEEKER_ADD_REVIEW, (stars, count, stars, count, stars, count, seeker_id))
+        return review_id, existing
+
+    async def review_seeker(request):
+        seeker_id = request.path_params['seeker_id']
+        user, error = authenticate(request, 'provider')
+        if error:
+            return error
+        data = await read_json(request) or {}
+        rating = data.get('rating')
+        comment = data.get('comment')
+        if isinstance(rating, bool) or not isinstance(rating, int) or not 1 <= rating <= 5:
+            return json_response({"error": "rating must be an integer from 1 to 5"}, 400)
+        if comment is not None and not isinstance(comment, str):
+            return json_response({"error": "comment must be a string"}, 400)
+
+        # One transaction: the review, the seeker's totals and the notification job commit together.
+        # Returns (existing review or None, the seeker's new rating), or None if the seeker does not exist.
+        async def review_in_transaction():
+            async with transaction(request.app.state.pool) as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    saved = await save_review(cursor, seeker_id, user['id'], rating, comment)
+                    if saved is None:
+                        return None
+                    review_id, existing = saved
+                    payload = {"reviewId": review_id, "updated": bool(existing)}
+                    await cursor.execute(queries.JOB_INSERT,
+                                         sync_app.job_queue.insert_params(tasks.REVIEW_EMAIL, payload))
+                    await connection.commit()
+                    await cursor.execute(queries.SEEKER_RATING, (seeker_id,))
+                    return existing, await cursor.fetchone()
+
+        try:
+            try:
+                reviewed = await review_in_transaction()
+            except MySQLError as e:
+                if e.args[0] not in RETRYABLE_ERRORS:
+                    raise
+                # Chosen as a deadlock victim or timed out on a lock; start over once
+                logger.warning(f"Retrying review of seeker {seeker_id}: {e}")
+                reviewed = await review_in_transaction()
+        except IntegrityError as e:
+            # Lost a race with a concurrent first review from the same provider
+            logger.error(f"Conflicting review of seeker {seeker_id}: {e}")
+            return json_response({"error": "Review was modified concurrently, please retry"}, 409)
+        except MySQLError as e:
+            if e.args[0] in RETRYABLE_ERRORS:
+                logger.error(f"Review of seeker {seeker_id} lost a lock again: {e}")
+                return json_response({"error": "Review was modified concurrently, please retry"}, 409)
+            logger.error(f"Error reviewing seeker: {e}")
+            return json_response({"error": str(e)}, 500)
+        if reviewed is None:
+            return json_response({"error": "Seeker not found"}, 404)
+        existing, seeker = reviewed
+        sync_app.job_worker.wake()
+        sync_app.invalidate_seeker_cache(seeker_id)
+        return json_response({
+            "message": "Review updated" if existing else "Review added",
+            "rating": seeker['rating'],
+            "reviews": seeker['reviews']
+        }, 200 if existing else 201)
+
+    async def get_seeker_reviews(request):
+        seeker_id = request.path_params['seeker_id']
+        params = request.query_params
+        try:
+            limit = max(1, min(int(params.get('limit', queries.REVIEW_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+        except ValueError:
+            return json_response({"error": "limit must be an integer"}, 400)
+        before = REVIEW_CURSOR_START
+        if params.get('cursor'):
+            try:
+                before = int(decode_cursor(params['cursor'], 'reviews')[0])
+            except (TypeError, ValueError):
+                return json_response({"error": "Invalid cursor"}, 400)
+
+        try:
+            async with request.app.state.pool.acquire() as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(queries.SEEKER_EXISTS, (seeker_id,))
+                    if not await cursor.fetchone():
+                        return json_response({"error": "Seeker not found"}, 404)
+                    # Fetch one extra row to learn whether another page follows
+                    await cursor.execute(queries.REVIEW_LIST, (seeker_id, before, limit + 1))
+                    rows = await cursor.fetchall()
+        except MySQLError as e:
+            logger.error(f"Error listing seeker reviews: {e}")
+            return json_response({"error": str(e)}, 500)
+        headers = {}
+        if len(rows) > limit:
+            headers['X-Next-Cursor'] = encode_cursor('reviews', [rows[limit - 1]['id']])
+        return json_response([queries.format_review(row) for row in rows[:limit]], headers=headers)
+
+    # ----- BOOKING ROUTES -----
+    # Same rules as api/routes/bookings.py; writes run in explicit transactions on the autocommit pool
+
+    async def add_slots(request):
+        seeker_id = request.path_params['seeker_id']
+        user, error = authenticate(request, 'seeker')
+        if error:
+            return error
+        if user['id'] != seeker_id:
+            return json_response({"error": "Seekers can only publish their own availability"}, 403)
+        data = await read_json(request) or {}
+
+        try:
+            async with transaction(request.app.state.pool) as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(queries.SEEKER_TIME_PERIOD_FOR_UPDATE, (seeker_id,))
+                    seeker = await cursor.fetchone()
+                    if not seeker:
+                        return json_response({"error": "Seeker not found"}, 404)
+                    try:
+                        slots = queries.parse_slots(data.get('slots'), seeker[0])
+                    except ValueError as e:
+                        return json_response({"error": str(e)}, 400)
+
+                    await cursor.execute(queries.SLOT_OVERLAPPING,
+                                         (seeker_id, max(slot[2] for slot in slots), slots[0][1]))
+                    new, conflicts = queries.split_new_slots(slots, await cursor.fetchall())
+                    if conflicts:
+                        return json_response({
+                            "error": f"The slot starting {conflicts[0][1]} overlaps an existing slot",
+                            "conflicts": [{"startsAt": slot[1], "endsAt": slot[2]} for slot in conflicts]
+                        }, 409)
+                    if new:
+                        await cursor.executemany(queries.SLOT_INSERT, [(seeker_id, *slot) for slot in new])
+                    await connection.commit()
+        except MySQLError as e:
+            logger.error(f"Error adding availability slots: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response({"created": len(new), "skipped": len(data['slots']) - len(new)}, 201)
+
+    async def get_slots(request):
+        params = request.query_params
+        try:
+            start, end = queries.parse_slot_window(params)
+            limit = max(1, min(int(params.get('limit', queries.SLOT_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+        query = queries.SLOT_LIST if params.get('status') == 'all' else queries.SLOT_LIST_OPEN
+
+        try:
+            slots = await fetchall(request.app.state.pool, query,
+                                   (request.path_params['seeker_id'], start, end, limit))
+        except MySQLError as e:
+            logger.error(f"Error listing availability slots: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response([queries.format_slot(slot) for slot in slots])
+
+    async def match_seekers(request):
+        try:
+            match = SeekerMatch(request.query_params)
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+
+        query, params = match.sql()
+        try:
+            async with request.app.state.pool.acquire() as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(query, params)
+                    rows = await cursor.fetchall()
+                    slots = []
+                    if rows:
+                        await cursor.execute(*match.next_slots_sql(rows))
+                        slots = await cursor.fetchall()
+        except MySQLError as e:
+            logger.error(f"Error matching seekers: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response(match.format_rows(rows, slots))
+
+    async def book_slot(request):
+        user, error = authenticate(request, 'provider')
+        if error:
+            return error
+        data = await read_json(request) or {}
+        slot_id = data.get('slotId')
+        if isinstance(slot_id, bool) or not isinstance(slot_id, int):
+            return json_response({"error": "slotId must be an integer"}, 400)
+
+        try:
+            async with transaction(request.app.state.pool) as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(queries.SLOT_FOR_BOOKING, (slot_id,))
+                    slot = await cursor.fetchone()
+                    if not slot:
+                        return json_response({"error": "Slot not found"}, 404)
+                    if slot['status'] != 'open':
+                        return json_response({"error": "Slot is already booked"}, 409)
+                    now = queries.utc_now()
+                    if str(slot['starts_at']) <= now:
+                        return json_response({"error": "Slot has already started"}, 409)
+
+                    await cursor.execute(queries.SLOT_CLAIM, (slot_id, slot['version'], now))
+                    if cursor.rowcount != 1:
+                        return json_response({"error": "Slot is already booked"}, 409)
+                    await cursor.execute(queries.BOOKING_INSERT,
+                                         (slot_id, slot['seeker_id'], user['id'], slot['base_price']))
+                    booking_id = cursor.lastrowid
+                    await connection.commit()
+
+                    await cursor.execute(queries.BOOKING_GET, (booking_id,))
+                    booking = await cursor.fetchone()
+        except IntegrityError as e:
+            # The unique (slot_id, active) key caught a second confirmed booking
+            logger.warning(f"Conflicting booking of slot {slot_id}: {e}")
+            return json_response({"error": "Slot is already booked"}, 409)
+        except MySQLError as e:
+            logger.error(f"Error booking slot: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response(queries.format_booking(booking), 201)
+
+    def is_party(booking, user):
+        return booking[f"{user['type']}_id"] == user['id']
+
+    async def get_bookings(request):
+        user, error = authenticate(request)
+        if error:
+            return error
+        params = request.query_params
+        try:
+            limit = max(1, min(int(params.get('limit', queries.BOOKING_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+        except ValueError:
+            return json_response({"error": "limit must be an integer"}, 400)
+        before = BOOKING_CURSOR_START
+        if params.get('cursor'):
+            try:
+                before = int(decode_cursor(params['cursor'], 'bookings')[0])
+            except (TypeError, ValueError):
+                return json_response({"error": "Invalid cursor"}, 400)
+        query = queries.BOOKING_LIST.format(owner=f"{user['type']}_id")
+
+        try:
+            # Fetch one extra row to learn whether another page follows
+            rows = await fetchall(request.app.state.pool, query, (user['id'], before, limit + 1))
+        except MySQLError as e:
+            logger.error(f"Error listing bookings: {e}")
+            return json_response({"error": str(e)}, 500)
+        headers = {}
+        if len(rows) > limit:
+            headers['X-Next-Cursor'] = encode_cursor('bookings', [rows[limit - 1]['id']])
+        return json_response([queries.format_booking(row) for row in rows[:limit]], headers=headers)
+
+    async def get_booking(request):
+        user, error = authenticate(request)
+        if error:
+            return error
+        try:
+            booking = await fetchone(request.app.state.pool, queries.BOOKING_GET, (request.path_params['booking_id'],))
+        except MySQLError as e:
+            logger.error(f"Error getting booking: {e}")
+            return json_response({"error": str(e)}, 500)
+        if not booking or not is_party(booking, user):
+            return json_response({"error": "Booking not found"}, 404)
+        return json_response(queries.format_booking(booking))
+
+    async def cancel_booking(request):
+        user, error = authenticate(request)
+        if error:
+            return error
+        booking_id = request.path_params['booking_id']
+        try:
+            async with transaction(request.app.state.pool) as connection:
+                async with connection.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute(queries.BOOKING_GET, (booking_id,))
+                    booking = await cursor.fetchone()
+                    if not booking or not is_party(booking, user):
+                        return json_response({"error": "Booking not found"}, 404)
+                    await cursor.execute(queries.BOOKING_CANCEL, (booking_id,))
+                    if cursor.rowcount != 1:
+                        return json_response({"error": "Booking is already cancelled"}, 409)
+                    await cursor.execute(queries.SLOT_RELEASE, (booking['slot_id'],))
+                    await connection.commit()
+        except MySQLError as e:
+            logger.error(f"Error cancelling booking: {e}")
+            return json_response({"error": str(e)}, 500)
+        return json_response({"message": "Booking cancelled"})
+
+    routes = [
+        Route('/', index, methods=['GET']),
+        Route('/api/init-db', init_db, methods=['GET']),
+        Route('/api/test-db-connection', test_db_connection, methods=['GET']),
+        Route('/healthz', healthz, methods=['GET']),
+        Route('/readyz', readyz, methods=['GET']),
+        Route('/api/pool-stats', pool_stats, methods=['GET']),
+        Route('/api/cache-stats', cache_stats, methods=['GET']),
+        Route('/api/provider/register', provider_register, methods=['POST']),
+        Route('/api/provider/login', provider_login, methods=['POST']),
+        Route('/api/seeker/register', seeker_register, methods=['POST']),
+        Route('/api/seeker/login', seeker_login, methods=['POST']),
+        Route('/api/seeker/{seeker_id:int}', get_seeker, methods=['GET']),
+        Route('/api/seeker/{seeker_id:int}/reviews', review_seeker, methods=['POST']),
+        Route('/api/seeker/{seeker_id:int}/reviews', get_seeker_reviews, methods=['GET']),
+        Route('/api/seekers/batch', get_seekers_batch, methods=['GET', 'POST']),
+        Route('/api/seekers', get_seekers, methods=['GET']),
+        Route('/api/seekers/autocomplete', autocomplete_seekers, methods=['GET']),
+        Route('/api/seekers/match', match_seekers, methods=['GET']),
+        Route('/api/seeker/{seeker_id:int}/slots', add_slots, methods=['POST']),
+        Route('/api/seeker/{seeker_id:int}/slots', get_slots, methods=['GET']),
+        Route('/api/bookings', book_slot, methods=['POST']),
+        Route('/api/bookings', get_bookings, methods=['GET']),
+        Route('/api/bookings/{booking_id:int}', get_booking, methods=['GET']),
+        Route('/api/bookings/{booking_id:int}/cancel', cancel_booking, methods=['POST']),
+        Route('/api/token/refresh', refresh_token, methods=['POST']),
+        Route('/api/me', current_user, methods=['GET']),
+    ]
+    middleware = [
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                   expose_headers=['X-Next-Cursor', 'ETag'])
+    ]
+    # Shed login/registration load instead of queueing without bound
+    async def hasher_busy(request, exc):
+        response = json_response({"error": "Server busy, please retry shortly"}, 503)
+        response.headers['Retry-After'] = '1'
+        return response
+
+    exception_handlers = {HasherBusyError: hasher_busy}
+    return Starlette(routes=routes, middleware=middleware, lifespan=lifespan, exception_handlers=exception_handlers)
@@ -0,0 +1,2 @@
+
+# Empty init file to make the directory a package
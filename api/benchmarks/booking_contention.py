@@ -0,0 +1,207 @@
+"""Load test: many providers booking the same popular seekers at once.
+
+Copies a seeded SQLite stand-in (see ``suite.seed_database``), publishes
+availability for the best-ranked seekers and serves ``create_app()``
+against the copy. Providers then book in four phases:
+
+* ``book_uncontended``: every request books a different slot (the baseline);
+* ``book_contended``: each wave of ``--concurrency`` requests races for one
+  of the ``--seekers`` x ``--slots`` popular slots;
+* ``cancel``: the winners cancel, reopening the popular slots;
+* ``rebook_contended``: the race runs again over the reopened slots.
+
+Usage (from the repository root)::
+
+    python -m api.benchmarks.booking_contention --rows 1000 --requests 2000 --concurrency 100
+
+Afterwards the database is checked: no slot may have two confirmed
+bookings, a slot is booked exactly when it has one, and every 201 response
+must match a stored booking. The script exits 1 on a violation or on any
+response other than the expected 201/409/200. Losing a race should cost
+about as much as an uncontended booking, so compare the phases' p99s.
+SQLite serializes writers, so this run checks correctness and fail-fast
+behaviour rather than InnoDB's row locking.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from api.benchmarks.loadgen import run_load, wait_until_up
+from api.benchmarks.suite import seed_database
+from api.db.queries import DATETIME_FORMAT
+
+SLOT_INSERT = (
+    "INSERT INTO availability_slot (seeker_id, time_period, starts_at, ends_at) "
+    "SELECT id, time_period, ?, ? FROM seeker WHERE id = ?"
+)
+
+# Seekers that get one slot per uncontended booking between them
+COLD_SEEKERS = 100
+
+
+def prepare_database(source, path, popular, slots, cold_slots):
+    """Copy ``source`` to ``path`` and add the slots; returns ``(hot_slot_ids, cold_slot_ids)``."""
+    with sqlite3.connect(source) as original, sqlite3.connect(path) as copy:
+        original.backup(copy)
+    first = datetime.datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+
+    def window(offset):
+        starts_at = first + offset
+        return starts_at.strftime(DATETIME_FORMAT), (starts_at + datetime.timedelta(hours=1)).strftime(DATETIME_FORMAT)
+
+    connection = sqlite3.connect(path)
+    try:
+        seekers = [row[0] for row in connection.execute(
+            "SELECT id FROM seeker ORDER BY rank_score DESC, id LIMIT ?", (popular + COLD_SEEKERS,))]
+        hot, cold = seekers[:popular], seekers[popular:]
+        connection.executemany(SLOT_INSERT, [(*window(datetime.timedelta(days=day)), seeker_id)
+                                             for seeker_id in hot for day in range(slots)])
+        connection.executemany(SLOT_INSERT, [(*window(datetime.timedelta(hours=i // len(cold))), cold[i % len(cold)])
+                                             for i in range(cold_slots)])
+        connection.commit()
+        hot_ids = [row[0] for row in connection.execute(
+            f"SELECT id FROM availability_slot WHERE seeker_id IN ({', '.join('?' * len(hot))}) ORDER BY id", hot)]
+        cold_ids = [row[0] for row in connection.execute(
+            f"SELECT id FROM availability_slot WHERE seeker_id IN ({', '.join('?' * len(cold))}) ORDER BY id", cold)]
+    finally:
+        connection.close()
+    return hot_ids, cold_ids
+
+
+def check_integrity(path, created):
+    """Problems found in the bookings, given the number of 201 responses."""
+    connection = sqlite3.connect(path)
+    try:
+        doubles = connection.execute(
+            "SELECT slot_id, COUNT(*) FROM booking WHERE status = 'confirmed' GROUP BY slot_id HAVING COUNT(*) > 1"
+        ).fetchall()
+        mismatched = connection.execute(
+            "SELECT COUNT(*) FROM availability_slot WHERE (status = 'booked') != EXISTS "
+            "(SELECT 1 FROM booking WHERE booking.slot_id = availability_slot.id AND booking.status = 'confirmed')"
+        ).fetchone()[0]
+        stored = connection.execute("SELECT COUNT(*) FROM booking").fetchone()[0]
+    finally:
+        connection.close()
+    problems = [f"slot {slot_id} has {count} confirmed bookings" for slot_id, count in doubles]
+    if mismatched:
+        problems.append(f"{mismatched} slots disagree with their bookings about being booked")
+    if stored != created:
+        problems.append(f"{created} bookings were confirmed to clients but {stored} are stored")
+    return problems
+
+
+def active_bookings(path, slot_ids):
+    """``[(booking_id, provider_id)]`` confirmed on ``slot_ids``."""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            f"SELECT id, provider_id FROM booking WHERE status = 'confirmed' AND slot_id IN "
+            f"({', '.join('?' * len(slot_ids))}) ORDER BY id", slot_ids).fetchall()
+    finally:
+        connection.close()
+
+
+async def run(args, db_path, hot, cold):
+    from api.app import token_service
+
+    tokens = [token_service.issue_access_token(provider_id, 'provider') for provider_id in range(1, args.providers + 1)]
+
+    def auth(provider_id):
+        return {'Authorization': f'Bearer {tokens[provider_id - 1]}'}
+
+    def book(slot_id, i):
+        return ('POST', '/api/bookings', {'slotId': slot_id}, auth(1 + i % args.providers))
+
+    command = [sys.executable, '-m', 'api.benchmarks.suite', '--serve', db_path, '--port', str(args.port)]
+    process = subprocess.Popen(command, env=dict(os.environ, PYTHONPATH=os.getcwd()), stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{args.port}'
+        if not await wait_until_up(base_url):
+            raise RuntimeError(f"Benchmark server did not start on port {args.port}")
+
+        results = []
+
+        async def phase(name, make_request, total, expected):
+            result = await run_load(base_url, name, make_request, total, args.concurrency)
+            result['unexpected'] = result['errors'] + sum(count for status, count in result['statuses'].items()
+                                                          if int(status) not in expected)
+            results.append(result)
+            print(f"{name:<20} {result['throughput_rps']:>9.1f} rps  p50 {result['latency_ms']['p50']:>8.2f} ms  "
+                  f"p99 {result['latency_ms']['p99']:>8.2f} ms  {result['statuses']}", file=sys.stderr)
+            return result
+
+        wave = lambda i: hot[(i // args.concurrency) % len(hot)]
+        await phase('book_uncontended', lambda i: book(cold[i], i), len(cold), (201,))
+        await phase('book_contended', lambda i: book(wave(i), i), args.requests, (201, 409))
+        winners = active_bookings(db_path, hot)
+        await phase('cancel', lambda i: ('POST', f'/api/bookings/{winners[i][0]}/cancel', None, auth(winners[i][1])),
+                    len(winners), (200,))
+        await phase('rebook_contended', lambda i: book(wave(i), i), args.requests, (201, 409))
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race providers for the same seekers' slots and check for double bookings")
+    parser.add_argument('--rows', type=int, default=1000, help='providers and seekers in the seeded database')
+    parser.add_argument('--seekers', type=int, default=5, help='popular seekers everyone tries to book')
+    parser.add_argument('--slots', type=int, default=4, help='open slots per popular seeker')
+    parser.add_argument('--providers', type=int, default=200, help='distinct providers making bookings')
+    parser.add_argument('--requests', type=int, default=2000, help='booking attempts per contended phase')
+    parser.add_argument('--concurrency', type=int, default=50, help='concurrent keep-alive clients')
+    parser.add_argument('--data-dir', default=os.path.join('api', 'benchmarks', 'data'))
+    parser.add_argument('--port', type=int, default=5500)
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    args = parser.parse_args(argv)
+    if args.providers > args.rows or args.seekers + COLD_SEEKERS > args.rows:
+        parser.error(f"--rows must cover --providers and --seekers + {COLD_SEEKERS}")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    source = os.path.join(args.data_dir, f'bench-{args.rows}.sqlite3')
+    started = time.perf_counter()
+    if seed_database(source, args.rows):
+        print(f"Seeded {args.rows} rows in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'bookings.sqlite3')
+        hot, cold = prepare_database(source, db_path, args.seekers, args.slots, args.requests // 4)
+        results = asyncio.run(run(args, db_path, hot, cold))
+        created = sum(result['statuses'].get('201', 0) for result in results)
+        problems = check_integrity(db_path, created)
+
+    problems.extend(f"{result['scenario']}: {result['unexpected']} unexpected responses"
+                    for result in results if result['unexpected'])
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+            'database': f"sqlite {sqlite3.sqlite_version}",
+            'rows': args.rows,
+            'popular_slots': len(hot),
+            'concurrency': args.concurrency,
+        },
+        'results': results,
+        'bookings_created': created,
+        'problems': problems,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    for problem in problems:
+        print(f"FAILED {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
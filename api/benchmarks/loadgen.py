@@ -0,0 +1,156 @@
+"""Dependency-free HTTP/1.1 load generator used by the benchmark scripts.
+
+Each simulated client is an asyncio task holding one keep-alive connection,
+so a single process can drive hundreds of concurrent clients without the
+client itself becoming the bottleneck.
+"""
+import asyncio
+import json
+import math
+import time
+from urllib.parse import urlsplit
+
+
+class _Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Send one request and return ``(status, body_bytes)``."""
+        if self.writer is None:
+            await self._open()
+        payload = b'' if body is None else body
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive",
+                 f"Content-Length: {len(payload)}"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Server closed the connection")
+        version, status = status_line.decode().split(' ', 2)[:2]
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode().partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).strip().split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            data = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            data = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            data = await self.reader.read()
+            self.close()
+
+        if version == 'HTTP/1.0' or response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(status), data
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(name, latencies, errors, elapsed, statuses):
+    """Machine-readable summary of one scenario (latencies in milliseconds)."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        'scenario': name,
+        'requests': count + errors,
+        'errors': errors,
+        'statuses': {str(status): total for status, total in sorted(statuses.items())},
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(count / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'min': round(ordered[0] * 1000, 3) if ordered else 0.0,
+            'mean': round(sum(ordered) / count * 1000, 3) if ordered else 0.0,
+            'p50': round(percentile(ordered, 0.50) * 1000, 3),
+            'p90': round(percentile(ordered, 0.90) * 1000, 3),
+            'p99': round(percentile(ordered, 0.99) * 1000, 3),
+            'max': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+    }
+
+
+async def run_load(base_url, name, make_request, total_requests, concurrency):
+    """Issue ``total_requests`` requests from ``concurrency`` keep-alive clients.
+
+    ``make_request(i)`` returns ``(method, path, json_body_or_None)`` for the
+    i-th request so scenarios can vary ids, filters or credentials, optionally
+    followed by a dict of extra headers (e.g. ``Authorization``).
+    """
+    parts = urlsplit(base_url)
+    counter = iter(range(total_requests))
+    latencies = []
+    statuses = {}
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        connection = _Connection(parts.hostname, parts.port or 80)
+        try:
+            for i in counter:
+                method, path, body, *extra = make_request(i)
+                data = None if body is None else json.dumps(body).encode()
+                headers = {'Content-Type': 'application/json'} if data is not None else {}
+                if extra:
+                    headers.update(extra[0])
+                started = time.perf_counter()
+                try:
+                    status, _ = await connection.request(method, parts.path.rstrip('/') + path, data, headers)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError, ValueError):
+                    errors += 1
+                    connection.close()
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(name, latencies, errors, time.perf_counter() - started, statuses)
+
+
+async def wait_until_up(base_url, path='/', timeout=30.0):
+    """Poll ``path`` until the server answers or ``timeout`` expires."""
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        connection = _Connection(parts.hostname, parts.port or 80)
+        try:
+            await connection.request('GET', path)
+            return True
+        except (ConnectionError, OSError, ValueError):
+            await asyncio.sleep(0.2)
+        finally:
+            connection.close()
+    return False
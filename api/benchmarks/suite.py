@@ -0,0 +1,302 @@
+"""Offline benchmark and load-test suite for the API routes.
+
+Seeds a SQLite stand-in database with N providers and N seekers, serves
+``create_app()`` against it in a subprocess and measures throughput and
+latency percentiles for every route under concurrency. Usage (from the
+repository root)::
+
+    python -m api.benchmarks.suite --rows 1000,100000 --concurrency 50 --output bench.json
+    python -m api.benchmarks.suite --rows 1000 --baseline bench.json   # exit 1 on regressions
+
+Seeded databases are kept under ``--data-dir`` and reused across runs. The
+response cache is disabled by default so the database paths are measured;
+pass ``--cache`` to measure the cached paths instead. Full-text (``q=``)
+search needs MySQL and is not covered here.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+from api.benchmarks.loadgen import run_load, wait_until_up
+
+PASSWORD = 'bench-password'
+SKILLS = ['Plumbing', 'Electrical', 'Carpentry', 'Painting', 'Web Development', 'Mobile Development',
+          'Graphic Design', 'Data Entry', 'Tutoring', 'Cleaning', 'Gardening', 'Photography']
+LOCATIONS = ['Hyderabad', 'Bengaluru', 'Chennai', 'Mumbai', 'Pune', 'Delhi', 'Kolkata', 'Remote']
+TIME_PERIODS = ['Full-time', 'Part-time', 'Contract', 'Weekends', 'Hourly']
+SEED_BATCH = 10000
+# Search origins a short drive from the seeded cities (Hyderabad, Pune, Bengaluru)
+NEAR_POINTS = ['17.44,78.35', '18.60,73.75', '13.03,77.64']
+
+
+def seed_database(path, rows):
+    """Create ``path`` with ``rows`` providers and seekers (skipped if already seeded)."""
+    from api.app import hash_password
+    from api.db.migrations import SEEKER_INDEXES
+    from api.db.sqlite import create_schema
+    from api.utils.geo import resolve_point
+    from api.utils.ranking import rank_score
+
+    if os.path.exists(path):
+        connection = sqlite3.connect(path)
+        try:
+            seeded = connection.execute("SELECT COUNT(*) FROM seeker WHERE email LIKE 'seeker%@bench.local'").fetchone()[0]
+        finally:
+            connection.close()
+        if seeded >= rows:
+            # Add any tables introduced since the file was seeded
+            create_schema(path, SEEKER_INDEXES)
+            return False
+        os.remove(path)
+
+    create_schema(path, SEEKER_INDEXES)
+    hashed = hash_password(PASSWORD)
+    points = {location: resolve_point(location) for location in LOCATIONS}
+    rng = random.Random(42)
+    connection = sqlite3.connect(path)
+    try:
+        for start in range(0, rows, SEED_BATCH):
+            batch = range(start, min(rows, start + SEED_BATCH))
+            connection.executemany(
+                "INSERT INTO provider (name, phone_number, email, password) VALUES (?, ?, ?, ?)",
+                [(f"Provider {i}", f"9{i:09d}", f"provider{i}@bench.local", hashed) for i in batch]
+            )
+            seekers = []
+            for i in batch:
+                location = rng.choice(LOCATIONS)
+                experience, reviews = rng.randint(0, 30), rng.randint(0, 400)
+                rating_total = sum(rng.randint(1, 5) for _ in range(reviews))
+                rating = round(rating_total / reviews, 1) if reviews else 0
+                seekers.append((f"Seeker {i}", f"8{i:09d}", f"seeker{i}@bench.local", rng.choice(SKILLS), experience,
+                                location, rng.choice(TIME_PERIODS), round(rng.uniform(5, 500), 2), hashed, rating,
+                                reviews, *points[location], rating_total, rank_score(rating_total, reviews, experience)))
+            connection.executemany(
+                "INSERT INTO seeker (name, phone_number, email, skill, years_of_experience, location, time_period, "
+                "base_price, password, rating, reviews, latitude, longitude, geohash, rating_total, rank_score) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                seekers
+            )
+            connection.commit()
+        connection.execute("ANALYZE")
+        connection.commit()
+    finally:
+        connection.close()
+    return True
+
+
+def serve(db_path, port, cache, replicas=0):
+    """Run create_app() against the SQLite stand-in (used as the benchmark subprocess).
+
+    With ``replicas``, read-only routes are routed through that many extra
+    pools on the same file, standing in for read replicas.
+    """
+    from werkzeug.serving import make_server
+
+    import api.app as app_module
+    from api.db.pool import ConnectionPool
+    from api.db.routing import ReplicaRouter
+    from api.db.sqlite import SQLiteConnection
+    from api.utils.cache import MemoryBackend, ResponseCache
+    from api.utils.ratelimit import AdmissionController
+
+    app_module.db_pool = ConnectionPool(lambda: SQLiteConnection(db_path), name='sqlite', **app_module.pool_config)
+    app_module.replica_pools = [
+        ConnectionPool(lambda: SQLiteConnection(db_path), name=f'sqlite-replica-{number}', **app_module.pool_config)
+        for number in range(1, replicas + 1)
+    ]
+    app_module.job_queue.pool = app_module.db_pool
+    app_module.db_router = ReplicaRouter(app_module.db_pool, app_module.replica_pools, marks=MemoryBackend(),
+                                         stickiness=app_module.replica_config['stickiness'], lag_probe=None)
+    if not cache:
+        app_module.response_cache = ResponseCache(MemoryBackend(max_entries=0))
+    # Every benchmark client shares one IP; the login/register limits would turn the run into 429s
+    app_module.rate_limit_config['enabled'] = False
+    # The development server runs a thread per connection rather than server.threads, so let
+    # requests queue for admission up to what the pool can serve at once
+    if not app_module.settings.admission.max_inflight:
+        app_module.admission = AdmissionController(
+            **dict(app_module.admission_config,
+                   max_inflight=app_module.pool_config['size'] + app_module.pool_config['max_overflow']))
+    # Exit normally on terminate() so the password hashing processes are shut down too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    make_server('127.0.0.1', port, app_module.create_app(), threaded=True).serve_forever()
+
+
+def scenarios(rows, run_id):
+    """Map of scenario name -> ``make_request(i)`` for a table of ``rows`` seekers."""
+    rng = random.Random(7)
+    ids = [rng.randint(1, rows) for _ in range(4096)]
+
+    def pick(values, i):
+        return values[i % len(values)]
+
+    def search(path='/api/seekers', **params):
+        return ('GET', f"{path}?{urlencode(params)}" if params else path, None)
+
+    def register(kind, i):
+        body = {'name': f'New {kind} {i}', 'phone_number': '7000000000', 'email': f'{kind}-{run_id}-{i}@bench.local',
+                'password': PASSWORD}
+        if kind == 'seeker':
+            body.update(skill=pick(SKILLS, i), years_of_experience=1 + i % 20, location=pick(LOCATIONS, i),
+                        time_period=pick(TIME_PERIODS, i), base_price=50)
+        return ('POST', f'/api/{kind}/register', body)
+
+    def login(kind, i):
+        return ('POST', f'/api/{kind}/login', {'email': f'{kind}{ids[i % len(ids)] - 1}@bench.local', 'password': PASSWORD})
+
+    return {
+        'index': lambda i: ('GET', '/', None),
+        'healthz': lambda i: ('GET', '/healthz', None),
+        'readyz': lambda i: ('GET', '/readyz', None),
+        'test_db_connection': lambda i: ('GET', '/api/test-db-connection', None),
+        'provider_register': lambda i: register('provider', i),
+        'seeker_register': lambda i: register('seeker', i),
+        'provider_login': lambda i: login('provider', i),
+        'seeker_login': lambda i: login('seeker', i),
+        'get_seeker': lambda i: ('GET', f'/api/seeker/{ids[i % len(ids)]}', None),
+        # A 20-profile shortlist page: one batch request instead of 20 profile requests
+        'seekers_batch': lambda i: search('/api/seekers/batch', ids=','.join(str(ids[(i + k) % len(ids)]) for k in range(20))),
+        'seekers_all': lambda i: search(),
+        'seekers_skill': lambda i: search(skill=pick(SKILLS, i)),
+        'seekers_skill_location': lambda i: search(skill=pick(SKILLS, i), location=pick(LOCATIONS, i // 3)),
+        'seekers_location_time_period': lambda i: search(location=pick(LOCATIONS, i), time_period=pick(TIME_PERIODS, i // 2)),
+        'seekers_all_filters': lambda i: search(skill=pick(SKILLS, i), location=pick(LOCATIONS, i // 3),
+                                                time_period=pick(TIME_PERIODS, i // 5), rating=3),
+        'seekers_min_rating': lambda i: search(rating=i % 5),
+        'seekers_sort_rating': lambda i: search(sort='rating', skill=pick(SKILLS, i)),
+        'seekers_sort_price': lambda i: search(sort='base_price', location=pick(LOCATIONS, i)),
+        'seekers_sort_best': lambda i: search(sort='best', location=pick(LOCATIONS, i)),
+        'seekers_sort_experience': lambda i: search(sort='experience', limit=200),
+        'seekers_near': lambda i: search(near=pick(NEAR_POINTS, i), radius=50 + i % 100, skill=pick(SKILLS, i)),
+        'seekers_autocomplete': lambda i: search('/api/seekers/autocomplete', q=pick(SKILLS, i)[:1 + i % 4]),
+    }
+
+
+async def bench_rows(args, rows, port):
+    db_path = os.path.join(args.data_dir, f'bench-{rows}.sqlite3')
+    started = time.perf_counter()
+    if seed_database(db_path, rows):
+        print(f"Seeded {rows} rows in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    command = [sys.executable, '-m', 'api.benchmarks.suite', '--serve', db_path, '--port', str(port)]
+    if args.cache:
+        command.append('--cache')
+    if args.replicas:
+        command.extend(['--replicas', str(args.replicas)])
+    process = subprocess.Popen(command, env=dict(os.environ, PYTHONPATH=os.getcwd()), stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        if not await wait_until_up(base_url):
+            raise RuntimeError(f"Benchmark server did not start on port {port}")
+        selected = scenarios(rows, f"{int(time.time())}-{rows}")
+        if args.scenarios:
+            wanted = set(args.scenarios.split(','))
+            selected = {name: factory for name, factory in selected.items() if name in wanted}
+        results = []
+        for name, make_request in selected.items():
+            # Warm up with request numbers past the measured range so registrations stay unique
+            warmup = lambda i, make_request=make_request: make_request(args.requests + i)
+            await run_load(base_url, name, warmup, min(args.requests, args.concurrency), args.concurrency)
+            result = await run_load(base_url, name, make_request, args.requests, args.concurrency)
+            result['rows'] = rows
+            results.append(result)
+            print(f"{rows:>8} {name:<32} {result['throughput_rps']:>9.1f} rps  "
+                  f"p50 {result['latency_ms']['p50']:>8.2f} ms  p99 {result['latency_ms']['p99']:>8.2f} ms",
+                  file=sys.stderr)
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def find_regressions(results, baseline, threshold):
+    """Scenarios whose p99 latency grew or throughput fell by more than ``threshold``."""
+    previous = {(r['rows'], r['scenario']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result['rows'], result['scenario']))
+        if not before:
+            continue
+        p99_before, p99_now = before['latency_ms']['p99'], result['latency_ms']['p99']
+        rps_before, rps_now = before['throughput_rps'], result['throughput_rps']
+        if p99_before and p99_now > p99_before * (1 + threshold):
+            regressions.append(f"{result['rows']}/{result['scenario']}: p99 {p99_before} -> {p99_now} ms")
+        if rps_before and rps_now < rps_before * (1 - threshold):
+            regressions.append(f"{result['rows']}/{result['scenario']}: throughput {rps_before} -> {rps_now} rps")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Freelancer API against a seeded SQLite stand-in")
+    parser.add_argument('--rows', default='1000', help='comma-separated table sizes, e.g. 1000,100000,1000000')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=50, help='concurrent keep-alive clients')
+    parser.add_argument('--scenarios', default='', help='comma-separated subset of scenarios to run')
+    parser.add_argument('--cache', action='store_true', help='keep the response cache enabled')
+    parser.add_argument('--replicas', type=int, default=0, help='route reads through this many stand-in replica pools')
+    parser.add_argument('--data-dir', default=os.path.join('api', 'benchmarks', 'data'))
+    parser.add_argument('--port', type=int, default=5400)
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative regression (default 20%%)')
+    parser.add_argument('--serve', metavar='DB_PATH', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.port, args.cache, args.replicas)
+        return 0
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for offset, rows in enumerate(int(value) for value in args.rows.split(',')):
+        results.extend(asyncio.run(bench_rows(args, rows, args.port + offset)))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': f"sqlite {sqlite3.sqlite_version}",
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'cache': args.cache,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = find_regressions(results, json.load(handle), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Compare the sync (Flask) and async (ASGI) serving paths under concurrency.
+
+Both servers talk to the database configured in ``api.app.db_config``, so
+run ``python -m api.migrate upgrade`` first. Usage (from the repository root)::
+
+    python -m api.benchmarks.sync_vs_async --concurrency 200 --requests 5000
+
+Results are printed as one JSON document per run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+from api.benchmarks.loadgen import run_load, wait_until_up
+
+BENCH_SEEKER = {
+    'name': 'Benchmark Seeker',
+    'phone_number': '0000000000',
+    'email': 'bench-seeker@example.com',
+    'password': 'bench-password',
+    'skill': 'Benchmarking',
+    'years_of_experience': 3,
+    'location': 'Localhost',
+    'time_period': 'Full-time',
+    'base_price': 10
+}
+
+SERVERS = {
+    # Threaded Werkzeug server, i.e. what api/run.py starts today (minus the debugger)
+    'sync': lambda port: [
+        sys.executable, '-c',
+        "from werkzeug.serving import run_simple; from api.app import create_app; "
+        f"run_simple('127.0.0.1', {port}, create_app(), threaded=True)"
+    ],
+    'async': lambda port: [
+        sys.executable, '-m', 'uvicorn', '--factory', 'api.asgi:create_asgi_app',
+        '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'
+    ],
+}
+
+SCENARIOS = {
+    'seeker_login': lambda i: ('POST', '/api/seeker/login',
+                               {'email': BENCH_SEEKER['email'], 'password': BENCH_SEEKER['password']}),
+    # A handful of hot queries that the response cache should absorb
+    'seekers_search_hot': lambda i: ('GET', f'/api/seekers?limit=20&sort=rating&skill=B{"x" * (i % 3)}', None),
+    # Thousands of distinct filter combinations, so nearly every request reaches the database
+    'seekers_search_varied': lambda i: ('GET', f'/api/seekers?limit={1 + i % 200}&rating={(i // 200) % 50 / 10}', None),
+}
+
+
+async def bench_server(kind, port, total, concurrency):
+    base_url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen(SERVERS[kind](port), env=dict(os.environ, PYTHONPATH=os.getcwd()))
+    try:
+        if not await wait_until_up(base_url):
+            raise RuntimeError(f"{kind} server did not start on port {port}")
+        await run_load(base_url, 'seed', lambda i: ('POST', '/api/seeker/register', BENCH_SEEKER), 1, 1)
+        results = []
+        for name, make_request in SCENARIOS.items():
+            # Warm the pool and caches before measuring
+            await run_load(base_url, name, make_request, min(total, concurrency * 2), concurrency)
+            result = await run_load(base_url, name, make_request, total, concurrency)
+            result['server'] = kind
+            results.append(result)
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=200, help='concurrent keep-alive clients')
+    parser.add_argument('--port', type=int, default=5100, help='first port to listen on')
+    parser.add_argument('--servers', default='sync,async', help='comma-separated subset of: sync, async')
+    args = parser.parse_args(argv)
+
+    results = []
+    for offset, kind in enumerate(args.servers.split(',')):
+        results.extend(asyncio.run(bench_server(kind.strip(), args.port + offset, args.requests, args.concurrency)))
+    json.dump({'concurrency': args.concurrency, 'results': results}, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
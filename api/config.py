@@ -0,0 +1,394 @@
+"""Typed settings for the API, loaded once at startup.
+
+Every knob has a default suited to local development. Deployments override
+them, lowest precedence first, with:
+
+1. a JSON file named by ``FREELANCER_CONFIG``, shaped like the sections
+   below (``{"db": {"host": "db1"}, "pool": {"size": 20}}``);
+2. environment variables ``FREELANCER_<SECTION>_<FIELD>``, e.g.
+   ``FREELANCER_DB_HOST``, ``FREELANCER_POOL_SIZE`` or
+   ``FREELANCER_JWT_SECRET_KEY``. List and mapping fields take JSON
+   (``FREELANCER_REPLICAS_HOSTS='[{"host": "replica1"}]'``).
+
+``load_settings()`` coerces every value to its field's type and validates
+the result, raising one ``ConfigError`` that lists every problem, so a
+misconfigured worker fails at boot rather than on its first request.
+"""
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple, get_type_hints
+
+ENV_PREFIX = 'FREELANCER_'
+CONFIG_FILE_ENV = 'FREELANCER_CONFIG'
+
+DEFAULT_SECRET_KEY = 'freelancer_secret_key'
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+class ConfigError(ValueError):
+    """Raised when settings cannot be parsed or fail validation; lists every problem."""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("Invalid configuration:\n  " + "\n  ".join(self.problems))
+
+
+@dataclass
+class DatabaseSettings:
+    host: str = 'localhost'
+    user: str = 'freelancer'
+    password: str = 'parthiv'
+    database: str = 'freelancer'
+    port: int = 3308
+
+    def problems(self):
+        return [] if 0 < self.port < 65536 else ["db.port must be between 1 and 65535"]
+
+
+@dataclass
+class PoolSettings:
+    # Connections kept idle, burst overflow, and seconds
+    size: int = 10
+    max_overflow: int = 20
+    timeout: float = 10
+    recycle: float = 1800
+    ping_after: float = 30
+
+    def problems(self):
+        problems = []
+        if self.size < 1:
+            problems.append("pool.size must be at least 1")
+        if self.max_overflow < 0:
+            problems.append("pool.max_overflow must not be negative")
+        if self.timeout <= 0:
+            problems.append("pool.timeout must be positive")
+        return problems
+
+
+@dataclass
+class ReplicaSettings:
+    # Each entry overrides db settings (usually 'host' and 'port') for one replica
+    hosts: List[Dict[str, Any]] = field(default_factory=list)
+    stickiness: float = 5
+    max_lag: float = 5
+    check_interval: float = 5
+    retry_after: float = 10
+    # Seconds a read waits for a busy replica's pool before trying the next replica or the primary
+    acquire_timeout: float = 0.1
+
+    def problems(self):
+        problems = []
+        if not all(isinstance(host, dict) for host in self.hosts):
+            problems.append("replicas.hosts must be a list of objects")
+        if self.stickiness < self.max_lag:
+            problems.append("replicas.stickiness should be at least replicas.max_lag")
+        if self.acquire_timeout <= 0:
+            problems.append("replicas.acquire_timeout must be positive")
+        return problems
+
+
+@dataclass
+class CacheSettings:
+    backend: str = 'memory'
+    url: Optional[str] = None
+    max_entries: int = 10000
+    max_bytes: int = 64 * 1024 * 1024
+    profile_ttl: int = 300
+    profile_max_age: int = 60
+    search_ttl: int = 60
+    search_max_age: int = 15
+
+    def problems(self):
+        return _backend_problems('cache', self.backend, self.url)
+
+
+@dataclass
+class RateLimitSettings:
+    enabled: bool = True
+    backend: str = 'memory'
+    url: Optional[str] = None
+    max_keys: int = 100000
+    proxy_hops: int = 0
+    # Limit name -> (requests per minute, burst)
+    limits: Dict[str, Tuple[int, int]] = field(default_factory=lambda: {
+        'auth_ip': (30, 10),
+        'login_email': (10, 5),
+        'register_email': (5, 3)
+    })
+
+    def problems(self):
+        problems = _backend_problems('rate_limit', self.backend, self.url)
+        for name in ('auth_ip', 'login_email', 'register_email'):
+            limit = self.limits.get(name)
+            if not (isinstance(limit, (list, tuple)) and len(limit) == 2 and all(value > 0 for value in limit)):
+                problems.append(f"rate_limit.limits.{name} must be [requests per minute, burst], both positive")
+        if self.proxy_hops < 0:
+            problems.append("rate_limit.proxy_hops must not be negative")
+        return problems
+
+
+@dataclass
+class AdmissionSettings:
+    # 0 admits one fewer than server.threads (capped at pool size + max_overflow), so a
+    # thread stays free to queue or shed the excess
+    max_inflight: int = 0
+    queue_timeout: float = 1.0
+
+    def problems(self):
+        problems = []
+        if self.max_inflight < 0:
+            problems.append("admission.max_inflight must not be negative")
+        if self.queue_timeout < 0:
+            problems.append("admission.queue_timeout must not be negative")
+        return problems
+
+
+@dataclass
+class JwtSettings:
+    secret_key: str = DEFAULT_SECRET_KEY
+    # Signing keys by key id; empty signs with secret_key under 'active_kid'
+    keys: Dict[str, str] = field(default_factory=dict)
+    active_kid: str = 'v1'
+    access_ttl: int = 15 * 60
+    refresh_ttl: int = 14 * 24 * 3600
+    cache_size: int = 10000
+
+    def problems(self):
+        problems = []
+        if self.keys and self.active_kid not in self.keys:
+            problems.append(f"jwt.active_kid '{self.active_kid}' is not among jwt.keys")
+        if not self.keys and not self.secret_key:
+            problems.append("jwt.secret_key must not be empty")
+        if self.access_ttl <= 0 or self.refresh_ttl <= 0:
+            problems.append("jwt.access_ttl and jwt.refresh_ttl must be positive")
+        return problems
+
+    def signing_keys(self):
+        return dict(self.keys) or {self.active_kid: self.secret_key}
+
+
+@dataclass
+class AdminSettings:
+    # Ids of the provider accounts allowed to bulk import and to export seekers' contact details
+    providers: List[int] = field(default_factory=list)
+
+    def problems(self):
+        if not all(isinstance(provider, int) and not isinstance(provider, bool) for provider in self.providers):
+            return ["admin.providers must be a list of provider ids"]
+        return []
+
+
+@dataclass
+class PasswordSettings:
+    algorithm: str = 'scrypt'
+    scrypt_n: int = 2 ** 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iterations: int = 600000
+    processes: int = 2
+    max_pending: int = 32
+    queue_timeout: float = 5
+
+    def problems(self):
+        problems = []
+        if self.algorithm not in ('scrypt', 'pbkdf2_sha256'):
+            problems.append("password.algorithm must be 'scrypt' or 'pbkdf2_sha256'")
+        if self.scrypt_n < 2 or self.scrypt_n & (self.scrypt_n - 1):
+            problems.append("password.scrypt_n must be a power of two")
+        if self.processes < 0:
+            problems.append("password.processes must not be negative")
+        return problems
+
+
+@dataclass
+class JobSettings:
+    # Job threads per server worker; 0 leaves every job to `python -m api.worker`
+    workers: int = 1
+    poll_interval: float = 1.0
+    max_attempts: int = 5
+    # Retry n waits about backoff_base * 2 ** (n - 1) seconds, at most backoff_max
+    backoff_base: float = 5
+    backoff_max: float = 600
+    # Seconds a claimed job may run before another worker takes it over
+    lease: float = 300
+    # Days finished and failed jobs are kept
+    retention_days: int = 7
+
+    def problems(self):
+        problems = []
+        if self.workers < 0:
+            problems.append("jobs.workers must not be negative")
+        if self.poll_interval <= 0 or self.lease <= 0:
+            problems.append("jobs.poll_interval and jobs.lease must be positive")
+        if self.max_attempts < 1:
+            problems.append("jobs.max_attempts must be at least 1")
+        if self.backoff_base <= 0 or self.backoff_max < self.backoff_base:
+            problems.append("jobs.backoff_base must be positive and jobs.backoff_max at least as large")
+        return problems
+
+
+@dataclass
+class MailSettings:
+    # No host logs outgoing mail instead of sending it
+    host: str = ''
+    port: int = 25
+    sender: str = 'Freelancer <no-reply@freelancer.local>'
+    username: str = ''
+    password: str = ''
+    starttls: bool = False
+    timeout: float = 10
+
+    def problems(self):
+        return [] if 0 < self.port < 65536 else ["mail.port must be between 1 and 65535"]
+
+
+@dataclass
+class ServerSettings:
+    bind: str = '0.0.0.0:5000'
+    # 0 starts one worker per CPU
+    workers: int = 0
+    threads: int = 4
+    timeout: int = 30
+    graceful_timeout: int = 30
+    keepalive: int = 5
+    max_requests: int = 10000
+    log_level: str = 'INFO'
+    # Whether create_app() refuses to start against a database that needs migrations
+    check_schema_on_startup: bool = True
+
+    def problems(self):
+        problems = []
+        if not isinstance(logging.getLevelName(self.log_level.upper()), int):
+            problems.append(f"server.log_level '{self.log_level}' is not a logging level")
+        if self.workers < 0 or self.threads < 1:
+            problems.append("server.workers must not be negative and server.threads must be at least 1")
+        return problems
+
+
+@dataclass
+class Settings:
+    db: DatabaseSettings = field(default_factory=DatabaseSettings)
+    pool: PoolSettings = field(default_factory=PoolSettings)
+    replicas: ReplicaSettings = field(default_factory=ReplicaSettings)
+    cache: CacheSettings = field(default_factory=CacheSettings)
+    rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
+    admission: AdmissionSettings = field(default_factory=AdmissionSettings)
+    jwt: JwtSettings = field(default_factory=JwtSettings)
+    admin: AdminSettings = field(default_factory=AdminSettings)
+    password: PasswordSettings = field(default_factory=PasswordSettings)
+    jobs: JobSettings = field(default_factory=JobSettings)
+    mail: MailSettings = field(default_factory=MailSettings)
+    server: ServerSettings = field(default_factory=ServerSettings)
+
+    def problems(self):
+        problems = []
+        for section in fields(self):
+            problems.extend(getattr(self, section.name).problems())
+        return problems
+
+
+def _backend_problems(section, backend, url):
+    if backend not in ('memory', 'redis'):
+        return [f"{section}.backend must be 'memory' or 'redis'"]
+    if backend == 'redis' and not url:
+        return [f"{section}.url is required with the redis backend"]
+    return []
+
+
+def _coerce(value, hint, from_env):
+    """Convert ``value`` to the type named by ``hint``; env values arrive as strings."""
+    origin = getattr(hint, '__origin__', None)
+    if origin is not None and type(None) in getattr(hint, '__args__', ()):
+        # Optional[X]
+        if value is None or (from_env and value == ''):
+            return None
+        return _coerce(value, hint.__args__[0], from_env)
+    if hint is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+            return value.strip().lower() in _TRUE
+        raise ValueError(f"expected a boolean, got {value!r}")
+    if hint in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"expected a number, got {value!r}")
+        number = float(value) if hint is float else int(value)
+        return number
+    if hint is str:
+        if not isinstance(value, str):
+            raise ValueError(f"expected a string, got {value!r}")
+        return value
+    # Lists and mappings: JSON in the environment, native in the file
+    if from_env:
+        value = json.loads(value)
+    expected = dict if origin in (dict, Dict) else list
+    if not isinstance(value, expected):
+        raise ValueError(f"expected a JSON {'object' if expected is dict else 'array'}, got {value!r}")
+    return value
+
+
+def _apply(section, name, values, from_env, problems):
+    hints = get_type_hints(type(section))
+    for key, value in values.items():
+        if key not in hints:
+            problems.append(f"{name}.{key} is not a known setting")
+            continue
+        try:
+            setattr(section, key, _coerce(value, hints[key], from_env))
+        except ValueError as e:
+            problems.append(f"{name}.{key}: {e}")
+
+
+def load_settings(environ=None, path=None):
+    """Build ``Settings`` from defaults, the JSON config file and ``FREELANCER_*`` variables.
+
+    Raises ``ConfigError`` if anything is unparseable or invalid.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(CONFIG_FILE_ENV)
+    settings = Settings()
+    problems = []
+
+    if path:
+        try:
+            with open(path) as config_file:
+                document = json.load(config_file)
+        except (OSError, ValueError) as e:
+            raise ConfigError([f"cannot read config file {path}: {e}"]) from e
+        if not isinstance(document, dict):
+            raise ConfigError([f"config file {path} must hold a JSON object"])
+        for name, values in document.items():
+            if not hasattr(settings, name) or not isinstance(values, dict):
+                problems.append(f"{name} is not a known settings section")
+                continue
+            _apply(getattr(settings, name), name, values, False, problems)
+
+    for section in fields(settings):
+        prefix = f"{ENV_PREFIX}{section.name.upper()}_"
+        values = {}
+        for setting in fields(getattr(settings, section.name)):
+            variable = prefix + setting.name.upper()
+            if variable in environ:
+                values[setting.name] = environ[variable]
+        _apply(getattr(settings, section.name), section.name, values, True, problems)
+
+    problems.extend(settings.problems())
+    if problems:
+        raise ConfigError(problems)
+    return settings
+
+
+def as_dict(section):
+    """Plain-dict copy of a settings section."""
+    return asdict(section)
+
+
+def configure_logging(level='INFO'):
+    """Set up root logging once; called by the entry points rather than at import."""
+    logging.basicConfig(level=level.upper() if isinstance(level, str) else level, format=LOG_FORMAT)
@@ -0,0 +1,272 @@
+"""Bulk import and streaming export of providers and seekers.
+
+Imports read CSV or NDJSON line by line from the request body, so an upload
+is never held in memory as a whole. Records are handled in chunks: each
+chunk is validated, checked for emails already in the table with a single
+``IN`` query, has its passwords hashed in parallel and is written with one
+``executemany`` in its own transaction. Bad rows are reported by line number
+and never stop the rest of the import.
+"""
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from mysql.connector import Error
+
+from api.db import queries
+from api.utils.geo import resolve_point
+from api.utils.ranking import rank_score
+
+FORMATS = ('ndjson', 'csv')
+
+_MIMETYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonlines': 'ndjson',
+}
+
+# Longest value accepted per column (the VARCHAR sizes of the tables)
+_MAX_LENGTHS = {'name': 255, 'phone_number': 20, 'email': 255, 'skill': 255, 'location': 255, 'time_period': 50}
+
+
+def detect_format(requested, mimetype):
+    """Pick the import/export format from ``?format=`` or the Content-Type; NDJSON by default."""
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+        return requested
+    return _MIMETYPES.get(mimetype, 'ndjson')
+
+
+def read_records(stream, fmt):
+    """Yield ``(line, record, error)`` from a byte stream; ``record`` is a dict or None."""
+    lines = (raw.decode('utf-8-sig' if index == 0 else 'utf-8', errors='replace')
+             for index, raw in enumerate(stream))
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, "Row has more values than the header"
+            else:
+                yield reader.line_num, record, None
+        return
+
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield line, record, None
+        else:
+            yield line, None, "Each line must be a JSON object"
+
+
+def _text(record, field):
+    value = record.get(field)
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def validate_provider(record):
+    """Return ``(values, error)`` for one provider record."""
+    values = {field: _text(record, field) for field in ('name', 'phone_number', 'email')}
+    values['password'] = str(record.get('password') or '')
+    return _check_common(values)
+
+
+def validate_seeker(record):
+    """Return ``(values, error)`` for one seeker record."""
+    values = {field: _text(record, field)
+              for field in ('name', 'phone_number', 'email', 'skill', 'location', 'time_period')}
+    values['password'] = str(record.get('password') or '')
+    values, error = _check_common(values)
+    if error:
+        return None, error
+
+    try:
+        values['years_of_experience'] = int(_text(record, 'years_of_experience'))
+    except ValueError:
+        return None, "years_of_experience must be an integer"
+    try:
+        values['base_price'] = Decimal(_text(record, 'base_price')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None, "base_price must be a number"
+    if values['years_of_experience'] < 0 or not 0 <= values['base_price'] < Decimal('100000000'):
+        return None, "years_of_experience and base_price must be non-negative"
+    try:
+        values['point'] = resolve_point(values['location'], record.get('latitude'), record.get('longitude'))
+    except ValueError as e:
+        return None, str(e)
+    return values, None
+
+
+def _check_common(values):
+    missing = [field for field, value in values.items() if not value]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+    for field, limit in _MAX_LENGTHS.items():
+        if field in values and len(values[field]) > limit:
+            return None, f"{field} is longer than {limit} characters"
+    if '@' not in values['email']:
+        return None, "email is not a valid address"
+    return values, None
+
+
+# Per-kind validator, dedup query and INSERT row layout
+KINDS = {
+    'provider': {
+        'validate': validate_provider,
+        'existing': queries.PROVIDER_EXISTING_EMAILS,
+        'insert': queries.PROVIDER_INSERT,
+        'row': lambda v, hashed: (v['name'], v['phone_number'], v['email'], hashed),
+    },
+    'seeker': {
+        'validate': validate_seeker,
+        'existing': queries.SEEKER_EXISTING_EMAILS,
+        'insert': queries.SEEKER_INSERT,
+        'row': lambda v, hashed: (v['name'], v['phone_number'], v['email'], v['skill'], v['years_of_experience'],
+                                  v['location'], v['time_period'], v['base_price'], hashed, 0, 0, *v['point'],
+                                  rank_score(0, 0, v['years_of_experience'])),
+    },
+}
+
+
+class BulkImporter:
+    """Imports ``(line, record, error)`` tuples of one kind over a single connection.
+
+    ``hash_passwords`` maps a list of passwords to a list of hashes;
+    ``on_insert`` (optional) receives the validated values of every committed chunk.
+    """
+
+    def __init__(self, connection, kind, hash_passwords, chunk_size=500, max_errors=1000, on_insert=None):
+        self.connection = connection
+        self.spec = KINDS[kind]
+        self.hash_passwords = hash_passwords
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.on_insert = on_insert
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self._seen = set()
+
+    def _error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def run(self, records):
+        chunk = []
+        for item in records:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.summary()
+
+    def summary(self):
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors)
+        }
+
+    def _existing_emails(self, emails):
+        query = self.spec['existing'].format(placeholders=', '.join(['%s'] * len(emails)))
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, emails)
+            return {row[0].lower() for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def _import_chunk(self, chunk):
+        # Validate, and drop emails repeated earlier in this upload
+        pending = []
+        for line, record, error in chunk:
+            if error:
+                self._error(line, error)
+                continue
+            values, error = self.spec['validate'](record)
+            if error:
+                self._error(line, error)
+                continue
+            key = values['email'].lower()
+            if key in self._seen:
+                self._error(line, "Duplicate email in upload")
+                continue
+            self._seen.add(key)
+            pending.append((line, values))
+        if not pending:
+            return
+
+        # One round trip to find emails that are already registered
+        existing = self._existing_emails([values['email'] for _, values in pending])
+        accepted = []
+        for line, values in pending:
+            if values['email'].lower() in existing:
+                self._error(line, "Email already registered")
+            else:
+                accepted.append((line, values))
+        if not accepted:
+            return
+
+        hashes = self.hash_passwords([values['password'] for _, values in accepted])
+        rows = [self.spec['row'](values, hashed) for (_, values), hashed in zip(accepted, hashes)]
+
+        cursor = self.connection.cursor()
+        try:
+            try:
+                cursor.executemany(self.spec['insert'], rows)
+                self.connection.commit()
+                inserted = accepted
+            except Error:
+                # Usually an email registered concurrently; retry row by row to isolate it
+                self.connection.rollback()
+                inserted = []
+                for (line, values), row in zip(accepted, rows):
+                    try:
+                        cursor.execute(self.spec['insert'], row)
+                        self.connection.commit()
+                        inserted.append((line, values))
+                    except Error as e:
+                        self.connection.rollback()
+                        self._error(line, str(e))
+        finally:
+            cursor.close()
+
+        self.imported += len(inserted)
+        if inserted and self.on_insert is not None:
+            self.on_insert([values for _, values in inserted])
+
+
+def export_rows(cursor, columns, fmt, batch_size=1000):
+    """Yield the rows of an executed (unbuffered) cursor as NDJSON or CSV text, batch by batch."""
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        if fmt == 'csv':
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        else:
+            yield ''.join(json.dumps(dict(zip(columns, row)), default=str) + '\n' for row in rows)
+    if fmt == 'csv' and buffer.tell():
+        yield buffer.getvalue()
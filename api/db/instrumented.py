@@ -0,0 +1,64 @@
+"""Connection and cursor proxies that time queries into a ``RequestStats``."""
+import time
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, stats, observe=None):
+        self._cursor = cursor
+        self._stats = stats
+        self._observe = observe
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stats.db_seconds += elapsed
+            if self._observe is not None:
+                self._observe(elapsed)
+
+    def execute(self, query, params=()):
+        self._stats.queries += 1
+        return self._timed(self._cursor.execute, query, params)
+
+    def executemany(self, query, seq_of_params):
+        self._stats.queries += 1
+        return self._timed(self._cursor.executemany, query, seq_of_params)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._timed(self._cursor.fetchmany, size)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._stats.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Wraps a pooled connection; every cursor it hands out is instrumented."""
+
+    def __init__(self, connection, stats, observe=None):
+        self._connection = connection
+        self._stats = stats
+        self._observe = observe
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._stats, self._observe)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
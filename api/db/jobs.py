@@ -0,0 +1,309 @@
+"""Durable background jobs kept in the ``job`` table.
+
+Request handlers queue follow-up work with ``JobQueue.enqueue(cursor, kind,
+payload)`` on their own cursor, so a job commits or rolls back together with
+the write that caused it, and the request returns without waiting for it.
+
+``JobWorker`` threads poll for due jobs. A worker claims a job with an
+optimistic UPDATE: when several workers see the same job, only one UPDATE
+matches. It then runs the handler registered for the job's kind. A handler
+that raises is retried with exponential backoff and jitter until the job
+runs out of attempts, and is then marked failed. Claims are leases: if a
+worker dies mid-job, the job is requeued once the lease expires. Handlers
+may therefore run more than once and must be idempotent.
+"""
+import datetime
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+
+from mysql.connector import Error
+
+from api.db import queries
+from api.db.pool import PoolError
+
+logger = logging.getLogger(__name__)
+
+# Due jobs a worker considers per claim; more than one, so losing a race does not mean an idle poll
+CLAIM_CANDIDATES = 10
+
+# Seconds between sweeps for expired leases and old finished jobs
+HOUSEKEEPING_INTERVAL = 60
+
+# Longest error message kept on a job
+MAX_ERROR_LENGTH = 2000
+
+
+def db_time(moment):
+    return moment.strftime(queries.DATETIME_FORMAT)
+
+
+def utcnow():
+    return datetime.datetime.utcnow().replace(microsecond=0)
+
+
+def backoff_delay(attempt, base, maximum):
+    """Seconds before retrying after failed ``attempt`` (1-based).
+
+    Doubles per attempt up to ``maximum``. The upper half is jittered so
+    jobs that failed together do not all retry at the same moment.
+    """
+    delay = min(maximum, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class JobQueue:
+    """The ``job`` table, reached through ``pool`` (use the primary's)."""
+
+    def __init__(self, pool, max_attempts=5, backoff_base=5.0, backoff_max=600.0, lease=300.0, retention_days=7):
+        self.pool = pool
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self.retention_days = retention_days
+
+    def insert_params(self, kind, payload=None, delay=0):
+        """Parameters for ``queries.JOB_INSERT`` (for callers that run it themselves)."""
+        run_at = utcnow() + datetime.timedelta(seconds=delay)
+        return kind, json.dumps(payload or {}, separators=(',', ':')), self.max_attempts, db_time(run_at)
+
+    def enqueue(self, cursor, kind, payload=None, delay=0):
+        """Queue a job on ``cursor``'s connection; it becomes visible when the caller commits.
+
+        Returns the job id.
+        """
+        cursor.execute(queries.JOB_INSERT, self.insert_params(kind, payload, delay))
+        return cursor.lastrowid
+
+    def claim(self, worker_id):
+        """Claim the oldest due job for ``worker_id``; returns it as a dict, or None if none is due."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                now = utcnow()
+                cursor.execute(queries.JOB_DUE, (db_time(now), CLAIM_CANDIDATES))
+                candidates = [row['id'] for row in cursor.fetchall()]
+                connection.rollback()
+                locked_until = db_time(now + datetime.timedelta(seconds=self.lease))
+                for job_id in candidates:
+                    cursor.execute(queries.JOB_CLAIM, (worker_id, locked_until, job_id))
+                    if cursor.rowcount == 1:
+                        connection.commit()
+                        cursor.execute(queries.JOB_GET, (job_id,))
+                        job = cursor.fetchone()
+                        connection.rollback()
+                        job['payload'] = json.loads(job['payload'])
+                        return job
+                    # Another worker got there first; end the transaction so nothing stays locked
+                    connection.rollback()
+                return None
+            finally:
+                cursor.close()
+
+    def _finish(self, query, params):
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                finished = cursor.rowcount == 1
+                connection.commit()
+                return finished
+            finally:
+                cursor.close()
+
+    def complete(self, job, worker_id):
+        if not self._finish(queries.JOB_COMPLETE, (db_time(utcnow()), job['id'], worker_id)):
+            logger.warning(f"Job {job['id']} finished after its lease expired; it may run again")
+
+    def fail(self, job, worker_id, error):
+        """Record a failed attempt: schedule a retry, or fail the job for good. Returns the new status."""
+        error = str(error)[:MAX_ERROR_LENGTH]
+        if job['attempts'] >= job['max_attempts']:
+            self._finish(queries.JOB_FAIL, (error, db_time(utcnow()), job['id'], worker_id))
+            return 'failed'
+        delay = backoff_delay(job['attempts'], self.backoff_base, self.backoff_max)
+        run_at = utcnow() + datetime.timedelta(seconds=delay)
+        self._finish(queries.JOB_RETRY, (db_time(run_at), error, job['id'], worker_id))
+        return 'queued'
+
+    def _execute(self, query, params=()):
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                affected = cursor.rowcount
+                connection.commit()
+                return affected
+            finally:
+                cursor.close()
+
+    def requeue_expired(self):
+        """Release jobs whose worker's lease ran out; returns how many."""
+        now = db_time(utcnow())
+        return self._execute(queries.JOB_REQUEUE_EXPIRED, (now, now))
+
+    def retry_failed(self):
+        """Give every failed job a fresh set of attempts; returns how many."""
+        return self._execute(queries.JOB_RETRY_FAILED, (db_time(utcnow()),))
+
+    def purge(self):
+        """Delete finished and failed jobs older than ``retention_days``; returns how many."""
+        cutoff = utcnow() - datetime.timedelta(days=self.retention_days)
+        return self._execute(queries.JOB_PURGE, (db_time(cutoff),))
+
+    def counts(self):
+        """``{status: jobs}`` across the table."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(queries.JOB_COUNTS)
+                return {row['status']: row['jobs'] for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def recent_failures(self, limit=10):
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(queries.JOB_RECENT_FAILURES, (limit,))
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+
+class JobWorker:
+    """Runs queued jobs on ``threads`` daemon threads.
+
+    ``handlers`` maps a job kind to ``handler(connection, payload)``, which
+    gets a pooled connection and commits any writes itself. Threads start on
+    the first ``ensure_started()`` in each process, so a server that forks
+    after creating the worker starts fresh threads in every child.
+    """
+
+    def __init__(self, queue, handlers, threads=1, poll_interval=1.0, name=None):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.name = name
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._housekept_at = 0.0
+        self._counters = {'completed': 0, 'retried': 0, 'failed': 0, 'running': 0}
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self._counters[key] += delta
+
+    def worker_name(self):
+        """Prefix of the ids this process's threads claim jobs under (host:pid unless named)."""
+        return self.name or f"{socket.gethostname()}:{os.getpid()}"
+
+    def ensure_started(self):
+        """Start the job threads in this process unless they already run (cheap to call often)."""
+        if self._pid == os.getpid() or not self.threads:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads of a parent process do not survive a fork; start our own
+            self._pid = os.getpid()
+            self._stopping.clear()
+            name = self.worker_name()
+            self._threads = [
+                threading.Thread(target=self._loop, args=(f"{name}/{number}",), name=f"job-worker-{number}", daemon=True)
+                for number in range(1, self.threads + 1)
+            ]
+            for thread in self._threads:
+                thread.start()
+        logger.info(f"Started {self.threads} job worker threads")
+
+    def wake(self):
+        """Have idle threads poll now rather than at the end of their interval (e.g. after an enqueue)."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Ask the threads to finish their current job and exit; waits up to ``timeout`` seconds."""
+        self._stopping.set()
+        self._wake.set()
+        if self._pid != os.getpid():
+            return
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._lock:
+            self._threads = []
+            self._pid = None
+
+    def _loop(self, worker_id):
+        while not self._stopping.is_set():
+            try:
+                self._housekeeping()
+                ran = self.run_once(worker_id)
+            except (PoolError, Error) as e:
+                logger.warning(f"Job worker {worker_id} cannot reach the database: {e}")
+                ran = False
+            except Exception:
+                # Keep the thread alive; the job, if any, is retried once its lease expires
+                logger.exception(f"Job worker {worker_id} hit an unexpected error")
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _housekeeping(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._housekept_at < HOUSEKEEPING_INTERVAL:
+                return
+            self._housekept_at = now
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs whose lease expired")
+        self.queue.purge()
+
+    def run_once(self, worker_id):
+        """Claim and run one due job; returns False if none was due."""
+        job = self.queue.claim(worker_id)
+        if job is None:
+            return False
+        self._count('running')
+        started = time.perf_counter()
+        try:
+            handler = self.handlers.get(job['kind'])
+            if handler is None:
+                raise LookupError(f"No handler for job kind '{job['kind']}'")
+            with self.queue.pool.connection() as connection:
+                handler(connection, job['payload'])
+        except Exception as e:
+            status = self.queue.fail(job, worker_id, f"{type(e).__name__}: {e}")
+            self._count('retried' if status == 'queued' else 'failed')
+            log = logger.warning if status == 'queued' else logger.error
+            log(f"Job {job['id']} ({job['kind']}) failed on attempt {job['attempts']}/{job['max_attempts']}: {e}")
+        else:
+            self.queue.complete(job, worker_id)
+            self._count('completed')
+            logger.debug(f"Job {job['id']} ({job['kind']}) done in {time.perf_counter() - started:.3f}s")
+        finally:
+            self._count('running', -1)
+        return True
+
+    def run_until_empty(self, worker_id):
+        """Run due jobs one after another until none is left; returns how many ran."""
+        ran = 0
+        while self.run_once(worker_id):
+            ran += 1
+        return ran
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['threads'] = len(self._threads) if self._pid == os.getpid() else 0
+        return stats
@@ -0,0 +1,445 @@
+"""Versioned, forward-only schema migrations.
+
+Each migration is a function registered with ``@migration(version, name)``
+that receives a cursor. Applied versions are recorded in the
+``schema_migrations`` table, and ``upgrade()`` runs whatever is pending in
+order while holding a MySQL named lock, so two deploys cannot migrate the
+same database at once. Run them from the repository root, never over HTTP::
+
+    python -m api.migrate status
+    python -m api.migrate upgrade [--to VERSION]
+
+MySQL commits DDL implicitly, so a migration cannot be rolled back as a
+unit. Every step therefore checks ``information_schema`` first
+(``ensure_column``, ``ensure_index``), and a migration that was interrupted
+halfway can simply be run again. Data backfills commit one primary-key
+range at a time and skip rows that are already filled in, for the same
+reason. Databases created by the old
+``/api/init-db`` are adopted the same way: their tables and indexes are
+found to exist and only the version rows are written.
+
+Schema changes are online. Indexes are built with ``ALGORITHM=INPLACE,
+LOCK=NONE`` and columns are added with ``ALGORITHM=INSTANT`` where the
+server supports it (otherwise ``INPLACE, LOCK=NONE``). Reads and writes
+carry on while they run. If the server cannot honour the requested
+algorithm it refuses the statement instead of falling back to a blocking
+table copy.
+
+Migrations only add things, so code one release older than the database
+keeps working. ``check_schema()`` therefore refuses to serve only when the
+database is *behind* the code.
+"""
+import logging
+import time
+
+from mysql.connector import Error, errorcode
+
+from api.db import queries
+from api.utils.geo import resolve_point
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+# Named lock serializing concurrent `upgrade` runs against one database
+LOCK_NAME = 'freelancer_schema_migrations'
+
+MIGRATIONS = []
+
+
+class SchemaMismatchError(Exception):
+    """The database schema is older than the code expects."""
+
+    def __init__(self, version, expected):
+        self.version = version
+        self.expected = expected
+        super().__init__(
+            f"Database schema is at version {version} but this code needs version {expected}; "
+            f"run `python -m api.migrate upgrade`"
+        )
+
+
+class MigrationLockError(Exception):
+    """Another process is already migrating this database."""
+
+
+def migration(version, name):
+    """Register the decorated ``function(cursor)`` as migration ``version``."""
+    def register(function):
+        if MIGRATIONS and version != MIGRATIONS[-1][0] + 1:
+            raise ValueError(f"Migration {version} does not follow {MIGRATIONS[-1][0]}")
+        MIGRATIONS.append((version, name, function))
+        return function
+    return register
+
+
+# ----- ONLINE DDL HELPERS -----
+
+def _exists(cursor, query, params):
+    cursor.execute(query, params)
+    return cursor.fetchone() is not None
+
+
+def ensure_table(cursor, table, definition):
+    """Create ``table`` from its column/key ``definition`` unless it exists."""
+    if _exists(cursor, "SELECT 1 FROM information_schema.tables "
+                       "WHERE table_schema = DATABASE() AND table_name = %s LIMIT 1", (table,)):
+        return False
+    logger.info(f"Creating table {table}...")
+    cursor.execute(f"CREATE TABLE {table} ({definition})")
+    return True
+
+
+def ensure_column(cursor, table, column, definition):
+    """Add a column without rebuilding the table where the server allows it."""
+    if _exists(cursor, "SELECT 1 FROM information_schema.columns "
+                       "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+               (table, column)):
+        return False
+    logger.info(f"Adding column {column} to {table}...")
+    statement = f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+    try:
+        cursor.execute(f"{statement}, ALGORITHM=INSTANT")
+    except Error as e:
+        # Servers before MySQL 8.0.12 / MariaDB 10.3 have no INSTANT; rebuild in place, still online
+        logger.info(f"Instant ADD COLUMN unavailable ({e}); rebuilding {table} in place")
+        cursor.execute(f"{statement}, ALGORITHM=INPLACE, LOCK=NONE")
+    return True
+
+
+def ensure_index(cursor, table, index_name, columns, kind='INDEX'):
+    """Build an index while the table stays readable and writable.
+
+    InnoDB cannot accept writes while it builds a FULLTEXT index, so those
+    take ``LOCK=SHARED`` instead (reads continue).
+    """
+    if _exists(cursor, "SELECT 1 FROM information_schema.statistics "
+                       "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+               (table, index_name)):
+        return False
+    lock = 'SHARED' if kind == 'FULLTEXT' else 'NONE'
+    logger.info(f"Creating index {index_name} on {table} (LOCK={lock})...")
+    cursor.execute(f"ALTER TABLE {table} ADD {kind} {index_name} ({', '.join(columns)}), "
+                   f"ALGORITHM=INPLACE, LOCK={lock}")
+    return True
+
+
+def drop_index(cursor, table, index_name):
+    """Drop an index if it exists; dropping a secondary index is online and metadata-only."""
+    if not _exists(cursor, "SELECT 1 FROM information_schema.statistics "
+                           "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+                   (table, index_name)):
+        return False
+    logger.info(f"Dropping index {index_name} on {table}...")
+    cursor.execute(f"ALTER TABLE {table} DROP INDEX {index_name}, ALGORITHM=INPLACE, LOCK=NONE")
+    return True
+
+
+# ----- MIGRATIONS -----
+# Never edit a migration that has shipped; add a new one instead.
+
+# Seeker ids per backfill UPDATE. Each batch commits on its own, so a backfill never
+# holds row locks on the whole table or builds one huge undo log.
+BACKFILL_BATCH = 5000
+
+# Secondary indexes serving the /api/seekers sort orders. InnoDB appends the
+# primary key to every secondary index, so each of these also orders ties by
+# id, which is exactly what keyset pagination needs. The skill, location and
+# time_period filters match substrings (LIKE '%x%'), which no B-tree index can
+# serve: they are checked row by row while walking the sort order's index, and
+# a page ends once it has 'limit' matches.
+SEEKER_SEARCH_INDEXES = {
+    'idx_seeker_rating': ('rating',),
+    'idx_seeker_base_price': ('base_price',),
+    'idx_seeker_experience': ('years_of_experience',),
+}
+
+# Built by migration 2 for prefix filters; dropped by migration 7 once the
+# filters matched substrings, since no query could use them any more
+SEEKER_FILTER_INDEXES = {
+    'idx_seeker_skill_rating': ('skill', 'rating'),
+    'idx_seeker_location': ('location',),
+    'idx_seeker_time_period': ('time_period',),
+}
+
+# Full-text index backing relevance-ranked ?q= searches
+SEEKER_FULLTEXT_INDEX = ('ft_seeker_skill_location', ('skill', 'location'))
+
+# geohash is binary-collated so cell ranges compare byte by byte
+SEEKER_GEO_COLUMNS = {
+    'latitude': 'DECIMAL(9, 6) NULL',
+    'longitude': 'DECIMAL(9, 6) NULL',
+    'geohash': 'VARCHAR(12) CHARACTER SET ascii COLLATE ascii_bin NULL',
+}
+
+SEEKER_RANK_COLUMNS = {
+    'rating_total': 'INT NOT NULL DEFAULT 0',
+    'rank_score': 'DECIMAL(7, 4) NOT NULL DEFAULT 0',
+}
+
+
+@migration(1, 'create provider and seeker tables')
+def create_base_tables(cursor):
+    ensure_table(cursor, 'provider', """
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(20) NOT NULL,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    """)
+    ensure_table(cursor, 'seeker', """
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(20) NOT NULL,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        skill VARCHAR(255) NOT NULL,
+        years_of_experience INT NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        time_period VARCHAR(50) NOT NULL,
+        base_price DECIMAL(10, 2) NOT NULL,
+        rating DECIMAL(3, 1) DEFAULT 0,
+        reviews INT DEFAULT 0,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    """)
+
+
+@migration(2, 'add seeker search indexes')
+def add_seeker_search_indexes(cursor):
+    for index_name, columns in {**SEEKER_FILTER_INDEXES, **SEEKER_SEARCH_INDEXES}.items():
+        ensure_index(cursor, 'seeker', index_name, columns)
+    ensure_index(cursor, 'seeker', *SEEKER_FULLTEXT_INDEX, kind='FULLTEXT')
+
+
+@migration(3, 'add seeker coordinates and geohash index')
+def add_seeker_geo(cursor):
+    for column, definition in SEEKER_GEO_COLUMNS.items():
+        ensure_column(cursor, 'seeker', column, definition)
+    backfill_seeker_points(cursor)
+    ensure_index(cursor, 'seeker', 'idx_seeker_geohash', ('geohash',))
+
+
+@migration(4, 'add reviews and seeker rank score')
+def add_reviews(cursor):
+    for column, definition in SEEKER_RANK_COLUMNS.items():
+        ensure_column(cursor, 'seeker', column, definition)
+    # Both backfills run on every attempt, so a run interrupted after adding the
+    # columns still fills them in; the first only touches rows it has not filled yet
+    backfill_in_batches(cursor, queries.SEEKER_BACKFILL_RATING_TOTAL)
+    backfill_in_batches(cursor, queries.SEEKER_RECOMPUTE_RANK_RANGE)
+    ensure_index(cursor, 'seeker', 'idx_seeker_rank_score', ('rank_score',))
+
+    # One review per provider per seeker
+    ensure_table(cursor, 'review', """
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        seeker_id INT NOT NULL,
+        provider_id INT NOT NULL,
+        rating TINYINT NOT NULL,
+        comment TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_review_provider_seeker (provider_id, seeker_id),
+        KEY idx_review_seeker (seeker_id),
+        FOREIGN KEY (seeker_id) REFERENCES seeker (id) ON DELETE CASCADE,
+        FOREIGN KEY (provider_id) REFERENCES provider (id) ON DELETE CASCADE
+    """)
+
+
+@migration(5, 'add availability slots and bookings')
+def add_bookings(cursor):
+    # 'version' is bumped on every status change so bookings can claim a slot optimistically
+    ensure_table(cursor, 'availability_slot', """
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        seeker_id INT NOT NULL,
+        time_period VARCHAR(50) NOT NULL,
+        starts_at DATETIME NOT NULL,
+        ends_at DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'open',
+        version INT NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_slot_seeker_start (seeker_id, starts_at),
+        KEY idx_slot_status_start (status, starts_at),
+        FOREIGN KEY (seeker_id) REFERENCES seeker (id) ON DELETE CASCADE
+    """)
+    # At most one confirmed booking per slot: 'active' is 1 while confirmed and NULL once
+    # cancelled, and NULLs never collide in a unique key
+    ensure_table(cursor, 'booking', """
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        slot_id INT NOT NULL,
+        seeker_id INT NOT NULL,
+        provider_id INT NOT NULL,
+        price DECIMAL(10, 2) NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'confirmed',
+        active TINYINT NULL DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_booking_active_slot (slot_id, active),
+        KEY idx_booking_provider (provider_id),
+        KEY idx_booking_seeker (seeker_id),
+        FOREIGN KEY (slot_id) REFERENCES availability_slot (id) ON DELETE CASCADE,
+        FOREIGN KEY (seeker_id) REFERENCES seeker (id) ON DELETE CASCADE,
+        FOREIGN KEY (provider_id) REFERENCES provider (id) ON DELETE CASCADE
+    """)
+
+
+@migration(6, 'add background job queue')
+def add_jobs(cursor):
+    # Workers poll idx_job_status_run_at for due 'queued' jobs; finished_at drives the purge
+    ensure_table(cursor, 'job', """
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        kind VARCHAR(100) NOT NULL,
+        payload TEXT NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'queued',
+        attempts INT NOT NULL DEFAULT 0,
+        max_attempts INT NOT NULL,
+        run_at DATETIME NOT NULL,
+        locked_by VARCHAR(100) NULL,
+        locked_until DATETIME NULL,
+        last_error TEXT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at DATETIME NULL,
+        KEY idx_job_status_run_at (status, run_at)
+    """)
+
+
+@migration(7, 'drop seeker filter indexes that substring filters cannot use')
+def drop_seeker_filter_indexes(cursor):
+    # Every seeker write paid to maintain them
+    for index_name in SEEKER_FILTER_INDEXES:
+        drop_index(cursor, 'seeker', index_name)
+
+
+def seeker_id_ranges(cursor, batch=BACKFILL_BATCH):
+    """``[(first, last)]`` primary-key ranges of ``batch`` ids covering the seeker table."""
+    cursor.execute(queries.SEEKER_ID_RANGE)
+    low, high = cursor.fetchone()
+    if low is None:
+        return []
+    return [(first, first + batch - 1) for first in range(low, high + 1, batch)]
+
+
+def backfill_in_batches(cursor, query):
+    """Run ``query`` (ending in ``id BETWEEN %s AND %s``) over every seeker range,
+    committing after each; returns the rows changed."""
+    changed = 0
+    for first, last in seeker_id_ranges(cursor):
+        cursor.execute(query, (first, last))
+        if cursor.rowcount > 0:
+            changed += cursor.rowcount
+            cursor.execute("COMMIT")
+    return changed
+
+
+def backfill_seeker_points(cursor):
+    """Geocode seekers saved without coordinates: per primary-key range, one UPDATE per distinct location."""
+    located = 0
+    for first, last in seeker_id_ranges(cursor):
+        cursor.execute(queries.SEEKER_UNGEOCODED_LOCATIONS, (first, last))
+        batch = 0
+        for (location,) in cursor.fetchall():
+            latitude, longitude, geohash = resolve_point(location)
+            if geohash:
+                cursor.execute(queries.SEEKER_SET_LOCATION_POINT,
+                               (latitude, longitude, geohash, location, first, last))
+                batch += cursor.rowcount
+        if batch:
+            located += batch
+            cursor.execute("COMMIT")
+    if located:
+        logger.info(f"Geocoded {located} existing seekers")
+    return located
+
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Every seeker index as of LATEST_VERSION, for stand-in schemas such as the benchmarks'
+SEEKER_INDEXES = {
+    **SEEKER_SEARCH_INDEXES,
+    'idx_seeker_geohash': ('geohash',),
+    'idx_seeker_rank_score': ('rank_score',),
+}
+
+
+# ----- RUNNER -----
+
+def current_version(connection):
+    """Highest applied migration version; 0 for a database that was never migrated."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT MAX(version) FROM {MIGRATIONS_TABLE}")
+        row = cursor.fetchone()
+        return (row[0] if row else None) or 0
+    except Error as e:
+        if e.errno == errorcode.ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    finally:
+        cursor.close()
+
+
+def applied(connection):
+    """``[(version, name, applied_at, duration_ms)]`` for every applied migration."""
+    if not current_version(connection):
+        return []
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT version, name, applied_at, duration_ms FROM {MIGRATIONS_TABLE} ORDER BY version")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def pending(connection, target=None):
+    """Migrations newer than the database, up to ``target`` (default: all)."""
+    version = current_version(connection)
+    return [entry for entry in MIGRATIONS
+            if entry[0] > version and (target is None or entry[0] <= target)]
+
+
+def upgrade(connection, target=None, lock_timeout=60):
+    """Apply pending migrations in order; returns the versions applied.
+
+    Raises ``MigrationLockError`` if another process holds the migration
+    lock for longer than ``lock_timeout`` seconds.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, lock_timeout))
+        if cursor.fetchone()[0] != 1:
+            raise MigrationLockError(f"Timed out waiting for lock '{LOCK_NAME}'; is another migration running?")
+        try:
+            ensure_table(cursor, MIGRATIONS_TABLE, """
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                duration_ms INT NOT NULL
+            """)
+            done = []
+            # Re-read under the lock: a concurrent run may have finished while we waited
+            for version, name, function in pending(connection, target):
+                logger.info(f"Applying migration {version}: {name}...")
+                started = time.monotonic()
+                function(cursor)
+                duration_ms = int((time.monotonic() - started) * 1000)
+                cursor.execute(f"INSERT INTO {MIGRATIONS_TABLE} (version, name, duration_ms) VALUES (%s, %s, %s)",
+                               (version, name, duration_ms))
+                connection.commit()
+                logger.info(f"Migration {version} applied in {duration_ms} ms")
+                done.append(version)
+            return done
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def check_schema(connection):
+    """Return the database's schema version; raise ``SchemaMismatchError`` if it is behind the code."""
+    version = current_version(connection)
+    if version < LATEST_VERSION:
+        raise SchemaMismatchError(version, LATEST_VERSION)
+    if version > LATEST_VERSION:
+        logger.warning(f"Database schema is at version {version}, newer than this code's {LATEST_VERSION}")
+    return version
@@ -0,0 +1,238 @@
+"""Thread-safe database connection pool shared by the API routes."""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolError(Exception):
+    """Raised when the pool cannot hand out a connection."""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became free within the checkout timeout."""
+
+
+class _Slot:
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+def _default_ping(connection):
+    # mysql.connector's is_connected() issues a COM_PING round trip
+    return connection.is_connected()
+
+
+class ConnectionPool:
+    """Bounded pool of reusable connections.
+
+    ``connect`` is a zero-argument callable returning a new DB-API
+    connection and raising on failure. Up to ``size`` connections are kept
+    idle between requests; up to ``max_overflow`` extra connections may be
+    opened under bursts and are closed as soon as they are released.
+    Connections older than ``recycle`` seconds are replaced on checkout, and
+    connections idle for more than ``ping_after`` seconds are pinged first.
+    """
+
+    def __init__(self, connect, size=10, max_overflow=10, timeout=30.0,
+                 recycle=3600, ping_after=30.0, ping=_default_ping, name='default'):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.name = name
+        self.size = size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self._connect = connect
+        self._ping = ping
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._checked_out = {}
+        self._reset_state()
+
+    def _reset_state(self):
+        self._idle.clear()
+        self._checked_out.clear()
+        self._open = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+        self._counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'connects': 0,
+            'connect_errors': 0,
+            'recycled': 0,
+            'stale': 0,
+            'discarded': 0,
+            'wait_seconds': 0.0,
+            'peak_in_use': 0,
+        }
+
+    @property
+    def capacity(self):
+        return self.size + self.max_overflow
+
+    def _count(self, key):
+        with self._cond:
+            self._counters[key] += 1
+
+    def _check_pid(self):
+        # Connections inherited across fork() share sockets with the parent,
+        # so a forked child simply forgets them and starts from scratch.
+        if self._pid != os.getpid():
+            with self._cond:
+                if self._pid != os.getpid():
+                    self._reset_state()
+
+    def _new_slot(self):
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._counters['connect_errors'] += 1
+                self._cond.notify()
+            raise
+        self._count('connects')
+        return _Slot(connection)
+
+    def _is_usable(self, slot):
+        now = time.monotonic()
+        if self.recycle is not None and now - slot.created_at > self.recycle:
+            self._count('recycled')
+            return False
+        if self.ping_after is not None and now - slot.last_used >= self.ping_after:
+            try:
+                alive = self._ping(slot.connection)
+            except Exception:
+                alive = False
+            if not alive:
+                self._count('stale')
+                return False
+        return True
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to ``timeout`` seconds."""
+        self._check_pid()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        slot = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    slot = self._idle.pop()
+                    break
+                if self._open < self.capacity:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {timeout}s waiting for a connection from pool '{self.name}'"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        if slot is not None and not self._is_usable(slot):
+            self._close_quietly(slot.connection)
+            slot = None
+        if slot is None:
+            slot = self._new_slot()
+
+        with self._cond:
+            self._checked_out[id(slot.connection)] = slot
+            self._counters['checkouts'] += 1
+            self._counters['wait_seconds'] += time.monotonic() - started
+            self._counters['peak_in_use'] = max(self._counters['peak_in_use'], len(self._checked_out))
+        return slot.connection
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool (or close it if it is broken or overflow)."""
+        with self._cond:
+            slot = self._checked_out.pop(id(connection), None)
+        if slot is None:
+            logger.warning(f"Connection released to pool '{self.name}' that it did not hand out")
+            return
+
+        if not discard:
+            try:
+                # Never hand an open transaction to the next borrower
+                if getattr(connection, 'in_transaction', False):
+                    connection.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding pooled connection after failed rollback: {e}")
+                discard = True
+
+        with self._cond:
+            # Overflow connections are closed unless a caller is already waiting
+            if discard or (self._open > self.size and not self._waiting):
+                self._open -= 1
+                self._counters['discarded'] += 1
+                keep = False
+            else:
+                slot.last_used = time.monotonic()
+                self._idle.append(slot)
+                keep = True
+            self._cond.notify()
+        if not keep:
+            self._close_quietly(connection)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrow a connection for the duration of a ``with`` block."""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def stats(self):
+        """Snapshot of pool occupancy and lifetime counters."""
+        with self._cond:
+            stats = dict(self._counters)
+            stats.update({
+                'name': self.name,
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': len(self._checked_out),
+                'waiting': self._waiting,
+            })
+        stats['wait_seconds'] = round(stats['wait_seconds'], 6)
+        return stats
+
+    def close(self):
+        """Close every idle connection; checked-out ones are closed on release."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for slot in idle:
+            self._close_quietly(slot.connection)
+
+    def reset(self):
+        """Forget all connections without closing them (use in a freshly forked child)."""
+        with self._cond:
+            self._reset_state()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing pooled connection: {e}")
@@ -0,0 +1,760 @@
+"""SQL statements and row formatting shared by the sync and async apps."""
+import datetime
+import math
+
+from api.utils.geo import KM_PER_DEGREE, covering_cells, haversine_km, parse_point
+from api.utils.pagination import decode_cursor, encode_cursor, like_contains
+from api.utils.ranking import rank_score_sql
+from api.utils.search_index import fulltext_query, normalize_term
+
+# ----- PROVIDER QUERIES -----
+
+PROVIDER_EMAIL_EXISTS = "SELECT 1 FROM provider WHERE email = %s LIMIT 1"
+
+PROVIDER_EXISTS = "SELECT 1 FROM provider WHERE id = %s"
+
+PROVIDER_INSERT = "INSERT INTO provider (name, phone_number, email, password) VALUES (%s, %s, %s, %s)"
+
+PROVIDER_LOGIN = "SELECT id, name, email, password FROM provider WHERE email = %s"
+
+PROVIDER_SET_PASSWORD = "UPDATE provider SET password = %s WHERE id = %s"
+
+# Bulk import dedup; {placeholders} is filled with one %s per email
+PROVIDER_EXISTING_EMAILS = "SELECT email FROM provider WHERE email IN ({placeholders})"
+
+# ----- SEEKER QUERIES -----
+
+SEEKER_EMAIL_EXISTS = "SELECT 1 FROM seeker WHERE email = %s LIMIT 1"
+
+SEEKER_INSERT = """INSERT INTO seeker
+    (name, phone_number, email, skill, years_of_experience, location, time_period, base_price, password, rating, reviews,
+     latitude, longitude, geohash, rank_score)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+
+SEEKER_LOGIN = (
+    "SELECT id, name, email, password, skill, years_of_experience, location, time_period, base_price, rating, reviews "
+    "FROM seeker WHERE email = %s"
+)
+
+SEEKER_SET_PASSWORD = "UPDATE seeker SET password = %s WHERE id = %s"
+
+SEEKER_EXISTING_EMAILS = "SELECT email FROM seeker WHERE email IN ({placeholders})"
+
+# Columns written by /api/seekers/export for administrators, in order (everything but the password hash)
+SEEKER_EXPORT_COLUMNS = (
+    'id', 'name', 'phone_number', 'email', 'skill', 'years_of_experience', 'location', 'time_period',
+    'base_price', 'rating', 'reviews', 'created_at'
+)
+
+# The same without contact details, for every other provider
+SEEKER_PUBLIC_EXPORT_COLUMNS = tuple(column for column in SEEKER_EXPORT_COLUMNS
+                                     if column not in ('phone_number', 'email'))
+
+SEEKER_EXPORT = f"SELECT {', '.join(SEEKER_EXPORT_COLUMNS)} FROM seeker ORDER BY id"
+
+SEEKER_PUBLIC_EXPORT = f"SELECT {', '.join(SEEKER_PUBLIC_EXPORT_COLUMNS)} FROM seeker ORDER BY id"
+
+# Columns behind GET /api/seeker/<id> and /api/seekers/batch
+SEEKER_PROFILE_COLUMNS = "id, name, email, skill, years_of_experience, location, time_period, base_price, rating, reviews"
+
+SEEKER_PROFILE = f"SELECT {SEEKER_PROFILE_COLUMNS} FROM seeker WHERE id = %s"
+
+# Most ids one /api/seekers/batch request may ask for
+MAX_BATCH_IDS = 250
+
+# SEEKER_PROFILE for many ids in one primary-key lookup; {placeholders} is filled with one %s per id
+SEEKER_PROFILES = f"SELECT {SEEKER_PROFILE_COLUMNS} FROM seeker WHERE id IN ({{placeholders}})"
+
+# Columns returned by /api/seekers (never SELECT *, which drags the password hash along)
+SEEKER_LIST_COLUMNS = "id, name, skill, years_of_experience, location, time_period, base_price, rating, reviews, rank_score"
+
+# Relevance of a row to a boolean-mode ?q= query (served by ft_seeker_skill_location)
+SEEKER_MATCH = "MATCH(skill, location) AGAINST (%s IN BOOLEAN MODE)"
+
+# Locations registered before geocoding existed, and the backfill for one of them, per primary-key range
+SEEKER_UNGEOCODED_LOCATIONS = (
+    "SELECT DISTINCT location FROM seeker WHERE geohash IS NULL AND id BETWEEN %s AND %s"
+)
+
+SEEKER_SET_LOCATION_POINT = (
+    "UPDATE seeker SET latitude = %s, longitude = %s, geohash = %s "
+    "WHERE location = %s AND geohash IS NULL AND id BETWEEN %s AND %s"
+)
+
+SEEKER_ID_RANGE = "SELECT MIN(id), MAX(id) FROM seeker"
+
+SEEKER_EXISTS = "SELECT 1 FROM seeker WHERE id = %s"
+
+# Whether the account a token names still exists, by user type
+ACCOUNT_EXISTS = {'provider': PROVIDER_EXISTS, 'seeker': SEEKER_EXISTS}
+
+# Taken before the review row, so reviews of one seeker queue up instead of deadlocking over gap locks
+SEEKER_EXISTS_FOR_UPDATE = "SELECT 1 FROM seeker WHERE id = %s FOR UPDATE"
+
+SEEKER_RATING = "SELECT rating, reviews FROM seeker WHERE id = %s"
+
+# O(1) rating aggregation: fold a review's stars (and +1 review, or 0 for an edit)
+# into the running totals. rating and rank_score are assigned first so they read
+# the pre-update totals on both MySQL (left-to-right SET) and SQLite; "* 1.0"
+# keeps SQLite from truncating the average with integer division.
+# Params: stars, count, stars, count, stars, count, seeker id
+SEEKER_ADD_REVIEW = (
+    "UPDATE seeker SET "
+    "rating = ROUND((rating_total + %s) * 1.0 / (reviews + %s), 1), "
+    f"rank_score = {rank_score_sql('(rating_total + %s)', '(reviews + %s)')}, "
+    "rating_total = rating_total + %s, "
+    "reviews = reviews + %s "
+    "WHERE id = %s"
+)
+
+# Full recomputation, for backfills and after changing the ranking constants
+SEEKER_RECOMPUTE_RANK = f"UPDATE seeker SET rank_score = {rank_score_sql('rating_total', 'reviews')}"
+
+# The same for one primary-key range, so a large table is rewritten in short transactions
+SEEKER_RECOMPUTE_RANK_RANGE = f"{SEEKER_RECOMPUTE_RANK} WHERE id BETWEEN %s AND %s"
+
+# Columns predating the reviews table carry a rounded average; recover an approximate star total from it.
+# Rows with reviews but no total have not been backfilled yet (a real review adds at least one star).
+SEEKER_BACKFILL_RATING_TOTAL = (
+    "UPDATE seeker SET rating_total = ROUND(rating * reviews) "
+    "WHERE rating_total = 0 AND reviews > 0 AND id BETWEEN %s AND %s"
+)
+
+SEEKER_TERMS = (
+    "SELECT 'skill', skill, COUNT(*) FROM seeker GROUP BY skill "
+    "UNION ALL "
+    "SELECT 'location', location, COUNT(*) FROM seeker GROUP BY location"
+)
+
+# Allowed ?sort= values mapped to (column, default order)
+SEEKER_SORTS = {
+    'id': ('id', 'asc'),
+    'relevance': ('relevance', 'desc'),
+    'rating': ('rating', 'desc'),
+    'base_price': ('base_price', 'asc'),
+    'experience': ('years_of_experience', 'desc'),
+    'distance': ('geo_distance', 'asc'),
+    'best': ('rank_score', 'desc')
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# ?near= search radius in km
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 500
+
+# Squared distance in degrees of latitude (equirectangular approximation). Pure
+# arithmetic, so it runs on any backend; params: lat, lat, lng, lng, cos(lat)^2
+SEEKER_DISTANCE = "((latitude - %s) * (latitude - %s) + (longitude - %s) * (longitude - %s) * %s)"
+
+# Allowed ?stream= values mapped to the streamed response format
+STREAM_FORMATS = {'1': 'json', 'true': 'json', 'json': 'json', 'ndjson': 'ndjson'}
+
+# ----- REVIEW QUERIES -----
+
+REVIEW_FOR_UPDATE = "SELECT id, rating FROM review WHERE seeker_id = %s AND provider_id = %s FOR UPDATE"
+
+REVIEW_INSERT = "INSERT INTO review (seeker_id, provider_id, rating, comment) VALUES (%s, %s, %s, %s)"
+
+REVIEW_UPDATE = "UPDATE review SET rating = %s, comment = %s WHERE id = %s"
+
+REVIEW_PAGE_SIZE = 20
+
+# Newest first; served by idx_review_seeker (seeker_id, then id via the primary key)
+REVIEW_LIST = (
+    "SELECT review.id, review.provider_id, provider.name AS provider_name, review.rating, review.comment, "
+    "review.created_at FROM review JOIN provider ON provider.id = review.provider_id "
+    "WHERE review.seeker_id = %s AND review.id < %s ORDER BY review.id DESC LIMIT %s"
+)
+
+# What the reviewed seeker is told about a review (read by the notification job)
+REVIEW_NOTICE = (
+    "SELECT review.rating, review.comment, seeker.name AS seeker_name, seeker.email AS seeker_email, "
+    "provider.name AS provider_name FROM review JOIN seeker ON seeker.id = review.seeker_id "
+    "JOIN provider ON provider.id = review.provider_id WHERE review.id = %s"
+)
+
+# ----- BOOKING QUERIES -----
+
+# Slot and booking times are naive 'YYYY-MM-DD HH:MM:SS' DATETIMEs
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Most availability slots one request may add
+MAX_SLOTS_PER_REQUEST = 100
+
+SLOT_PAGE_SIZE = 50
+
+# Default and longest ?from=..&to= windows for slot listings and matching, in days
+SLOT_WINDOW_DAYS = 14
+MAX_SLOT_WINDOW_DAYS = 90
+
+SLOT_INSERT = "INSERT INTO availability_slot (seeker_id, time_period, starts_at, ends_at) VALUES (%s, %s, %s, %s)"
+
+# Locks the seeker's row, so publishes for one seeker run one at a time and cannot both pass the overlap check
+SEEKER_TIME_PERIOD_FOR_UPDATE = "SELECT time_period FROM seeker WHERE id = %s FOR UPDATE"
+
+# The seeker's slots (booked or not) overlapping [%s, %s), given as (seeker_id, end, start)
+SLOT_OVERLAPPING = (
+    "SELECT starts_at, ends_at FROM availability_slot "
+    "WHERE seeker_id = %s AND starts_at < %s AND ends_at > %s FOR UPDATE"
+)
+
+# Served by uq_slot_seeker_start (seeker_id, starts_at)
+SLOT_LIST = (
+    "SELECT id, seeker_id, time_period, starts_at, ends_at, status FROM availability_slot "
+    "WHERE seeker_id = %s AND starts_at >= %s AND starts_at < %s ORDER BY starts_at LIMIT %s"
+)
+
+SLOT_LIST_OPEN = (
+    "SELECT id, seeker_id, time_period, starts_at, ends_at, status FROM availability_slot "
+    "WHERE seeker_id = %s AND status = 'open' AND starts_at >= %s AND starts_at < %s ORDER BY starts_at LIMIT %s"
+)
+
+# Plain (non-locking) read of the slot to book and the price it is booked at
+SLOT_FOR_BOOKING = (
+    "SELECT availability_slot.id, availability_slot.seeker_id, availability_slot.status, availability_slot.version, "
+    "availability_slot.starts_at, seeker.base_price "
+    "FROM availability_slot JOIN seeker ON seeker.id = availability_slot.seeker_id "
+    "WHERE availability_slot.id = %s"
+)
+
+# Optimistic claim: matches only if nobody booked or released the slot since it was read,
+# and it has not started by the given (UTC) time. The row lock it takes is held just until
+# the booking insert commits.
+SLOT_CLAIM = (
+    "UPDATE availability_slot SET status = 'booked', version = version + 1 "
+    "WHERE id = %s AND version = %s AND starts_at > %s"
+)
+
+SLOT_RELEASE = "UPDATE availability_slot SET status = 'open', version = version + 1 WHERE id = %s AND status = 'booked'"
+
+# 'active' is 1 for a confirmed booking and NULL once cancelled, so the unique
+# (slot_id, active) key allows one confirmed booking per slot but any number of cancelled ones
+BOOKING_INSERT = "INSERT INTO booking (slot_id, seeker_id, provider_id, price) VALUES (%s, %s, %s, %s)"
+
+BOOKING_CANCEL = "UPDATE booking SET status = 'cancelled', active = NULL WHERE id = %s AND active = 1"
+
+BOOKING_COLUMNS = (
+    "booking.id, booking.slot_id, booking.seeker_id, booking.provider_id, booking.price, booking.status, "
+    "booking.created_at, availability_slot.time_period, availability_slot.starts_at, availability_slot.ends_at"
+)
+
+BOOKING_GET = (
+    f"SELECT {BOOKING_COLUMNS} FROM booking JOIN availability_slot ON availability_slot.id = booking.slot_id "
+    "WHERE booking.id = %s"
+)
+
+BOOKING_PAGE_SIZE = 20
+
+# Newest first; {owner} is 'provider_id' or 'seeker_id' (served by idx_booking_provider / idx_booking_seeker)
+BOOKING_LIST = (
+    f"SELECT {BOOKING_COLUMNS} FROM booking JOIN availability_slot ON availability_slot.id = booking.slot_id "
+    "WHERE booking.{owner} = %s AND booking.id < %s ORDER BY booking.id DESC LIMIT %s"
+)
+
+# Ranks seekers with an open slot in the window: best rank_score first, then the soonest
+# slot and the lowest price. {filters} holds SeekerMatch's extra conditions.
+SEEKER_MATCH_QUERY = (
+    "SELECT seeker.id, seeker.name, seeker.skill, seeker.years_of_experience, seeker.location, seeker.time_period, "
+    "seeker.base_price, seeker.rating, seeker.reviews, seeker.rank_score, "
+    "COUNT(*) AS open_slots, MIN(availability_slot.starts_at) AS next_slot "
+    "FROM availability_slot JOIN seeker ON seeker.id = availability_slot.seeker_id "
+    "WHERE availability_slot.status = 'open' AND availability_slot.starts_at >= %s AND availability_slot.starts_at < %s"
+    "{filters} GROUP BY seeker.id "
+    "ORDER BY seeker.rank_score DESC, next_slot, seeker.base_price, seeker.id LIMIT %s"
+)
+
+# The slot each matched seeker would be booked into; {pairs} is one (%s, %s) per seeker.
+# Open slots in the same window only, as in SEEKER_MATCH_QUERY: one may have been booked since.
+SLOT_NEXT_FOR_SEEKERS = (
+    "SELECT id, seeker_id, time_period, starts_at, ends_at, status FROM availability_slot "
+    "WHERE status = 'open' AND starts_at >= %s AND starts_at < %s AND (seeker_id, starts_at) IN ({pairs})"
+)
+
+# ----- JOB QUERIES -----
+
+# Job times are naive UTC DATETIMEs set by the application, like slot times
+JOB_INSERT = "INSERT INTO job (kind, payload, max_attempts, run_at) VALUES (%s, %s, %s, %s)"
+
+# Due jobs, oldest first; served by idx_job_status_run_at
+JOB_DUE = "SELECT id FROM job WHERE status = 'queued' AND run_at <= %s ORDER BY run_at, id LIMIT %s"
+
+# Optimistic claim, as with SLOT_CLAIM: of the workers that saw a job as due, only one UPDATE matches
+JOB_CLAIM = (
+    "UPDATE job SET status = 'running', attempts = attempts + 1, locked_by = %s, locked_until = %s "
+    "WHERE id = %s AND status = 'queued'"
+)
+
+JOB_GET = "SELECT id, kind, payload, attempts, max_attempts FROM job WHERE id = %s"
+
+# The finishing updates only match while the worker still holds the job's lease
+JOB_COMPLETE = (
+    "UPDATE job SET status = 'done', locked_by = NULL, locked_until = NULL, last_error = NULL, finished_at = %s "
+    "WHERE id = %s AND locked_by = %s"
+)
+
+JOB_RETRY = (
+    "UPDATE job SET status = 'queued', run_at = %s, locked_by = NULL, locked_until = NULL, last_error = %s "
+    "WHERE id = %s AND locked_by = %s"
+)
+
+JOB_FAIL = (
+    "UPDATE job SET status = 'failed', locked_by = NULL, locked_until = NULL, last_error = %s, finished_at = %s "
+    "WHERE id = %s AND locked_by = %s"
+)
+
+# Jobs whose worker died or stalled past its lease: retried, or failed if out of attempts
+JOB_REQUEUE_EXPIRED = (
+    "UPDATE job SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+    "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE %s END, "
+    "locked_by = NULL, locked_until = NULL, last_error = 'Lease expired' "
+    "WHERE status = 'running' AND locked_until < %s"
+)
+
+JOB_RETRY_FAILED = (
+    "UPDATE job SET status = 'queued', attempts = 0, run_at = %s, finished_at = NULL WHERE status = 'failed'"
+)
+
+JOB_PURGE = "DELETE FROM job WHERE status IN ('done', 'failed') AND finished_at < %s"
+
+JOB_COUNTS = "SELECT status, COUNT(*) AS jobs FROM job GROUP BY status"
+
+JOB_RECENT_FAILURES = (
+    "SELECT id, kind, attempts, last_error, finished_at FROM job WHERE status = 'failed' ORDER BY id DESC LIMIT %s"
+)
+
+# ----- FORMATTING -----
+
+def format_seeker(seeker):
+    """Public JSON shape of a seeker search result."""
+    return {
+        "id": seeker['id'],
+        "name": seeker['name'],
+        "skill": seeker['skill'],
+        "experience": seeker['years_of_experience'],
+        "location": seeker['location'],
+        "timePeriod": seeker['time_period'],
+        "basePrice": seeker['base_price'],
+        "rating": seeker['rating'],
+        "reviews": seeker['reviews'] or 0
+    }
+
+
+def format_seeker_profile(seeker):
+    """JSON shape of GET /api/seeker/<id> (a search result plus the email)."""
+    profile = format_seeker(seeker)
+    profile["email"] = seeker['email']
+    return profile
+
+
+def format_login(tokens, user, user_type):
+    """JSON body of a successful provider or seeker login; ``tokens`` is merged in."""
+    if user_type == 'seeker':
+        user_data = format_seeker_profile(user)
+    else:
+        user_data = {"id": user['id'], "name": user['name'], "email": user['email']}
+    user_data["userType"] = user_type
+    return {"message": "Login successful", **tokens, "user": user_data}
+
+
+def format_review(review):
+    """Public JSON shape of a seeker review."""
+    return {
+        "id": review['id'],
+        "providerId": review['provider_id'],
+        "providerName": review['provider_name'],
+        "rating": review['rating'],
+        "comment": review['comment'],
+        "createdAt": str(review['created_at'])
+    }
+
+
+def parse_seeker_ids(value):
+    """Seeker ids from ``?ids=3,1,2`` or a JSON list, in request order with duplicates dropped.
+
+    Raises ValueError for a malformed, empty or oversized list.
+    """
+    if isinstance(value, str):
+        value = [part for part in value.split(',') if part.strip()]
+    if not isinstance(value, list) or not value:
+        raise ValueError("ids must be a non-empty list of seeker ids")
+    if len(value) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    ids = []
+    for item in value:
+        if isinstance(item, bool) or not isinstance(item, (int, str)):
+            raise ValueError("ids must be integers")
+        try:
+            seeker_id = int(item)
+        except ValueError:
+            raise ValueError("ids must be integers") from None
+        if seeker_id < 1:
+            raise ValueError("ids must be positive")
+        ids.append(seeker_id)
+    return list(dict.fromkeys(ids))
+
+
+def render_seeker_batch(profiles, missing):
+    """JSON body of /api/seekers/batch.
+
+    ``profiles`` are already-rendered GET /api/seeker/<id> bodies, so cached
+    ones are spliced in as-is instead of being decoded and re-encoded.
+    """
+    return f'{{"seekers":[{",".join(profiles)}],"missing":[{",".join(map(str, missing))}]}}'
+
+
+def format_slot(slot):
+    """Public JSON shape of an availability slot."""
+    return {
+        "id": slot['id'],
+        "seekerId": slot['seeker_id'],
+        "timePeriod": slot['time_period'],
+        "startsAt": str(slot['starts_at']),
+        "endsAt": str(slot['ends_at']),
+        "status": slot['status']
+    }
+
+
+def format_booking(booking):
+    """Public JSON shape of a booking."""
+    return {
+        "id": booking['id'],
+        "slotId": booking['slot_id'],
+        "seekerId": booking['seeker_id'],
+        "providerId": booking['provider_id'],
+        "price": booking['price'],
+        "status": booking['status'],
+        "timePeriod": booking['time_period'],
+        "startsAt": str(booking['starts_at']),
+        "endsAt": str(booking['ends_at']),
+        "createdAt": str(booking['created_at'])
+    }
+
+
+def utc_now():
+    """The current UTC time as a DATETIME string (slots are stored in UTC)."""
+    return datetime.datetime.utcnow().strftime(DATETIME_FORMAT)
+
+
+def parse_datetime(value, name):
+    """``value`` (ISO 8601, e.g. 2026-11-02T09:00) as a DATETIME string; raises ValueError."""
+    try:
+        moment = datetime.datetime.fromisoformat(value.strip())
+    except (AttributeError, ValueError):
+        raise ValueError(f"{name} must be an ISO 8601 date and time, e.g. 2026-11-02T09:00") from None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return moment.strftime(DATETIME_FORMAT)
+
+
+def parse_slot_window(args):
+    """``(start, end)`` DATETIME strings from ``?from=&to=`` (default: the next SLOT_WINDOW_DAYS days)."""
+    if args.get('from'):
+        start = parse_datetime(args['from'], 'from')
+    else:
+        start = utc_now()
+    first = datetime.datetime.strptime(start, DATETIME_FORMAT)
+    if args.get('to'):
+        end = parse_datetime(args['to'], 'to')
+    else:
+        end = (first + datetime.timedelta(days=SLOT_WINDOW_DAYS)).strftime(DATETIME_FORMAT)
+    last = datetime.datetime.strptime(end, DATETIME_FORMAT)
+    if last <= first:
+        raise ValueError("to must be after from")
+    if last - first > datetime.timedelta(days=MAX_SLOT_WINDOW_DAYS):
+        raise ValueError(f"The from..to window may span at most {MAX_SLOT_WINDOW_DAYS} days")
+    return start, end
+
+
+def parse_slots(value, time_period):
+    """``[(time_period, starts_at, ends_at)]`` from a list of ``{"startsAt", "endsAt"[, "timePeriod"]}``.
+
+    Slots default to the seeker's own ``time_period``. Raises ValueError.
+    """
+    if not isinstance(value, list) or not value:
+        raise ValueError("slots must be a non-empty list")
+    if len(value) > MAX_SLOTS_PER_REQUEST:
+        raise ValueError(f"At most {MAX_SLOTS_PER_REQUEST} slots per request")
+    slots = []
+    for item in value:
+        if not isinstance(item, dict):
+            raise ValueError("Each slot must be an object with startsAt and endsAt")
+        starts_at = parse_datetime(item.get('startsAt'), 'startsAt')
+        ends_at = parse_datetime(item.get('endsAt'), 'endsAt')
+        if ends_at <= starts_at:
+            raise ValueError("endsAt must be after startsAt")
+        period = item.get('timePeriod') or time_period
+        if not isinstance(period, str) or len(period) > 50:
+            raise ValueError("timePeriod must be a string of at most 50 characters")
+        slots.append((period, starts_at, ends_at))
+    # Identical entries collapse into one; any other overlap is an error
+    slots = sorted(set(slots), key=lambda slot: slot[1:])
+    for earlier, later in zip(slots, slots[1:]):
+        if later[1] < earlier[2]:
+            raise ValueError(f"The slots starting {earlier[1]} and {later[1]} overlap")
+    return slots
+
+
+def split_new_slots(slots, existing):
+    """Sort parsed ``slots`` against the seeker's ``existing`` ``(starts_at, ends_at)`` rows.
+
+    Returns ``(new, conflicts)``: the slots to insert, and those overlapping an
+    existing slot. A slot identical to an existing one is in neither, so
+    publishing the same availability twice is harmless.
+    """
+    taken = {(str(starts_at), str(ends_at)) for starts_at, ends_at in existing}
+    new, conflicts = [], []
+    for slot in slots:
+        if slot[1:] in taken:
+            continue
+        if any(slot[1] < ends_at and starts_at < slot[2] for starts_at, ends_at in taken):
+            conflicts.append(slot)
+        else:
+            new.append(slot)
+    return new, conflicts
+
+# ----- SEARCH -----
+
+class SeekerSearch:
+    """A validated /api/seekers request that knows how to render itself as SQL.
+
+    Raises ``ValueError`` from the constructor when the query string is invalid.
+    """
+
+    def __init__(self, args):
+        self.skill = args.get('skill', '')
+        self.location = args.get('location', '')
+        self.time_period = args.get('time_period', '') or args.get('timePeriod', '')
+        self.rating = args.get('rating', '')
+        self.text_query = fulltext_query(args.get('q', ''))
+        near = args.get('near', '')
+        self.near = parse_point(near) if near else None
+        self.radius = None
+        if self.near:
+            try:
+                self.radius = float(args.get('radius', DEFAULT_RADIUS_KM))
+            except ValueError:
+                raise ValueError("radius must be a number")
+            if not 0 < self.radius <= MAX_RADIUS_KM:
+                raise ValueError(f"radius must be between 0 and {MAX_RADIUS_KM} km")
+        default_sort = 'distance' if self.near else 'relevance' if self.text_query else 'id'
+        self.sort = args.get('sort', default_sort)
+        self.cursor_token = args.get('cursor', '')
+        stream = args.get('stream', '').lower()
+
+        if stream and stream not in STREAM_FORMATS:
+            raise ValueError("stream must be 'json' or 'ndjson'")
+        self.stream = STREAM_FORMATS.get(stream)
+        if self.sort == 'relevance' and not self.text_query:
+            raise ValueError("sort=relevance requires a q search term")
+        if self.sort == 'distance' and not self.near:
+            raise ValueError("sort=distance requires near=latitude,longitude")
+        if self.sort not in SEEKER_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(SEEKER_SORTS)}")
+        self.sort_column, default_order = SEEKER_SORTS[self.sort]
+        self.order = args.get('order', default_order).lower()
+        if self.order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+
+        try:
+            limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if self.stream:
+            # Streamed results are never buffered, so they need no page size cap
+            self.limit = max(1, limit) if 'limit' in args else None
+        else:
+            self.limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        self.key = None
+        if self.cursor_token:
+            key = decode_cursor(self.cursor_token, self.cursor_scope)
+            if len(key) != (1 if self.sort_column == 'id' else 2):
+                raise ValueError("Invalid cursor")
+            self.key = key
+
+    @property
+    def cursor_scope(self):
+        return f"{self.sort}:{self.order}"
+
+    def variant(self):
+        """Low-cardinality label naming the filters and sort used, e.g. ``location+skill;sort=rating``."""
+        filters = [name for name, value in (
+            ('cursor', self.cursor_token), ('location', self.location), ('near', self.near), ('q', self.text_query),
+            ('rating', self.rating), ('skill', self.skill), ('time_period', self.time_period)
+        ) if value]
+        variant = f"{'+'.join(filters) or 'none'};sort={self.sort}"
+        return f"{variant};stream={self.stream}" if self.stream else variant
+
+    def cache_parts(self):
+        """Normalized tuple identifying this search for the response cache."""
+        return (
+            normalize_term(self.skill), normalize_term(self.location), normalize_term(self.time_period),
+            self.rating.strip(), self.text_query, self.sort, self.order, self.limit, self.cursor_token,
+            self.near, self.radius
+        )
+
+    def _distance_params(self):
+        latitude, longitude = self.near
+        return [latitude, latitude, longitude, longitude, math.cos(math.radians(latitude)) ** 2]
+
+    def _sort_expression(self):
+        """SQL and params computing the sort column (aliases cannot be used in WHERE)."""
+        if self.sort_column == 'relevance':
+            return SEEKER_MATCH, [self.text_query]
+        if self.sort_column == 'geo_distance':
+            return SEEKER_DISTANCE, self._distance_params()
+        return self.sort_column, []
+
+    def sql(self):
+        """Return ``(query, params)``; paged searches request one row more than ``limit``."""
+        # Construct the base query, projecting only the returned columns
+        columns = SEEKER_LIST_COLUMNS
+        params = []
+        if self.text_query:
+            columns += f", {SEEKER_MATCH} AS relevance"
+            params.append(self.text_query)
+        if self.near:
+            columns += f", latitude, longitude, {SEEKER_DISTANCE} AS geo_distance"
+            params.extend(self._distance_params())
+        if self.text_query:
+            query = f"SELECT {columns} FROM seeker WHERE {SEEKER_MATCH}"
+            params.append(self.text_query)
+        else:
+            query = f"SELECT {columns} FROM seeker WHERE 1=1"
+
+        # Add filters (substring matches: ?skill=cleaning finds 'Home Cleaning')
+        if self.skill:
+            query += " AND skill LIKE %s"
+            params.append(like_contains(self.skill))
+
+        if self.location:
+            query += " AND location LIKE %s"
+            params.append(like_contains(self.location))
+
+        if self.time_period:
+            query += " AND time_period LIKE %s"
+            params.append(like_contains(self.time_period))
+
+        if self.rating:
+            query += " AND rating >= %s"
+            params.append(self.rating)
+
+        # Radius: range scans of idx_seeker_geohash over the cells covering the circle,
+        # then the exact cut; geohash is binary-collated, so '{' sorts after every cell character
+        if self.near:
+            cells = covering_cells(*self.near, self.radius)
+            query += " AND (" + " OR ".join(["(geohash >= %s AND geohash < %s)"] * len(cells)) + ")"
+            for cell in cells:
+                params.extend([cell, cell + '{'])
+            query += f" AND {SEEKER_DISTANCE} <= %s"
+            params.extend(self._distance_params())
+            params.append((self.radius / KM_PER_DEGREE) ** 2)
+
+        # Keyset pagination: continue strictly after the last row of the previous page
+        comparison = '>' if self.order == 'asc' else '<'
+        column = self.sort_column
+        if self.key is not None:
+            if column == 'id':
+                query += f" AND id {comparison} %s"
+                params.append(self.key[-1])
+            else:
+                expression, expression_params = self._sort_expression()
+                query += f" AND ({expression} {comparison} %s OR ({expression} = %s AND id {comparison} %s))"
+                params.extend([*expression_params, self.key[0], *expression_params, self.key[0], self.key[1]])
+
+        direction = self.order.upper()
+        if column == 'id':
+            query += f" ORDER BY id {direction}"
+        else:
+            query += f" ORDER BY {column} {direction}, id {direction}"
+        if self.limit is not None:
+            # Paged searches fetch one extra row to learn whether another page exists
+            query += " LIMIT %s"
+            params.append(self.limit if self.stream else self.limit + 1)
+        return query, params
+
+    def next_cursor(self, row):
+        key = [row['id']] if self.sort_column == 'id' else [row[self.sort_column], row['id']]
+        return encode_cursor(self.cursor_scope, key)
+
+    def format_row(self, row):
+        seeker = format_seeker(row)
+        if self.text_query:
+            seeker["relevance"] = round(row['relevance'], 4)
+        if self.near:
+            seeker["distanceKm"] = round(haversine_km(*self.near, float(row['latitude']), float(row['longitude'])), 2)
+        return seeker
+
+    def page(self, rows):
+        """Format fetched rows; returns ``(seekers, headers)`` with the next cursor if any."""
+        headers = {}
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            headers['X-Next-Cursor'] = self.next_cursor(rows[-1])
+        return [self.format_row(row) for row in rows], headers
+
+
+# ----- MATCHING -----
+
+class SeekerMatch:
+    """A validated /api/seekers/match request: who can take this job in the given window?
+
+    Raises ``ValueError`` from the constructor when the query string is invalid.
+    """
+
+    def __init__(self, args):
+        self.skill = args.get('skill', '')
+        self.location = args.get('location', '')
+        self.time_period = args.get('time_period', '') or args.get('timePeriod', '')
+        self.start, self.end = parse_slot_window(args)
+        self.max_price = None
+        if args.get('max_price'):
+            try:
+                self.max_price = float(args['max_price'])
+            except ValueError:
+                raise ValueError("max_price must be a number")
+        try:
+            self.limit = max(1, min(int(args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+
+    def sql(self):
+        """Return ``(query, params)``."""
+        filters = ""
+        params = [self.start, self.end]
+        # Substring matches, as in SeekerSearch
+        if self.skill:
+            filters += " AND seeker.skill LIKE %s"
+            params.append(like_contains(self.skill))
+        if self.location:
+            filters += " AND seeker.location LIKE %s"
+            params.append(like_contains(self.location))
+        if self.time_period:
+            filters += " AND availability_slot.time_period LIKE %s"
+            params.append(like_contains(self.time_period))
+        if self.max_price is not None:
+            filters += " AND seeker.base_price <= %s"
+            params.append(self.max_price)
+        params.append(self.limit)
+        return SEEKER_MATCH_QUERY.format(filters=filters), params
+
+    def next_slots_sql(self, rows):
+        """``(query, params)`` fetching the slot each matched row would be booked into."""
+        pairs = ', '.join(['(%s, %s)'] * len(rows))
+        params = [self.start, self.end, *(value for row in rows for value in (row['id'], row['next_slot']))]
+        return SLOT_NEXT_FOR_SEEKERS.format(pairs=pairs), params
+
+    def format_rows(self, rows, slots):
+        """Matched seekers in rank order, each with its open-slot count and next open slot."""
+        next_slots = {(slot['seeker_id'], str(slot['starts_at'])): slot for slot in slots}
+        matches = []
+        for row in rows:
+            seeker = format_seeker(row)
+            seeker["rankScore"] = row['rank_score']
+            seeker["openSlots"] = row['open_slots']
+            slot = next_slots.get((row['id'], str(row['next_slot'])))
+            seeker["nextSlot"] = format_slot(slot) if slot else None
+            matches.append(seeker)
+        return matches
@@ -0,0 +1,237 @@
+"""Primary/replica routing for read-only queries.
+
+``ReplicaRouter`` holds the primary pool and any number of replica pools
+(plain ``ConnectionPool`` instances). Writes always use the primary.
+Read-only routes check out a connection with ``acquire(read_only=True)``
+and get a healthy replica, chosen round robin:
+
+* A replica that refuses connections is taken out of rotation for
+  ``retry_after`` seconds, and the read moves on to the next replica and
+  finally to the primary. A replica pool with no free connection is waited
+  on for at most ``acquire_timeout`` seconds before the read moves on.
+* At most every ``check_interval`` seconds the checked-out connection is
+  asked for its replication lag. A replica more than ``max_lag`` seconds
+  behind (or with replication stopped) is skipped until its next check.
+
+Read-your-writes: after a write, call ``mark_written(*scopes)`` with scope
+names such as ``'seeker:42'``. For the next ``stickiness`` seconds, reads
+in any of those scopes go to the primary. Marks are kept in a cache
+backend (``api.utils.cache``). With the redis backend, a write handled by
+one worker also pins the next read to the primary when another worker
+serves it.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from mysql.connector import Error
+
+from api.db.pool import PoolError, PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+def replication_lag(connection):
+    """Seconds the replica behind ``connection`` trails its source.
+
+    Returns 0 for a server that is not replicating (e.g. a second
+    standalone instance in development) and None if replication is broken.
+    """
+    cursor = connection.cursor(dictionary=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except Error:
+            # MariaDB and MySQL before 8.0.22 only know the old spelling
+            cursor.execute("SHOW SLAVE STATUS")
+        status = cursor.fetchone()
+    finally:
+        cursor.close()
+    if not status:
+        return 0
+    lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+    return None if lag is None else float(lag)
+
+
+class _Replica:
+    __slots__ = ('pool', 'down_until', 'checked_at', 'lag', 'error')
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.down_until = 0.0
+        self.checked_at = None
+        self.lag = 0.0
+        self.error = None
+
+
+class ReplicaRouter:
+    """Routes reads to healthy replicas and everything else to the primary.
+
+    ``lag_probe(connection)`` returns the replication lag in seconds (None
+    when replication is broken); pass ``lag_probe=None`` to skip lag checks,
+    e.g. for stand-in replicas that cannot report it.
+    """
+
+    def __init__(self, primary, replicas=(), marks=None, stickiness=5.0, max_lag=5.0,
+                 check_interval=5.0, retry_after=10.0, acquire_timeout=0.1, lag_probe=replication_lag):
+        self.primary = primary
+        self.replicas = [_Replica(pool) for pool in replicas]
+        self.marks = marks
+        self.stickiness = stickiness
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.acquire_timeout = acquire_timeout
+        self.lag_probe = lag_probe
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self._counters = {'primary_reads': 0, 'replica_reads': 0, 'sticky_reads': 0, 'failovers': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    # ----- READ-YOUR-WRITES -----
+
+    def mark_written(self, *scopes):
+        """Pin reads in ``scopes`` to the primary for the next ``stickiness`` seconds."""
+        if not self.replicas or self.marks is None:
+            return
+        for scope in scopes:
+            try:
+                self.marks.set(f"sticky:{scope}", b'1', self.stickiness)
+            except Exception as e:
+                logger.warning(f"Could not record write to {scope}: {e}")
+
+    def is_sticky(self, *scopes):
+        """Whether any of ``scopes`` was written within the stickiness window."""
+        if self.marks is None:
+            return False
+        for scope in scopes:
+            try:
+                if self.marks.get(f"sticky:{scope}") is not None:
+                    return True
+            except Exception as e:
+                # Without the marks we cannot rule out a recent write; stay consistent
+                logger.warning(f"Could not look up writes to {scope}: {e}")
+                return True
+        return False
+
+    # ----- ROUTING -----
+
+    def _healthy(self, replica, now):
+        return replica.down_until <= now and replica.lag is not None and replica.lag <= self.max_lag
+
+    def _candidates(self):
+        now = time.monotonic()
+        with self._lock:
+            # A lagging replica gets another chance once its next lag check is due
+            usable = [replica for replica in self.replicas
+                      if self._healthy(replica, now) or (replica.down_until <= now and self._check_due(replica, now))]
+            if not usable:
+                return []
+            start = next(self._next) % len(usable)
+        return usable[start:] + usable[:start]
+
+    def _mark_down(self, replica, error):
+        with self._lock:
+            replica.down_until = time.monotonic() + self.retry_after
+            replica.error = str(error)
+        logger.warning(f"Replica pool '{replica.pool.name}' unavailable for {self.retry_after}s: {error}")
+
+    def _check_due(self, replica, now):
+        return self.lag_probe is not None and (replica.checked_at is None
+                                               or now - replica.checked_at >= self.check_interval)
+
+    def _claim_check(self, replica):
+        now = time.monotonic()
+        with self._lock:
+            if not self._check_due(replica, now):
+                return False
+            # Claim the check so concurrent requests do not all probe at once
+            replica.checked_at = now
+            return True
+
+    def _check_lag(self, replica, connection):
+        """Probe ``connection``'s lag; returns False if the replica is too far behind to serve reads."""
+        lag = self.lag_probe(connection)
+        with self._lock:
+            replica.lag = lag
+            replica.error = None if lag is not None else "replication is not running"
+        if lag is None or lag > self.max_lag:
+            logger.warning(f"Replica pool '{replica.pool.name}' skipped: lag {lag}s exceeds {self.max_lag}s")
+            return False
+        return True
+
+    def acquire(self, read_only=False, scopes=(), timeout=None):
+        """Check out a connection; returns ``(pool, connection)``.
+
+        Read-only requests outside a sticky scope go to a replica when one is
+        healthy. Anything else, or a read that every replica failed, gets the
+        primary, whose errors propagate as usual. Each read is counted once:
+        as a sticky, replica or primary read.
+        """
+        if read_only and self.replicas:
+            if scopes and self.is_sticky(*scopes):
+                self._count('sticky_reads')
+            else:
+                # A saturated replica must not hold the read for the primary's full checkout timeout
+                replica_timeout = self.acquire_timeout if timeout is None else min(timeout, self.acquire_timeout)
+                for replica in self._candidates():
+                    try:
+                        connection = replica.pool.acquire(replica_timeout)
+                    except PoolTimeoutError:
+                        # Busy rather than broken: try elsewhere but keep it in rotation
+                        self._count('failovers')
+                        continue
+                    except (PoolError, Error) as e:
+                        self._mark_down(replica, e)
+                        self._count('failovers')
+                        continue
+                    if self._claim_check(replica):
+                        try:
+                            current = self._check_lag(replica, connection)
+                        except Error as e:
+                            replica.pool.release(connection, discard=True)
+                            self._mark_down(replica, e)
+                            current = False
+                        else:
+                            if not current:
+                                replica.pool.release(connection)
+                        if not current:
+                            self._count('failovers')
+                            continue
+                    self._count('replica_reads')
+                    return replica.pool, connection
+                self._count('primary_reads')
+        return self.primary, self.primary.acquire(timeout)
+
+    def healthy(self):
+        """``{pool name: bool}`` for every replica."""
+        now = time.monotonic()
+        with self._lock:
+            return {replica.pool.name: self._healthy(replica, now) for replica in self.replicas}
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._counters)
+            stats['replicas'] = [{
+                'name': replica.pool.name,
+                'healthy': self._healthy(replica, now),
+                'lag_seconds': replica.lag,
+                'error': replica.error,
+            } for replica in self.replicas]
+        return stats
+
+    def close(self):
+        for replica in self.replicas:
+            replica.pool.close()
+
+    def reset(self):
+        """Forget replica connections and health state (use in a freshly forked child)."""
+        for replica in self.replicas:
+            replica.pool.reset()
+        with self._lock:
+            self.replicas = [_Replica(replica.pool) for replica in self.replicas]
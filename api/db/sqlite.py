@@ -0,0 +1,237 @@
+"""SQLite stand-in for MySQL, for benchmarks and offline runs.
+
+``SQLiteConnection`` mimics the small part of the ``mysql.connector`` API the
+routes use (``cursor(dictionary=True)``, ``%s`` placeholders, ``commit``,
+``rollback``, ``in_transaction``, ``is_connected``) and re-raises SQLite
+errors as ``mysql.connector.Error`` so route error handling is unchanged.
+MySQL-only SQL such as ``MATCH ... AGAINST`` is not supported.
+"""
+import re
+import sqlite3
+from decimal import Decimal
+
+from mysql.connector import Error, IntegrityError
+
+from api.db import migrations
+
+# mysql.connector binds Decimal parameters natively; SQLite needs to be told how
+sqlite3.register_adapter(Decimal, str)
+
+_LIKE_RE = re.compile(r"\bLIKE\s+\?", re.IGNORECASE)
+_FOR_UPDATE_RE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+_INSERT_IGNORE_RE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+
+# Mirrors the MySQL schema at migrations.LATEST_VERSION; update both together
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS provider (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(20) NOT NULL,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS seeker (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(20) NOT NULL,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        skill VARCHAR(255) NOT NULL,
+        years_of_experience INT NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        time_period VARCHAR(50) NOT NULL,
+        base_price DECIMAL(10, 2) NOT NULL,
+        rating DECIMAL(3, 1) DEFAULT 0,
+        reviews INT DEFAULT 0,
+        password VARCHAR(255) NOT NULL,
+        latitude DECIMAL(9, 6),
+        longitude DECIMAL(9, 6),
+        geohash VARCHAR(12),
+        rating_total INT NOT NULL DEFAULT 0,
+        rank_score DECIMAL(7, 4) NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS review (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        seeker_id INT NOT NULL REFERENCES seeker (id),
+        provider_id INT NOT NULL REFERENCES provider (id),
+        rating TINYINT NOT NULL,
+        comment TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (provider_id, seeker_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_review_seeker ON review (seeker_id)",
+    """
+    CREATE TABLE IF NOT EXISTS availability_slot (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        seeker_id INT NOT NULL REFERENCES seeker (id),
+        time_period VARCHAR(50) NOT NULL,
+        starts_at DATETIME NOT NULL,
+        ends_at DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'open',
+        version INT NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (seeker_id, starts_at)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_slot_status_start ON availability_slot (status, starts_at)",
+    """
+    CREATE TABLE IF NOT EXISTS booking (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        slot_id INT NOT NULL REFERENCES availability_slot (id),
+        seeker_id INT NOT NULL REFERENCES seeker (id),
+        provider_id INT NOT NULL REFERENCES provider (id),
+        price DECIMAL(10, 2) NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'confirmed',
+        active TINYINT NULL DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (slot_id, active)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_booking_provider ON booking (provider_id)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_seeker ON booking (seeker_id)",
+    """
+    CREATE TABLE IF NOT EXISTS job (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind VARCHAR(100) NOT NULL,
+        payload TEXT NOT NULL,
+        status VARCHAR(10) NOT NULL DEFAULT 'queued',
+        attempts INT NOT NULL DEFAULT 0,
+        max_attempts INT NOT NULL,
+        run_at DATETIME NOT NULL,
+        locked_by VARCHAR(100) NULL,
+        locked_until DATETIME NULL,
+        last_error TEXT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at DATETIME NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_status_run_at ON job (status, run_at)",
+    """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        duration_ms INT NOT NULL
+    )
+    """,
+]
+
+
+def translate(query):
+    """Rewrite MySQL placeholder, LIKE-escape, locking and INSERT IGNORE conventions for SQLite."""
+    query = query.replace('%s', '?')
+    # SQLite has no row locks; writers are serialized by the database lock instead
+    query = _FOR_UPDATE_RE.sub('', query)
+    query = _INSERT_IGNORE_RE.sub('INSERT OR IGNORE', query)
+    # MySQL escapes LIKE wildcards with a backslash by default; SQLite needs it spelled out
+    return _LIKE_RE.sub(r"LIKE ? ESCAPE '\\'", query)
+
+
+class SQLiteCursor:
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate(query), tuple(params))
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(msg=str(e)) from e
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def executemany(self, query, seq_of_params):
+        try:
+            self._cursor.executemany(translate(query), [tuple(params) for params in seq_of_params])
+        except sqlite3.IntegrityError as e:
+            raise IntegrityError(msg=str(e)) from e
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """A ``mysql.connector``-shaped wrapper around one SQLite connection."""
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # MySQL functions used by the connection checks
+        self._connection.create_function('DATABASE', 0, lambda: 'main')
+        self._connection.create_function('VERSION', 0, lambda: sqlite3.sqlite_version)
+        self._open = True
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._connection, dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._connection.in_transaction
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        return self._open
+
+    def get_server_info(self):
+        return f"SQLite {sqlite3.sqlite_version}"
+
+    def close(self):
+        self._open = False
+        self._connection.close()
+
+
+def create_schema(path, seeker_indexes=()):
+    """Create the tables and the given ``{name: columns}`` seeker indexes, marked as fully migrated."""
+    connection = sqlite3.connect(path)
+    try:
+        for statement in SCHEMA:
+            connection.execute(statement)
+        for index_name, columns in dict(seeker_indexes).items():
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON seeker ({', '.join(columns)})")
+        # Record every migration as applied so the app's schema check passes
+        connection.executemany(
+            "INSERT OR IGNORE INTO schema_migrations (version, name, duration_ms) VALUES (?, ?, 0)",
+            [(version, name) for version, name, _ in migrations.MIGRATIONS]
+        )
+        connection.commit()
+    finally:
+        connection.close()
@@ -0,0 +1,95 @@
+"""Schema migration CLI (see ``api/db/migrations.py``).
+
+Usage (from the repository root)::
+
+    python -m api.migrate status                     # applied and pending migrations
+    python -m api.migrate upgrade                    # apply everything pending
+    python -m api.migrate upgrade --to 3             # stop after version 3
+    python -m api.migrate upgrade --create-database  # first install: create the database too
+
+Run ``upgrade`` before rolling out code that needs a newer schema; workers
+refuse to start while the database is behind.
+"""
+import argparse
+import logging
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+from api.config import ConfigError, as_dict, configure_logging, load_settings
+from api.db import migrations
+
+logger = logging.getLogger(__name__)
+
+
+def create_database(db_config):
+    name = db_config['database']
+    if not re.fullmatch(r'\w+', name):
+        raise ValueError(f"Refusing to create database with unusual name {name!r}")
+    server_config = {key: value for key, value in db_config.items() if key != 'database'}
+    connection = mysql.connector.connect(**server_config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{name}` CHARACTER SET utf8mb4")
+        cursor.close()
+    finally:
+        connection.close()
+    logger.info(f"Database '{name}' is present")
+
+
+def print_status(connection):
+    version = migrations.current_version(connection)
+    print(f"Schema version {version} (code expects {migrations.LATEST_VERSION})")
+    for applied_version, name, applied_at, duration_ms in migrations.applied(connection):
+        print(f"  [x] {applied_version:>3}  {name}  ({applied_at}, {duration_ms} ms)")
+    for pending_version, name, _ in migrations.pending(connection):
+        print(f"  [ ] {pending_version:>3}  {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply or inspect Freelancer database schema migrations")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status', help='show applied and pending migrations')
+    upgrade = commands.add_parser('upgrade', help='apply pending migrations')
+    upgrade.add_argument('--to', type=int, default=None, help='highest version to apply (default: latest)')
+    upgrade.add_argument('--create-database', action='store_true', help='create the database first if missing')
+    upgrade.add_argument('--lock-timeout', type=int, default=60,
+                         help='seconds to wait for a concurrent migration to finish')
+    args = parser.parse_args(argv)
+
+    # Only the database settings are needed; skip importing the web app
+    try:
+        settings = load_settings()
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 1
+    configure_logging(settings.server.log_level)
+    db_config = as_dict(settings.db)
+
+    try:
+        if args.command == 'upgrade' and args.create_database:
+            create_database(db_config)
+        connection = mysql.connector.connect(**db_config)
+    except (Error, ValueError) as e:
+        logger.error(f"Could not connect to the database: {e}")
+        return 1
+
+    try:
+        if args.command == 'status':
+            print_status(connection)
+            return 0
+        applied = migrations.upgrade(connection, target=args.to, lock_timeout=args.lock_timeout)
+        version = migrations.current_version(connection)
+        logger.info(f"Applied {len(applied)} migration(s); schema is at version {version}")
+        return 0
+    except (Error, migrations.MigrationLockError) as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
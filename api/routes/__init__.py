@@ -1,2 +1,15 @@
+"""HTTP routes, one blueprint per area of the API.
 
-# Empty init file to make the directory a package
+Route modules reach shared state (pools, caches, auth helpers) through the
+``api.app`` module at request time, so they are imported only when
+``create_app()`` registers them.
+"""
+
+# Blueprint modules in registration order
+BLUEPRINT_MODULES = ('system', 'providers', 'seekers', 'reviews', 'tokens', 'search', 'bulk', 'bookings')
+
+
+def register_blueprints(app):
+    from importlib import import_module
+    for name in BLUEPRINT_MODULES:
+        app.register_blueprint(import_module(f"api.routes.{name}").bp)
@@ -0,0 +1,273 @@
+"""Seeker availability, provider bookings and job matching.
+
+Seekers publish availability slots; providers book one slot at a time. A
+booking claims its slot optimistically: the slot is read without locks,
+then ``SLOT_CLAIM`` flips it to booked only if its version is unchanged.
+Requests that lose the race get a 409 straight away instead of queueing
+behind a lock, and the row lock a winner takes on its own slot lasts only
+as long as the booking insert.
+"""
+import logging
+
+import mysql.connector
+from flask import Blueprint, g, jsonify, request
+from mysql.connector import Error
+
+from api import app as core
+from api.db import queries
+from api.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('bookings', __name__)
+
+# Booking id above any real one, where the first page of GET /api/bookings starts
+BOOKING_CURSOR_START = 2 ** 31
+
+
+# Publish availability: {"slots": [{"startsAt": ..., "endsAt": ..., "timePeriod"?}]}.
+# Slots the seeker already has are skipped; a slot overlapping a different one rejects the request.
+@bp.route('/api/seeker/<int:seeker_id>/slots', methods=['POST'])
+@core.require_auth('seeker')
+def add_slots(seeker_id):
+    if g.user['id'] != seeker_id:
+        return jsonify({"error": "Seekers can only publish their own availability"}), 403
+    data = request.get_json(silent=True) or {}
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor()
+            cursor.execute(queries.SEEKER_TIME_PERIOD_FOR_UPDATE, (seeker_id,))
+            seeker = cursor.fetchone()
+            if not seeker:
+                connection.rollback()
+                return jsonify({"error": "Seeker not found"}), 404
+            try:
+                slots = queries.parse_slots(data.get('slots'), seeker[0])
+            except ValueError as e:
+                connection.rollback()
+                return jsonify({"error": str(e)}), 400
+
+            # Everything the seeker has between the first start and the last end
+            cursor.execute(queries.SLOT_OVERLAPPING, (seeker_id, max(slot[2] for slot in slots), slots[0][1]))
+            new, conflicts = queries.split_new_slots(slots, cursor.fetchall())
+            if conflicts:
+                connection.rollback()
+                return jsonify({"error": f"The slot starting {conflicts[0][1]} overlaps an existing slot",
+                                "conflicts": [{"startsAt": slot[1], "endsAt": slot[2]} for slot in conflicts]}), 409
+            if new:
+                cursor.executemany(queries.SLOT_INSERT, [(seeker_id, *slot) for slot in new])
+            connection.commit()
+            core.record_write(f"seeker:{seeker_id}")
+            return jsonify({"created": len(new), "skipped": len(data['slots']) - len(new)}), 201
+        except Error as e:
+            connection.rollback()
+            logger.error(f"Error adding availability slots: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# A seeker's slots starting in ?from=..&to= (default: the next two weeks); ?status=all includes booked ones
+@bp.route('/api/seeker/<int:seeker_id>/slots', methods=['GET'])
+def get_slots(seeker_id):
+    try:
+        start, end = queries.parse_slot_window(request.args)
+        limit = max(1, min(int(request.args.get('limit', queries.SLOT_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    query = queries.SLOT_LIST if request.args.get('status') == 'all' else queries.SLOT_LIST_OPEN
+
+    connection = core.get_db(read_only=True, scopes=core.read_scopes(f"seeker:{seeker_id}"))
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, (seeker_id, start, end, limit))
+            return jsonify([queries.format_slot(slot) for slot in cursor.fetchall()]), 200
+        except Error as e:
+            logger.error(f"Error listing availability slots: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Seekers free for a job in ?from=..&to=, filtered like /api/seekers (skill, location,
+# time_period) plus max_price, ranked by rank_score and then the soonest open slot
+@bp.route('/api/seekers/match', methods=['GET'])
+def match_seekers():
+    try:
+        match = queries.SeekerMatch(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query, params = match.sql()
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            slots = []
+            if rows:
+                cursor.execute(*match.next_slots_sql(rows))
+                slots = cursor.fetchall()
+            return jsonify(match.format_rows(rows, slots)), 200
+        except Error as e:
+            logger.error(f"Error matching seekers: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Book a slot: {"slotId": N}. 201 with the booking, or 409 if someone else got it first
+# or the slot has already started.
+@bp.route('/api/bookings', methods=['POST'])
+@core.require_auth('provider')
+def book_slot():
+    data = request.get_json(silent=True) or {}
+    slot_id = data.get('slotId')
+    if isinstance(slot_id, bool) or not isinstance(slot_id, int):
+        return jsonify({"error": "slotId must be an integer"}), 400
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(queries.SLOT_FOR_BOOKING, (slot_id,))
+            slot = cursor.fetchone()
+            if not slot:
+                return jsonify({"error": "Slot not found"}), 404
+            # Under contention most attempts stop here, on a read that takes no locks
+            if slot['status'] != 'open':
+                return jsonify({"error": "Slot is already booked"}), 409
+            now = queries.utc_now()
+            if str(slot['starts_at']) <= now:
+                return jsonify({"error": "Slot has already started"}), 409
+
+            cursor.execute(queries.SLOT_CLAIM, (slot_id, slot['version'], now))
+            if cursor.rowcount != 1:
+                # Lost the race; roll back at once so the row lock is not held any longer
+                connection.rollback()
+                return jsonify({"error": "Slot is already booked"}), 409
+            cursor.execute(queries.BOOKING_INSERT, (slot_id, slot['seeker_id'], g.user['id'], slot['base_price']))
+            booking_id = cursor.lastrowid
+            connection.commit()
+            core.record_write()
+            core.record_write(f"seeker:{slot['seeker_id']}")
+
+            cursor.execute(queries.BOOKING_GET, (booking_id,))
+            return jsonify(queries.format_booking(cursor.fetchone())), 201
+        except mysql.connector.IntegrityError as e:
+            # The unique (slot_id, active) key caught a second confirmed booking
+            connection.rollback()
+            logger.warning(f"Conflicting booking of slot {slot_id}: {e}")
+            return jsonify({"error": "Slot is already booked"}), 409
+        except Error as e:
+            connection.rollback()
+            logger.error(f"Error booking slot: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Helper function to check that the calling provider or seeker is a party to a booking
+def is_party(booking):
+    return booking[f"{g.user['type']}_id"] == g.user['id']
+
+
+# The caller's bookings (as provider or as seeker), newest first, keyset-paginated through X-Next-Cursor
+@bp.route('/api/bookings', methods=['GET'])
+@core.require_auth()
+def get_bookings():
+    try:
+        limit = max(1, min(int(request.args.get('limit', queries.BOOKING_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    before = BOOKING_CURSOR_START
+    if request.args.get('cursor'):
+        try:
+            before = int(decode_cursor(request.args['cursor'], 'bookings')[0])
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid cursor"}), 400
+    query = queries.BOOKING_LIST.format(owner=f"{g.user['type']}_id")
+
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            # Fetch one extra row to learn whether another page follows
+            cursor.execute(query, (g.user['id'], before, limit + 1))
+            rows = cursor.fetchall()
+            response = jsonify([queries.format_booking(row) for row in rows[:limit]])
+            if len(rows) > limit:
+                response.headers['X-Next-Cursor'] = encode_cursor('bookings', [rows[limit - 1]['id']])
+            return response, 200
+        except Error as e:
+            logger.error(f"Error listing bookings: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/bookings/<int:booking_id>', methods=['GET'])
+@core.require_auth()
+def get_booking(booking_id):
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(queries.BOOKING_GET, (booking_id,))
+            booking = cursor.fetchone()
+            if not booking or not is_party(booking):
+                return jsonify({"error": "Booking not found"}), 404
+            return jsonify(queries.format_booking(booking)), 200
+        except Error as e:
+            logger.error(f"Error getting booking: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Either party may cancel; the slot opens up for booking again in the same transaction
+@bp.route('/api/bookings/<int:booking_id>/cancel', methods=['POST'])
+@core.require_auth()
+def cancel_booking(booking_id):
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(queries.BOOKING_GET, (booking_id,))
+            booking = cursor.fetchone()
+            if not booking or not is_party(booking):
+                return jsonify({"error": "Booking not found"}), 404
+
+            cursor.execute(queries.BOOKING_CANCEL, (booking_id,))
+            if cursor.rowcount != 1:
+                connection.rollback()
+                return jsonify({"error": "Booking is already cancelled"}), 409
+            cursor.execute(queries.SLOT_RELEASE, (booking['slot_id'],))
+            connection.commit()
+            core.record_write()
+            core.record_write(f"seeker:{booking['seeker_id']}")
+            return jsonify({"message": "Booking cancelled"}), 200
+        except Error as e:
+            connection.rollback()
+            logger.error(f"Error cancelling booking: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
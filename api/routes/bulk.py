@@ -0,0 +1,109 @@
+"""Bulk CSV/NDJSON import and export."""
+import logging
+
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
+from mysql.connector import Error
+
+from api import app as core
+from api.db import bulk, queries
+from api.utils.passwords import HasherBusyError
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('bulk', __name__)
+
+# Records per transaction for bulk imports, and rows per fetch for exports
+BULK_IMPORT_CHUNK = 500
+BULK_EXPORT_BATCH = 1000
+
+
+# Function to make a committed chunk of imported seekers visible to search
+def seekers_imported(seekers):
+    for seeker in seekers:
+        core.seeker_search_index.add_seeker(seeker['skill'], seeker['location'])
+    core.invalidate_seeker_cache()
+
+
+# Helper function to import a CSV/NDJSON request body streamed straight from the socket
+def bulk_import(kind):
+    try:
+        fmt = bulk.detect_format(request.args.get('format'), request.mimetype)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    connection = core.get_db()
+    if connection:
+        importer = bulk.BulkImporter(
+            connection, kind, core.password_hasher.hash_many, chunk_size=BULK_IMPORT_CHUNK,
+            on_insert=seekers_imported if kind == 'seeker' else None
+        )
+        try:
+            summary = importer.run(bulk.read_records(request.stream, fmt))
+        except Error as e:
+            logger.error(f"Error importing {kind}s: {e}")
+            return jsonify({"error": str(e), **importer.summary()}), 500
+        except HasherBusyError:
+            # Earlier chunks are committed; report them so the client can resume
+            response = jsonify({"error": "Server busy, please retry shortly", **importer.summary()})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        core.record_write()
+        logger.info(f"Bulk import of {kind}s: {summary['imported']} imported, {summary['failed']} failed")
+        return jsonify(summary), 200
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/providers/import', methods=['POST'])
+@core.require_admin
+def import_providers():
+    return bulk_import('provider')
+
+
+@bp.route('/api/seekers/import', methods=['POST'])
+@core.require_admin
+def import_seekers():
+    return bulk_import('seeker')
+
+
+@bp.route('/api/seekers/export', methods=['GET'])
+@core.require_auth('provider')
+def export_seekers():
+    try:
+        fmt = bulk.detect_format(request.args.get('format'), None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Only administrators get phone numbers and emails
+    if core.is_admin(g.user):
+        query, columns = queries.SEEKER_EXPORT, queries.SEEKER_EXPORT_COLUMNS
+    else:
+        query, columns = queries.SEEKER_PUBLIC_EXPORT, queries.SEEKER_PUBLIC_EXPORT_COLUMNS
+
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        # Unbuffered cursor: rows stream from the server a batch at a time
+        cursor = connection.cursor(buffered=False)
+        try:
+            cursor.execute(query)
+        except Error as e:
+            cursor.close()
+            logger.error(f"Error exporting seekers: {e}")
+            return jsonify({"error": str(e)}), 500
+
+        export = {'finished': False}
+
+        def generate():
+            try:
+                yield from bulk.export_rows(cursor, columns, fmt, BULK_EXPORT_BATCH)
+                export['finished'] = True
+            except Error as e:
+                # Headers are already sent; all we can do is end the stream early
+                logger.error(f"Error exporting seekers: {e}")
+
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f"attachment; filename=seekers.{fmt}"
+        return core.release_with_response(response, cursor, lambda: export['finished'])
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
@@ -0,0 +1,94 @@
+"""Service provider registration and login."""
+import logging
+
+from flask import Blueprint, jsonify, request
+from mysql.connector import Error
+
+from api import app as core
+from api import tasks
+from api.db import queries
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('providers', __name__)
+
+
+@bp.route('/api/provider/register', methods=['POST'])
+@core.rate_limited('register')
+def provider_register():
+    data = request.json
+    name = data.get('name')
+    phone_number = data.get('phone_number')
+    email = data.get('email')
+    password = data.get('password')
+
+    # Validate required fields
+    if not all([name, phone_number, email, password]):
+        return jsonify({"error": "All fields are required"}), 400
+
+    # Hash the password
+    hashed_password = core.hash_password(password)
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor()
+
+            # Check if email already exists
+            cursor.execute(queries.PROVIDER_EMAIL_EXISTS, (email,))
+            if cursor.fetchone():
+                return jsonify({"error": "Email already registered"}), 400
+
+            # Insert new provider
+            cursor.execute(queries.PROVIDER_INSERT, (name, phone_number, email, hashed_password))
+            provider_id = cursor.lastrowid
+            # Sent in the background, committed with the account
+            core.enqueue_job(cursor, tasks.WELCOME_EMAIL, {"email": email, "name": name, "userType": "provider"})
+            connection.commit()
+            core.record_write(f"user:provider:{provider_id}")
+            return jsonify({"message": "Registration successful"}), 201
+        except Error as e:
+            logger.error(f"Error registering provider: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/provider/login', methods=['POST'])
+@core.rate_limited('login')
+def provider_login():
+    data = request.json
+    email = data.get('email')
+    password = data.get('password')
+
+    # Validate required fields
+    if not all([email, password]):
+        return jsonify({"error": "Email and password are required"}), 400
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+
+            # Get the stored password hash
+            cursor.execute(queries.PROVIDER_LOGIN, (email,))
+            user = cursor.fetchone()
+
+            valid, new_hash = core.verify_password(password, user['password'] if user else None)
+            if valid:
+                if new_hash:
+                    core.store_password_hash(connection, queries.PROVIDER_SET_PASSWORD, user['id'], new_hash)
+                # Generate JWT access and refresh tokens
+                tokens = core.issue_tokens(user['id'], 'provider')
+                return jsonify(queries.format_login(tokens, user, 'provider')), 200
+            else:
+                return jsonify({"error": "Invalid credentials"}), 401
+        except Error as e:
+            logger.error(f"Error during provider login: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
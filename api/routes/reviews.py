@@ -0,0 +1,142 @@
+"""Provider reviews of seekers."""
+import logging
+
+import mysql.connector
+from flask import Blueprint, g, jsonify, request
+from mysql.connector import Error, errorcode
+
+from api import app as core
+from api import tasks
+from api.db import queries
+from api.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('reviews', __name__)
+
+# Review id above any real one, where the first page of GET .../reviews starts
+REVIEW_CURSOR_START = 2 ** 31
+
+
+# InnoDB errors after which the whole transaction can simply be run again
+RETRYABLE_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+
+# Write the review and fold it into the seeker's totals, uncommitted.
+# Returns (review_id, existing review or None), or None if the seeker does not exist.
+def save_review(cursor, seeker_id, provider_id, rating, comment):
+    cursor.execute(queries.SEEKER_EXISTS_FOR_UPDATE, (seeker_id,))
+    if not cursor.fetchone():
+        return None
+
+    # Lock this provider's existing review, if any, so concurrent edits fold in once
+    cursor.execute(queries.REVIEW_FOR_UPDATE, (seeker_id, provider_id))
+    existing = cursor.fetchone()
+    if existing:
+        cursor.execute(queries.REVIEW_UPDATE, (rating, comment, existing['id']))
+        review_id = existing['id']
+        stars, count = rating - existing['rating'], 0
+    else:
+        cursor.execute(queries.REVIEW_INSERT, (seeker_id, provider_id, rating, comment))
+        review_id = cursor.lastrowid
+        stars, count = rating, 1
+    cursor.execute(queries.SEEKER_ADD_REVIEW, (stars, count, stars, count, stars, count, seeker_id))
+    return review_id, existing
+
+
+# Create or replace the calling provider's review of a seeker. The seeker's rating,
+# review count and rank_score are updated incrementally in the same transaction.
+@bp.route('/api/seeker/<int:seeker_id>/reviews', methods=['POST'])
+@core.require_auth('provider')
+def review_seeker(seeker_id):
+    data = request.get_json(silent=True) or {}
+    rating = data.get('rating')
+    comment = data.get('comment')
+    if isinstance(rating, bool) or not isinstance(rating, int) or not 1 <= rating <= 5:
+        return jsonify({"error": "rating must be an integer from 1 to 5"}), 400
+    if comment is not None and not isinstance(comment, str):
+        return jsonify({"error": "comment must be a string"}), 400
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                saved = save_review(cursor, seeker_id, g.user['id'], rating, comment)
+            except Error as e:
+                if e.errno not in RETRYABLE_ERRORS:
+                    raise
+                # Chosen as a deadlock victim or timed out on a lock; start over once
+                connection.rollback()
+                logger.warning(f"Retrying review of seeker {seeker_id}: {e}")
+                saved = save_review(cursor, seeker_id, g.user['id'], rating, comment)
+            if saved is None:
+                return jsonify({"error": "Seeker not found"}), 404
+            review_id, existing = saved
+            # The seeker is notified in the background, once this commits
+            core.enqueue_job(cursor, tasks.REVIEW_EMAIL, {"reviewId": review_id, "updated": bool(existing)})
+            connection.commit()
+            core.invalidate_seeker_cache(seeker_id)
+            core.record_write()
+
+            cursor.execute(queries.SEEKER_RATING, (seeker_id,))
+            seeker = cursor.fetchone()
+            return jsonify({
+                "message": "Review updated" if existing else "Review added",
+                "rating": seeker['rating'],
+                "reviews": seeker['reviews']
+            }), 200 if existing else 201
+        except mysql.connector.IntegrityError as e:
+            # Lost a race with a concurrent first review from the same provider
+            connection.rollback()
+            logger.error(f"Conflicting review of seeker {seeker_id}: {e}")
+            return jsonify({"error": "Review was modified concurrently, please retry"}), 409
+        except Error as e:
+            connection.rollback()
+            if e.errno in RETRYABLE_ERRORS:
+                logger.error(f"Review of seeker {seeker_id} lost a lock again: {e}")
+                return jsonify({"error": "Review was modified concurrently, please retry"}), 409
+            logger.error(f"Error reviewing seeker: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Newest reviews first, keyset-paginated through X-Next-Cursor like /api/seekers
+@bp.route('/api/seeker/<int:seeker_id>/reviews', methods=['GET'])
+def get_seeker_reviews(seeker_id):
+    try:
+        limit = max(1, min(int(request.args.get('limit', queries.REVIEW_PAGE_SIZE)), queries.MAX_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    before = REVIEW_CURSOR_START
+    if request.args.get('cursor'):
+        try:
+            before = int(decode_cursor(request.args['cursor'], 'reviews')[0])
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    connection = core.get_db(read_only=True, scopes=core.read_scopes(f"seeker:{seeker_id}"))
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(queries.SEEKER_EXISTS, (seeker_id,))
+            if not cursor.fetchone():
+                return jsonify({"error": "Seeker not found"}), 404
+
+            # Fetch one extra row to learn whether another page follows
+            cursor.execute(queries.REVIEW_LIST, (seeker_id, before, limit + 1))
+            rows = cursor.fetchall()
+            response = jsonify([queries.format_review(row) for row in rows[:limit]])
+            if len(rows) > limit:
+                response.headers['X-Next-Cursor'] = encode_cursor('reviews', [rows[limit - 1]['id']])
+            return response, 200
+        except Error as e:
+            logger.error(f"Error listing seeker reviews: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
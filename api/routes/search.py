@@ -0,0 +1,128 @@
+"""Seeker search, streamed search results and typeahead."""
+import logging
+
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
+from mysql.connector import Error
+
+from api import app as core
+from api.db.pool import PoolError
+from api.db.queries import SEEKER_TERMS, SeekerSearch
+from api.utils import jsonstream
+from api.utils.cache import make_entry
+from api.utils.search_index import SeekerSearchIndex
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('search', __name__)
+
+AUTOCOMPLETE_LIMIT = 10
+
+# Rows fetched from the server per chunk of a streamed (?stream=) search
+SEARCH_STREAM_BATCH = 500
+
+
+# Function to load (field, value, count) rows for the typeahead index
+def load_seeker_terms():
+    pool, connection = core.db_router.acquire(read_only=True)
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SEEKER_TERMS)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    finally:
+        pool.release(connection)
+
+
+@bp.route('/api/seekers', methods=['GET'])
+def get_seekers():
+    try:
+        search = SeekerSearch(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    g.search_variant = search.variant()
+    if search.stream:
+        return stream_seekers(search)
+
+    cache_key = core.seeker_search_cache_key(*search.cache_parts())
+    if cache_key:
+        entry = core.response_cache.get(cache_key)
+        if entry:
+            return core.cached_response(entry, core.cache_config['search_max_age'])
+
+    query, params = search.sql()
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params)
+            seekers, headers = search.page(cursor.fetchall())
+
+            entry = make_entry(jsonstream.dumps(seekers), headers)
+            if cache_key and core.cacheable_read():
+                core.response_cache.set(cache_key, entry, core.cache_config['search_ttl'])
+            return core.cached_response(entry, core.cache_config['search_max_age'])
+        except Error as e:
+            logger.error(f"Error searching seekers: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Helper function to stream every match from an unbuffered cursor; memory stays flat
+# however many rows match, and streamed results bypass the response cache
+def stream_seekers(search):
+    query, params = search.sql()
+    connection = core.get_db(read_only=True, scopes=core.read_scopes())
+    if connection:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params)
+        except Error as e:
+            cursor.close()
+            logger.error(f"Error searching seekers: {e}")
+            return jsonify({"error": str(e)}), 500
+
+        stream = {'finished': False}
+
+        def generate():
+            batches = jsonstream.iter_batches(cursor, SEARCH_STREAM_BATCH)
+            try:
+                if search.stream == 'ndjson':
+                    yield from jsonstream.ndjson_chunks(batches, search.format_row)
+                else:
+                    yield from jsonstream.json_array_chunks(batches, search.format_row)
+                stream['finished'] = True
+            except Error as e:
+                # Headers are already sent; all we can do is end the stream early
+                logger.error(f"Error streaming seekers: {e}")
+
+        mimetype = 'application/x-ndjson' if search.stream == 'ndjson' else 'application/json'
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        return core.release_with_response(response, cursor, lambda: stream['finished'])
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/seekers/autocomplete', methods=['GET'])
+def autocomplete_seekers():
+    field = request.args.get('field', 'skill')
+    text = request.args.get('q', '')
+    if field not in SeekerSearchIndex.FIELDS:
+        return jsonify({"error": f"field must be one of: {', '.join(SeekerSearchIndex.FIELDS)}"}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', AUTOCOMPLETE_LIMIT)), 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        core.seeker_search_index.refresh(load_seeker_terms)
+    except (PoolError, Error) as e:
+        # Serve whatever the index already holds rather than failing typeahead
+        logger.error(f"Error refreshing search index: {e}")
+
+    suggestions = core.seeker_search_index.complete(field, text, limit)
+    return jsonify([{"value": value, "count": count} for value, count in suggestions]), 200
@@ -0,0 +1,192 @@
+"""Seeker registration, login and profiles (one at a time or in batches)."""
+import logging
+
+from flask import Blueprint, jsonify, request
+from mysql.connector import Error
+
+from api import app as core
+from api import tasks
+from api.db import queries
+from api.utils import jsonstream
+from api.utils.cache import make_entry
+from api.utils.geo import resolve_point
+from api.utils.ranking import rank_score
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('seekers', __name__)
+
+
+@bp.route('/api/seeker/register', methods=['POST'])
+@core.rate_limited('register')
+def seeker_register():
+    data = request.json
+    name = data.get('name')
+    phone_number = data.get('phone_number')
+    email = data.get('email')
+    skill = data.get('skill')
+    years_of_experience = data.get('years_of_experience')
+    location = data.get('location')
+    time_period = data.get('time_period')
+    base_price = data.get('base_price')
+    password = data.get('password')
+
+    # Validate required fields
+    if not all([name, phone_number, email, skill, years_of_experience, location, time_period, base_price, password]):
+        return jsonify({"error": "All fields are required"}), 400
+
+    # Coordinates from the request, or geocoded offline from the location
+    try:
+        point = resolve_point(location, data.get('latitude'), data.get('longitude'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Ranking score of a seeker with no reviews yet
+    try:
+        score = rank_score(0, 0, int(years_of_experience))
+    except (TypeError, ValueError):
+        return jsonify({"error": "years_of_experience must be an integer"}), 400
+
+    # Hash the password
+    hashed_password = core.hash_password(password)
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor()
+
+            # Check if email already exists
+            cursor.execute(queries.SEEKER_EMAIL_EXISTS, (email,))
+            if cursor.fetchone():
+                return jsonify({"error": "Email already registered"}), 400
+
+            # Insert new seeker
+            cursor.execute(
+                queries.SEEKER_INSERT,
+                (name, phone_number, email, skill, years_of_experience, location, time_period, base_price, hashed_password, 0, 0,
+                 *point, score)
+            )
+            seeker_id = cursor.lastrowid
+            # Sent in the background, committed with the account
+            core.enqueue_job(cursor, tasks.WELCOME_EMAIL, {"email": email, "name": name, "userType": "seeker"})
+            connection.commit()
+            core.invalidate_seeker_cache(seeker_id)
+            core.record_write(f"user:seeker:{seeker_id}")
+            core.seeker_search_index.add_seeker(skill, location)
+            return jsonify({"message": "Registration successful"}), 201
+        except Error as e:
+            logger.error(f"Error registering seeker: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/seeker/login', methods=['POST'])
+@core.rate_limited('login')
+def seeker_login():
+    data = request.json
+    email = data.get('email')
+    password = data.get('password')
+
+    # Validate required fields
+    if not all([email, password]):
+        return jsonify({"error": "Email and password are required"}), 400
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+
+            # Get stored password hash too
+            cursor.execute(queries.SEEKER_LOGIN, (email,))
+            user = cursor.fetchone()
+
+            valid, new_hash = core.verify_password(password, user['password'] if user else None)
+            if valid:
+                if new_hash:
+                    core.store_password_hash(connection, queries.SEEKER_SET_PASSWORD, user['id'], new_hash)
+                # Generate JWT access and refresh tokens
+                tokens = core.issue_tokens(user['id'], 'seeker')
+                return jsonify(queries.format_login(tokens, user, 'seeker')), 200
+            else:
+                return jsonify({"error": "Invalid credentials"}), 401
+        except Error as e:
+            logger.error(f"Error during seeker login: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+@bp.route('/api/seeker/<int:seeker_id>', methods=['GET'])
+def get_seeker(seeker_id):
+    cache_key = f"seeker:{seeker_id}"
+    entry = core.response_cache.get(cache_key)
+    if entry:
+        return core.cached_response(entry, core.cache_config['profile_max_age'])
+
+    connection = core.get_db(read_only=True, scopes=core.read_scopes(f"seeker:{seeker_id}"))
+    if connection:
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(queries.SEEKER_PROFILE, (seeker_id,))
+            seeker = cursor.fetchone()
+
+            if seeker:
+                entry = make_entry(jsonstream.dumps(queries.format_seeker_profile(seeker)))
+                core.response_cache.set(cache_key, entry, core.cache_config['profile_ttl'])
+                return core.cached_response(entry, core.cache_config['profile_max_age'])
+            else:
+                return jsonify({"error": "Seeker not found"}), 404
+        except Error as e:
+            logger.error(f"Error getting seeker profile: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Many profiles in one request (e.g. a page of shortlisted seekers): cached profiles come
+# from one cache lookup and the rest from a single IN query. Profiles keep the order of
+# 'ids' (?ids=3,1,2 or a JSON body {"ids": [...]}), and unknown ids are listed under "missing".
+@bp.route('/api/seekers/batch', methods=['GET', 'POST'])
+def get_seekers_batch():
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        ids = data.get('ids') if isinstance(data, dict) else data
+    else:
+        ids = request.args.get('ids', '')
+    try:
+        seeker_ids = queries.parse_seeker_ids(ids)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    keys = [f"seeker:{seeker_id}" for seeker_id in seeker_ids]
+    entries = core.response_cache.get_many(keys)
+    uncached = [seeker_id for seeker_id, key in zip(seeker_ids, keys) if key not in entries]
+    if uncached:
+        connection = core.get_db(read_only=True, scopes=core.read_scopes(*(f"seeker:{seeker_id}" for seeker_id in uncached)))
+        if connection:
+            try:
+                cursor = connection.cursor(dictionary=True)
+                cursor.execute(queries.SEEKER_PROFILES.format(placeholders=', '.join(['%s'] * len(uncached))), uncached)
+                for seeker in cursor.fetchall():
+                    key = f"seeker:{seeker['id']}"
+                    entries[key] = make_entry(jsonstream.dumps(queries.format_seeker_profile(seeker)))
+                    core.response_cache.set(key, entries[key], core.cache_config['profile_ttl'])
+            except Error as e:
+                logger.error(f"Error getting seeker profiles: {e}")
+                return jsonify({"error": str(e)}), 500
+            finally:
+                cursor.close()
+        else:
+            return jsonify({"error": "Database connection failed"}), 500
+
+    profiles = [entries[key]['body'] for key in keys if key in entries]
+    missing = [seeker_id for seeker_id, key in zip(seeker_ids, keys) if key not in entries]
+    entry = make_entry(queries.render_seeker_batch(profiles, missing))
+    return core.cached_response(entry, core.cache_config['profile_max_age'])
@@ -0,0 +1,123 @@
+"""Service routes: the endpoint index, schema status, health probes and stats."""
+import logging
+
+from flask import Blueprint, Response, jsonify
+from mysql.connector import Error
+
+from api import app as core
+from api.db import migrations
+from api.db.pool import PoolError
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('system', __name__)
+
+
+# Root route
+@bp.route('/', methods=['GET'])
+def index():
+    return jsonify({
+        "message": "Welcome to the Freelancer API",
+        "status": "running",
+        "available_endpoints": [
+            "/api/init-db",
+            "/api/test-db-connection",
+            "/api/provider/register",
+            "/api/provider/login",
+            "/api/seeker/register",
+            "/api/seeker/login",
+            "/api/seeker/<seeker_id>",
+            "/api/seekers/batch",
+            "/api/seeker/<seeker_id>/reviews",
+            "/api/seekers",
+            "/api/seekers/autocomplete",
+            "/api/seekers/match",
+            "/api/seeker/<seeker_id>/slots",
+            "/api/bookings",
+            "/api/bookings/<booking_id>",
+            "/api/bookings/<booking_id>/cancel",
+            "/api/token/refresh",
+            "/api/me",
+            "/api/providers/import",
+            "/api/seekers/import",
+            "/api/seekers/export",
+            "/api/pool-stats",
+            "/api/cache-stats",
+            "/api/job-stats",
+            "/healthz",
+            "/readyz",
+            "/metrics"
+        ]
+    }), 200
+
+
+# Schema changes are applied with `python -m api.migrate upgrade`, never over
+# HTTP; this only reports whether the database schema is up to date
+@bp.route('/api/init-db', methods=['GET'])
+def init_db():
+    try:
+        version = core.check_schema()
+    except migrations.SchemaMismatchError as e:
+        return jsonify({"error": "Database schema is out of date", "details": str(e)}), 503
+    except (PoolError, Error) as e:
+        logger.error(f"Error checking schema version: {e}")
+        return jsonify({"error": "Database connection failed", "details": str(e)}), 500
+    return jsonify({"message": "Database schema is up to date", "version": version}), 200
+
+
+@bp.route('/api/test-db-connection', methods=['GET'])
+def test_db_connection():
+    result = core.test_connection()
+    if result["connected"]:
+        return jsonify({
+            "message": "Database connection successful",
+            "server_info": result["server_info"],
+            "database_name": result["database_name"]
+        }), 200
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+
+# Liveness: the process is up and serving; never touches the database
+@bp.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({"status": "alive"}), 200
+
+
+# Readiness: this worker can borrow a working pooled connection
+@bp.route('/readyz', methods=['GET'])
+def readyz():
+    ready, error = core.check_readiness()
+    if ready:
+        return jsonify({"status": "ready"}), 200
+    return jsonify({"status": "unavailable", "error": error}), 503
+
+
+@bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(core.metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+@bp.route('/api/pool-stats', methods=['GET'])
+def pool_stats():
+    stats = core.db_pool.stats()
+    if core.replica_pools:
+        stats['replicas'] = [pool.stats() for pool in core.replica_pools]
+        stats['routing'] = core.db_router.stats()
+    return jsonify(stats), 200
+
+
+@bp.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify(core.response_cache.stats()), 200
+
+
+# Jobs in the queue by status, plus what this worker's job threads have done
+@bp.route('/api/job-stats', methods=['GET'])
+def job_stats():
+    try:
+        queued = core.job_queue.counts()
+    except (PoolError, Error) as e:
+        logger.error(f"Error counting jobs: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+    return jsonify({"jobs": queued, "worker": core.job_worker.stats()}), 200
@@ -0,0 +1,49 @@
+"""Token refresh and the caller's identity."""
+import logging
+
+from flask import Blueprint, g, jsonify, request
+from mysql.connector import Error
+
+from api import app as core
+from api.db import queries
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('tokens', __name__)
+
+
+# Trade a refresh token for a new pair; each refresh token works once, and only
+# while its account still exists
+@bp.route('/api/token/refresh', methods=['POST'])
+def refresh_token():
+    data = request.get_json(silent=True) or {}
+    claims = core.verify_token(data.get('refreshToken', ''), token_use='refresh')
+    if claims is None or claims.get('type') not in queries.ACCOUNT_EXISTS:
+        return jsonify({"error": "Invalid or expired refresh token"}), 401
+
+    connection = core.get_db()
+    if connection:
+        try:
+            cursor = connection.cursor()
+            cursor.execute(queries.ACCOUNT_EXISTS[claims['type']], (claims['sub'],))
+            if not cursor.fetchone():
+                return jsonify({"error": "Account no longer exists"}), 401
+        except Error as e:
+            logger.error(f"Error refreshing token: {e}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            cursor.close()
+    else:
+        return jsonify({"error": "Database connection failed"}), 500
+
+    if not core.spend_refresh_token(claims):
+        return jsonify({"error": "Refresh token was already used"}), 401
+    return jsonify(core.issue_tokens(claims['sub'], claims['type'])), 200
+
+
+# Identity of the bearer of an access token; needs no database round trip
+@bp.route('/api/me', methods=['GET'])
+@core.require_auth()
+def current_user():
+    claims = g.user['claims']
+    return jsonify({"id": g.user['id'], "userType": g.user['type'], "expiresAt": claims['exp']}), 200
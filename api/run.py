@@ -1,8 +1,10 @@
 
-from api.app import create_app
+from api.app import create_app, settings
+from api.config import configure_logging
 import logging
 
 if __name__ == '__main__':
+    configure_logging(settings.server.log_level)
     logging.info("Starting Flask application...")
     app = create_app()
     app.run(debug=True, port=5000)
@@ -0,0 +1,131 @@
+"""Production launcher: runs the API under a pre-fork Gunicorn master.
+
+Usage (from the repository root)::
+
+    python -m api.server --bind 0.0.0.0:5000 --workers 8 --threads 4
+    python -m api.server --asgi              # serve create_asgi_app() via uvicorn workers
+
+The master forks ``--workers`` processes (default: one per CPU). Each worker
+starts with an empty connection pool, so no socket is ever shared across a
+fork. Send the master ``SIGHUP`` for a graceful rolling reload: new workers
+are started with fresh code and configuration before the old ones finish
+their in-flight requests and exit. ``SIGTERM`` drains and stops.
+
+``--preload`` imports the app once in the master so workers share its memory
+pages and boot faster, but then ``SIGHUP`` cannot pick up new code; use
+Gunicorn's ``USR2`` + ``WINCH`` binary upgrade in that mode instead.
+
+Defaults for every flag come from the ``server`` settings (``FREELANCER_SERVER_*``
+variables or the ``FREELANCER_CONFIG`` file, see ``api/config.py``); flags
+given on the command line win.
+
+Point liveness probes at ``/healthz`` and readiness probes at ``/readyz``.
+"""
+import argparse
+import logging
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from api.config import ConfigError, configure_logging, load_settings
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def post_fork(server, worker):
+    # Forget any pooled connections inherited from the master (with --preload)
+    from api.app import db_pool, db_router
+    db_pool.reset()
+    db_router.reset()
+    server.log.info(f"Worker {worker.pid} initialized its connection pool")
+
+
+def worker_exit(server, worker):
+    from api.app import db_pool, db_router, job_worker, password_hasher
+    # Let running jobs finish; anything cut short is retried once its lease expires
+    job_worker.stop(timeout=10)
+    db_pool.close()
+    db_router.close()
+    password_hasher.close()
+
+
+class FreelancerServer(BaseApplication):
+    """Gunicorn application wrapping ``create_app()`` (or ``create_asgi_app()``)."""
+
+    def __init__(self, options, asgi=False):
+        self.options = options
+        self.asgi = asgi
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None and key in self.cfg.settings:
+                self.cfg.set(key, value)
+
+    def load(self):
+        if self.asgi:
+            from api.asgi import create_asgi_app
+            return create_asgi_app()
+        from api.app import create_app
+        return create_app()
+
+
+def build_options(args):
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'keepalive': args.keepalive,
+        # Recycle workers periodically (with jitter so they do not all restart at once)
+        'max_requests': args.max_requests,
+        'max_requests_jitter': max(1, args.max_requests // 10) if args.max_requests else 0,
+        'preload_app': args.preload,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit,
+        'accesslog': args.access_log,
+    }
+    if args.asgi:
+        options['worker_class'] = 'uvicorn.workers.UvicornWorker'
+    else:
+        options['worker_class'] = 'gthread'
+        options['threads'] = args.threads
+    return options
+
+
+def main(argv=None):
+    try:
+        settings = load_settings().server
+    except ConfigError as e:
+        # Report every problem before forking workers that would each fail the same way
+        raise SystemExit(str(e))
+    configure_logging(settings.log_level)
+
+    parser = argparse.ArgumentParser(description="Run the Freelancer API with a pre-fork multi-worker server")
+    parser.add_argument('--bind', default=settings.bind)
+    parser.add_argument('--workers', type=int, default=settings.workers or default_workers(),
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--threads', type=int, default=settings.threads, help='request threads per worker (sync mode)')
+    parser.add_argument('--timeout', type=int, default=settings.timeout, help='seconds before a silent worker is restarted')
+    parser.add_argument('--graceful-timeout', type=int, default=settings.graceful_timeout,
+                        help='seconds workers get to drain on reload/stop')
+    parser.add_argument('--keepalive', type=int, default=settings.keepalive, help='seconds to hold idle keep-alive connections')
+    parser.add_argument('--max-requests', type=int, default=settings.max_requests,
+                        help='requests before a worker is recycled (0 = never)')
+    parser.add_argument('--access-log', default=None, help="access log path ('-' for stdout)")
+    parser.add_argument('--preload', action='store_true', help='import the app in the master before forking')
+    parser.add_argument('--asgi', action='store_true', help='serve the async app with uvicorn workers')
+    args = parser.parse_args(argv)
+    # The app sizes admission control by the threads it really gets, so pass on a --threads override
+    os.environ['FREELANCER_SERVER_THREADS'] = str(args.threads)
+
+    logger.info(f"Starting {args.workers} workers on {args.bind}")
+    FreelancerServer(build_options(args), asgi=args.asgi).run()
+
+
+if __name__ == '__main__':
+    main()
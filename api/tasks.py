@@ -0,0 +1,50 @@
+"""Background job handlers, by job kind.
+
+Request handlers queue these with ``api.app.enqueue_job`` inside their own
+transaction. They run on the web workers' job threads or under
+``python -m api.worker``, each as ``handler(connection, payload)``. A job
+may run more than once, so every handler tolerates repeats (at worst, a
+notification is sent twice).
+"""
+import logging
+
+from api.db import queries
+
+logger = logging.getLogger(__name__)
+
+# Job kinds
+WELCOME_EMAIL = 'email.welcome'
+REVIEW_EMAIL = 'email.review_received'
+
+
+def create_handlers(mailer):
+    """``{kind: handler}`` for every job kind, sending mail through ``mailer``."""
+
+    # Payload: {"email", "name", "userType"}, captured at registration
+    def send_welcome_email(connection, payload):
+        role = "find freelancers" if payload['userType'] == 'provider' else "get hired"
+        mailer.send(payload['email'], "Welcome to Freelancer",
+                    f"Hi {payload['name']},\n\nYour {payload['userType']} account is ready. "
+                    f"Log in to start using Freelancer to {role}.\n")
+
+    # Payload: {"reviewId", "updated"}; the review is read when the job runs, so the newest text is sent
+    def send_review_email(connection, payload):
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(queries.REVIEW_NOTICE, (payload['reviewId'],))
+            review = cursor.fetchone()
+        finally:
+            cursor.close()
+        if not review:
+            logger.info(f"Review {payload['reviewId']} no longer exists; skipping its notification")
+            return
+        action = "updated their review" if payload.get('updated') else "reviewed you"
+        comment = f"\n\n\"{review['comment']}\"" if review['comment'] else ""
+        mailer.send(review['seeker_email'], f"{review['provider_name']} {action}",
+                    f"Hi {review['seeker_name']},\n\n{review['provider_name']} {action}: "
+                    f"{review['rating']} out of 5 stars.{comment}\n")
+
+    return {
+        WELCOME_EMAIL: send_welcome_email,
+        REVIEW_EMAIL: send_review_email,
+    }
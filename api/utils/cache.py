@@ -0,0 +1,288 @@
+"""Read-through response cache with pluggable storage backends.
+
+Backends store opaque bytes under string keys with a TTL. ``MemoryBackend``
+keeps an LRU bounded by entry count and total bytes inside the process;
+``RedisBackend`` wraps any redis-py compatible client so several workers can
+share one cache. ``ResponseCache`` sits on top, serializes entries and keeps
+hit/miss counters.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface every cache storage backend implements."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        """Values for ``keys`` in order (None for misses); backends override this to batch the lookups."""
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def add(self, key, value, ttl):
+        """Atomically set ``key`` unless it holds an unexpired value; returns whether it was set."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Atomically increment a counter that is never evicted."""
+        raise NotImplementedError
+
+    def get_counter(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with per-entry expiry and entry/byte bounds."""
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def _store(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at)
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counter(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class RedisBackend(CacheBackend):
+    """Backend for a Redis (or Redis-protocol compatible) server."""
+
+    def __init__(self, client, prefix='freelancer:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def get_many(self, keys):
+        # One MGET round trip instead of one GET per key
+        return self.client.mget([self.prefix + key for key in keys]) if keys else []
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def add(self, key, value, ttl):
+        return bool(self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None, nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+    def get_counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+
+def create_backend(config):
+    """Build the backend named by ``config['backend']`` ('memory' or 'redis')."""
+    backend = config.get('backend', 'memory')
+    if backend == 'memory':
+        return MemoryBackend(config.get('max_entries', 10000), config.get('max_bytes', 64 * 1024 * 1024))
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis cache backend requires the 'redis' package") from e
+        return RedisBackend(redis.Redis.from_url(config['url']), config.get('prefix', 'freelancer:'))
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def make_entry(body, headers=None):
+    """Wrap a rendered JSON ``body`` string with its ETag and extra response headers."""
+    return {
+        'body': body,
+        'etag': hashlib.sha1(body.encode()).hexdigest(),
+        'headers': headers or {},
+    }
+
+
+def make_key(namespace, *parts):
+    """Stable, bounded-length cache key for an arbitrary tuple of values."""
+    digest = hashlib.sha1(json.dumps(parts, default=str, separators=(',', ':')).encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class ResponseCache:
+    """Caches rendered JSON bodies together with their ETag and extra headers.
+
+    Backend failures are logged and treated as misses so that a broken cache
+    server never takes the API down with it.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _count(self, attribute):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def get(self, key):
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            self._count('errors')
+            raw = None
+        if raw is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(raw)
+
+    def get_many(self, keys):
+        """``{key: entry}`` for the keys that are cached, fetched in one backend call."""
+        try:
+            raws = self.backend.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Cache get_many failed for {len(keys)} keys: {e}")
+            self._count('errors')
+            raws = [None] * len(keys)
+        entries = {key: json.loads(raw) for key, raw in zip(keys, raws) if raw is not None}
+        with self._lock:
+            self.hits += len(entries)
+            self.misses += len(keys) - len(entries)
+        return entries
+
+    def set(self, key, entry, ttl):
+        try:
+            self.backend.set(key, json.dumps(entry).encode(), ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+            self._count('errors')
+
+    def delete(self, key):
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logger.warning(f"Cache delete failed for {key}: {e}")
+            self._count('errors')
+
+    def generation(self, name):
+        """Current value of an invalidation counter (0 if never bumped)."""
+        try:
+            return self.backend.get_counter(f"gen:{name}")
+        except Exception as e:
+            logger.warning(f"Cache generation lookup failed for {name}: {e}")
+            self._count('errors')
+            return None
+
+    def bump_generation(self, name):
+        """Invalidate every key built from generation ``name`` in O(1)."""
+        try:
+            self.backend.incr(f"gen:{name}")
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {name}: {e}")
+            self._count('errors')
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        stats.update(self.backend.stats())
+        return stats
@@ -0,0 +1,158 @@
+"""Offline geocoding, geohashes and distance helpers for nearby-seeker search.
+
+Locations are resolved against the bundled ``data/cities.csv`` table (city
+names and common aliases), so registration never makes a network call.
+Seekers store a geohash next to their coordinates; a radius search is
+answered by range-scanning the index for the handful of geohash cells that
+cover the circle's bounding box, then filtering and sorting by distance.
+"""
+import csv
+import math
+import os
+import re
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GEOHASH_PRECISION = 9
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+CITIES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'cities.csv')
+
+_cities = None
+
+
+# ----- GEOCODING -----
+
+def _normalize(name):
+    return re.sub(r'\s+', ' ', name).strip().lower()
+
+
+def load_cities(path=CITIES_PATH):
+    """Map of normalized city name or alias -> ``(latitude, longitude)``."""
+    cities = {}
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            point = (float(row['latitude']), float(row['longitude']))
+            for name in [row['name'], *filter(None, row['aliases'].split(';'))]:
+                cities[_normalize(name)] = point
+    return cities
+
+
+def geocode(location):
+    """Coordinates for a free-text location such as ``'Koramangala, Bengaluru'``, or None."""
+    global _cities
+    if _cities is None:
+        _cities = load_cities()
+    text = _normalize(location or '')
+    if text in _cities:
+        return _cities[text]
+    # Fall back to each comma-separated part, e.g. the city in "area, city, state"
+    for part in text.split(','):
+        part = re.sub(r'\b(city|district)$', '', part.strip()).strip()
+        if part in _cities:
+            return _cities[part]
+    return None
+
+
+def resolve_point(location, latitude=None, longitude=None):
+    """``(latitude, longitude, geohash)`` for a seeker, from explicit coordinates or
+    by geocoding ``location``; all None when the location is unknown (e.g. "Remote").
+
+    Raises ``ValueError`` for malformed explicit coordinates.
+    """
+    if latitude not in (None, '') or longitude not in (None, ''):
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            raise ValueError("latitude and longitude must both be numbers")
+        check_point(latitude, longitude)
+    else:
+        point = geocode(location)
+        if point is None:
+            return None, None, None
+        latitude, longitude = point
+    return round(latitude, 6), round(longitude, 6), encode(latitude, longitude)
+
+
+def parse_point(text):
+    """Parse ``'lat,lng'`` into floats; raises ``ValueError`` if malformed or out of range."""
+    try:
+        latitude, longitude = (float(value) for value in text.split(','))
+    except ValueError:
+        raise ValueError("near must be 'latitude,longitude'")
+    check_point(latitude, longitude)
+    return latitude, longitude
+
+
+def check_point(latitude, longitude):
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("latitude must be within ±90 and longitude within ±180")
+
+# ----- GEOHASH -----
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """``(latitude_degrees, longitude_degrees)`` spanned by one cell at ``precision``."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def _samples(start, end, step):
+    value = start
+    while value < end:
+        yield value
+        value += step
+    yield end
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """``(south, west, north, east)`` around a circle, clamped to valid coordinates."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    edge_lat = min(89.9, abs(latitude) + lat_delta)
+    lng_delta = min(180.0, radius_km / (KM_PER_DEGREE * math.cos(math.radians(edge_lat))))
+    return (max(-90.0, latitude - lat_delta), max(-180.0, longitude - lng_delta),
+            min(90.0, latitude + lat_delta), min(180.0, longitude + lng_delta))
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=32):
+    """The finest set of at most ``max_cells`` geohash prefixes covering the circle."""
+    south, west, north, east = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(precision)
+        rows = int((north - south) / lat_step) + 2
+        columns = int((east - west) / lng_step) + 2
+        if rows * columns <= max_cells:
+            break
+    return sorted({
+        encode(lat, lng, precision)
+        for lat in _samples(south, north, lat_step)
+        for lng in _samples(west, east, lng_step)
+    })
+
+# ----- DISTANCE -----
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
@@ -0,0 +1,44 @@
+"""Compact JSON encoding and chunked JSON/NDJSON streaming of cursor rows.
+
+``dumps`` uses the C-accelerated stdlib encoder with no key sorting and no
+whitespace, and converts ``Decimal`` (DECIMAL columns such as ``base_price``
+and ``rating``) to strings, the same representation Flask's encoder uses.
+"""
+import json
+from decimal import Decimal
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(separators=(',', ':'), check_circular=False, default=_default)
+
+dumps = _encoder.encode
+
+
+def iter_batches(cursor, size):
+    """Yield lists of up to ``size`` rows from an executed (ideally unbuffered) cursor."""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+def json_array_chunks(batches, transform):
+    """Render batches of rows as one JSON array, a batch per chunk."""
+    yield '['
+    separator = ''
+    for rows in batches:
+        yield separator + ','.join(dumps(transform(row)) for row in rows)
+        separator = ','
+    yield ']'
+
+
+def ndjson_chunks(batches, transform):
+    """Render batches of rows as newline-delimited JSON, a batch per chunk."""
+    for rows in batches:
+        yield ''.join(dumps(transform(row)) + '\n' for row in rows)
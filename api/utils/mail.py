@@ -0,0 +1,49 @@
+"""Outgoing email over SMTP.
+
+With no ``host`` configured, messages are logged instead of sent, so
+development setups need no mail server. Sending raises on failure (e.g.
+``smtplib.SMTPException`` or ``OSError``), so a background job that sends
+mail is retried.
+"""
+import logging
+import re
+import smtplib
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+_LINE_BREAKS_RE = re.compile(r'[\r\n]+')
+
+
+def header_value(value):
+    """``value`` on one line: user-supplied text (e.g. a name in a subject) must not break a header."""
+    return _LINE_BREAKS_RE.sub(' ', value).strip()
+
+
+class Mailer:
+    def __init__(self, host='', port=25, sender='no-reply@localhost', username='', password='', starttls=False,
+                 timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, to, subject, body):
+        to, subject = header_value(to), header_value(subject)
+        if not self.host:
+            logger.info(f"Mail to {to} not sent, no mail host configured: {subject}")
+            return
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = to
+        message['Subject'] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
@@ -0,0 +1,32 @@
+"""Opaque keyset-pagination cursors."""
+import base64
+import binascii
+import json
+
+
+def encode_cursor(sort, values):
+    """Pack the sort name and the last row's key values into a URL-safe token."""
+    payload = json.dumps([sort, *values], default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(token, sort):
+    """Return the key values stored in ``token``.
+
+    Raises ``ValueError`` if the token is malformed or was issued for a
+    different sort order than the current request.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, list) or len(payload) < 2 or payload[0] != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    return payload[1:]
+
+
+def like_contains(value):
+    """Escape LIKE wildcards in ``value`` and turn it into a substring pattern."""
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
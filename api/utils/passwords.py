@@ -0,0 +1,215 @@
+"""Salted, tunable password hashing run on a bounded process pool.
+
+Hashes are stored as ``$``-separated strings that record their parameters,
+so the cost can be raised later without invalidating existing passwords::
+
+    scrypt$<n>$<r>$<p>$<salt>$<digest>
+    pbkdf2_sha256$<iterations>$<salt>$<digest>
+
+Bare 64-character SHA-256 hex digests written by earlier versions are still
+accepted; ``verify`` hands back a replacement hash whenever the stored one
+is legacy or uses outdated parameters, so callers can upgrade it on login.
+
+The key derivation is CPU-bound, so it runs in worker processes instead of
+request threads. At most ``max_pending`` hashes may be running or queued;
+callers beyond that wait up to ``queue_timeout`` seconds and then get
+``HasherBusyError``, which keeps a burst of logins from piling up unbounded.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+
+ALGORITHMS = ('scrypt', 'pbkdf2_sha256')
+
+_LEGACY_RE = re.compile(r'[0-9a-f]{64}')
+
+
+class HasherBusyError(Exception):
+    """Raised when too many hashes are already running or queued."""
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode('ascii'))
+
+
+def derive(algorithm, params, password, salt):
+    """Run the key derivation; module-level so worker processes can unpickle it."""
+    if algorithm == 'scrypt':
+        n, r, p = params
+        # scrypt needs about 128 * n * r * p bytes; OpenSSL's default cap is 32 MiB
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=max(32 * 1024 * 1024, 256 * n * r * p), dklen=32)
+    if algorithm == 'pbkdf2_sha256':
+        (iterations,) = params
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+
+
+def encode(algorithm, params, salt, digest):
+    return '$'.join([algorithm, *(str(value) for value in params), _b64encode(salt), _b64encode(digest)])
+
+
+def parse(stored):
+    """Split a stored hash into ``(algorithm, params, salt, digest)``; None if unrecognized."""
+    parts = (stored or '').split('$')
+    try:
+        if parts[0] == 'scrypt' and len(parts) == 6:
+            params = tuple(int(value) for value in parts[1:4])
+        elif parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+            params = (int(parts[1]),)
+        else:
+            return None
+        return parts[0], params, _b64decode(parts[-2]), _b64decode(parts[-1])
+    except (ValueError, TypeError):
+        return None
+
+
+def is_legacy(stored):
+    return bool(stored) and _LEGACY_RE.fullmatch(stored) is not None
+
+
+class PasswordHasher:
+    def __init__(self, algorithm='scrypt', scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1,
+                 pbkdf2_iterations=600000, processes=2, max_pending=32, queue_timeout=5.0):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of: {', '.join(ALGORITHMS)}")
+        self.algorithm = algorithm
+        if algorithm == 'scrypt':
+            self.params = (scrypt_n, scrypt_r, scrypt_p)
+        else:
+            self.params = (pbkdf2_iterations,)
+        self.processes = processes
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+
+        # Salt of the stand-in hash checked for unknown accounts (see dummy_hash)
+        self._dummy_salt = os.urandom(16)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = set()
+        self._pid = os.getpid()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    def _get_executor(self):
+        # A forked server worker must not share the parent's pool processes
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executor = None
+                self._futures = set()
+                self._pid = os.getpid()
+            if self._executor is None:
+                # Imported on first use: workers with processes=0 (and tools that never hash) skip them
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # Forking a multi-threaded server process is unsafe; start workers from a clean forkserver
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+    def _derive(self, algorithm, params, password, salt):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusyError("Password hashing queue is full")
+        with self._lock:
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            if not self.processes:
+                return derive(algorithm, params, password, salt)
+            future = self._get_executor().submit(derive, algorithm, params, password, salt)
+            with self._lock:
+                self._futures.add(future)
+            try:
+                return future.result()
+            finally:
+                with self._lock:
+                    self._futures.discard(future)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                self.busy_seconds += elapsed
+            self._slots.release()
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        return encode(self.algorithm, self.params, salt, self._derive(self.algorithm, self.params, password, salt))
+
+    def hash_many(self, passwords):
+        """Hash a batch, ``processes`` at a time, queueing fairly alongside single logins."""
+        from concurrent.futures import ThreadPoolExecutor
+        workers = max(1, min(self.processes, len(passwords)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.hash, passwords))
+
+    def dummy_hash(self):
+        """A hash with the current parameters that no password matches (its digest is all zeros).
+
+        Verify against it when no account was found, so that takes as long as a wrong password.
+        """
+        return encode(self.algorithm, self.params, self._dummy_salt, bytes(32))
+
+    def needs_rehash(self, stored):
+        parsed = parse(stored)
+        return parsed is None or parsed[:2] != (self.algorithm, self.params)
+
+    def verify(self, password, stored):
+        """Return ``(valid, new_hash)``; ``new_hash`` is set when the stored hash should be replaced."""
+        if is_legacy(stored):
+            valid = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+            if not valid:
+                # A right password pays for its upgrade below; make a wrong one cost the same,
+                # so login timing does not tell legacy accounts from migrated or unknown ones
+                self._derive(self.algorithm, self.params, password, self._dummy_salt)
+                return False, None
+        else:
+            parsed = parse(stored)
+            if parsed is None:
+                return False, None
+            algorithm, params, salt, digest = parsed
+            valid = hmac.compare_digest(self._derive(algorithm, params, password, salt), digest)
+        if valid and self.needs_rehash(stored):
+            try:
+                return True, self.hash(password)
+            except HasherBusyError:
+                # The password was correct; upgrading it can wait for a quieter login
+                return True, None
+        return valid, None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'algorithm': self.algorithm,
+                'processes': self.processes,
+                'max_pending': self.max_pending,
+                'running': min(self._pending, self.processes) if self.processes else self._pending,
+                'queued': max(0, self._pending - self.processes) if self.processes else 0,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'busy_seconds': round(self.busy_seconds, 3),
+            }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            futures, self._futures = self._futures, set()
+        if executor is not None and self._pid == os.getpid():
+            # Drop hashes still waiting for a process (shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,32 @@
+"""Precomputed seeker ranking score behind ``/api/seekers?sort=best``.
+
+The score is a Bayesian average of the seeker's star ratings, which pulls
+seekers with few reviews towards ``PRIOR_MEAN`` so that one 5-star review
+does not outrank a hundred 4.8s, plus a small bonus for experience::
+
+    (PRIOR_WEIGHT * PRIOR_MEAN + rating_total) / (PRIOR_WEIGHT + reviews)
+        + EXPERIENCE_WEIGHT * min(years, EXPERIENCE_CAP) / EXPERIENCE_CAP
+
+It is stored in ``seeker.rank_score`` and kept current by the same UPDATE
+that records each review, so sorting by it is an index scan. After changing
+these constants, recompute stored scores with ``SEEKER_RECOMPUTE_RANK``.
+"""
+
+PRIOR_MEAN = 3.5        # stars assumed for a seeker nobody has reviewed yet
+PRIOR_WEIGHT = 5        # how many reviews' worth of confidence the prior carries
+EXPERIENCE_WEIGHT = 0.25
+EXPERIENCE_CAP = 20     # years of experience beyond this earn no further bonus
+
+
+def rank_score(rating_total, reviews, years_of_experience):
+    experience = min(max(int(years_of_experience), 0), EXPERIENCE_CAP)
+    score = (PRIOR_WEIGHT * PRIOR_MEAN + rating_total) / (PRIOR_WEIGHT + reviews)
+    return round(score + EXPERIENCE_WEIGHT * experience / EXPERIENCE_CAP, 4)
+
+
+def rank_score_sql(rating_total, reviews):
+    """SQL computing ``rank_score`` from the given total/count expressions and the row's experience."""
+    experience = (f"(CASE WHEN years_of_experience > {EXPERIENCE_CAP} THEN {EXPERIENCE_CAP} "
+                  f"WHEN years_of_experience < 0 THEN 0 ELSE years_of_experience END)")
+    return (f"ROUND(({PRIOR_WEIGHT} * {PRIOR_MEAN} + {rating_total}) / ({PRIOR_WEIGHT} + {reviews}) "
+            f"+ {EXPERIENCE_WEIGHT} * {experience} / {EXPERIENCE_CAP}, 4)")
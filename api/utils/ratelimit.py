@@ -0,0 +1,215 @@
+"""Token-bucket rate limiting and admission control.
+
+``RateLimiter`` keeps one token bucket per key (a client IP, an email...).
+A bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per
+second; each request takes one, and an empty bucket reports how many
+seconds until the next token. Buckets live in a pluggable store:
+``MemoryBucketStore`` is per process, while ``RedisBucketStore`` updates
+buckets atomically with a Lua script so every worker enforces one shared
+limit.
+
+``AdmissionController`` caps the requests that may use the database at
+once. The others wait up to ``queue_timeout`` seconds for a slot, admitted
+in arrival order, and are refused after that, so a burst sheds load instead
+of queueing without bound, and admitted requests keep a bounded latency.
+Only threads that are already serving a request can wait, so the server's
+thread count bounds the queue.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBucketStore:
+    """Per-process buckets in an LRU bounded to ``max_keys`` (an evicted bucket starts full again)."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, rate, burst, cost=1):
+        """Take ``cost`` tokens; returns 0 if allowed, else seconds until enough tokens refill."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self):
+        with self._lock:
+            return {'keys': len(self._buckets), 'max_keys': self.max_keys}
+
+
+# KEYS[1] = bucket; ARGV = rate, burst, cost. Returns the wait in milliseconds (0 = allowed).
+# Time comes from the Redis server so workers with skewed clocks agree.
+_TAKE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return math.ceil(wait * 1000)
+"""
+
+
+class RedisBucketStore:
+    """Buckets shared by every worker through a Redis (or compatible) server."""
+
+    def __init__(self, client, prefix='freelancer:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, rate, burst, cost=1):
+        wait_ms = self._take(keys=[self.prefix + key], args=[rate, burst, cost])
+        return int(wait_ms) / 1000
+
+    def stats(self):
+        return {}
+
+
+def create_bucket_store(config):
+    """Build the store named by ``config['backend']`` ('memory' or 'redis')."""
+    backend = config.get('backend', 'memory')
+    if backend == 'memory':
+        return MemoryBucketStore(config.get('max_keys', 100000))
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis rate limit backend requires the 'redis' package") from e
+        return RedisBucketStore(redis.Redis.from_url(config['url']), config.get('prefix', 'freelancer:ratelimit:'))
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+class RateLimiter:
+    """Named token-bucket limits over one store.
+
+    ``limits`` maps a limit name to ``(requests_per_minute, burst)``.
+    """
+
+    def __init__(self, store, limits):
+        self.store = store
+        self.limits = dict(limits)
+        self._lock = threading.Lock()
+        self.rejected = {name: 0 for name in self.limits}
+
+    def check(self, name, key):
+        """Take a token from ``key``'s bucket under limit ``name``; returns 0 or the seconds to wait.
+
+        A failing shared store is logged and lets the request through.
+        """
+        per_minute, burst = self.limits[name]
+        try:
+            wait = self.store.take(f"{name}:{key}", per_minute / 60.0, burst)
+        except Exception as e:
+            logger.warning(f"Rate limit check failed for {name}: {e}")
+            return 0
+        if wait:
+            with self._lock:
+                self.rejected[name] += 1
+        return wait
+
+    def stats(self):
+        with self._lock:
+            stats = {'rejected': dict(self.rejected)}
+        stats.update(self.store.stats())
+        return stats
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted; ``reason`` is 'timeout'."""
+
+    def __init__(self, reason, retry_after=1):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Request not admitted: {reason}")
+
+
+class AdmissionController:
+    """Caps concurrent requests at ``max_inflight`` with a time-limited FIFO wait queue.
+
+    A released slot passes straight to the longest-waiting request, so a new
+    arrival can never overtake requests that are already queued.
+    """
+
+    def __init__(self, max_inflight=30, queue_timeout=1.0):
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be at least 1")
+        self.max_inflight = max_inflight
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._inflight = 0
+        # One event per queued request, oldest first; set when release() hands it a slot
+        self._waiters = deque()
+        self._counters = {'admitted': 0, 'queued_total': 0, 'rejected_timeout': 0}
+
+    def acquire(self):
+        """Wait for a slot; raises ``AdmissionRejected`` when the wait times out."""
+        with self._lock:
+            if self._inflight < self.max_inflight and not self._waiters:
+                self._inflight += 1
+                self._counters['admitted'] += 1
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+            self._counters['queued_total'] += 1
+        if waiter.wait(self.queue_timeout):
+            return
+        with self._lock:
+            # A slot may have been handed over just as the wait timed out
+            if waiter.is_set():
+                return
+            self._waiters.remove(waiter)
+            self._counters['rejected_timeout'] += 1
+        raise AdmissionRejected('timeout')
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # The slot stays in use, now by the oldest waiter
+                self._waiters.popleft().set()
+                self._counters['admitted'] += 1
+            else:
+                self._inflight -= 1
+
+    @contextmanager
+    def admit(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'inflight': self._inflight,
+                'queued': len(self._waiters),
+                'max_inflight': self.max_inflight,
+            })
+        return stats
@@ -0,0 +1,162 @@
+"""In-process typeahead index over seeker skills and locations.
+
+Distinct skill/location values are small compared to the seeker table, so
+they are kept in memory as normalized terms with a usage count. Prefix
+lookups use a sorted list and ``bisect``; when a prefix yields too few
+results, a trigram index supplies infix and typo-tolerant matches.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+_SEPARATOR_RE = re.compile(r"[,;/|]")
+# InnoDB's default innodb_ft_min_token_size; shorter words are never indexed
+MIN_FULLTEXT_WORD = 3
+
+
+def normalize_term(value):
+    """Lowercase ``value`` and collapse runs of whitespace."""
+    return _SPACE_RE.sub(' ', str(value)).strip().lower()
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fulltext_query(text):
+    """Build a MySQL BOOLEAN MODE query requiring every word, matched by prefix.
+
+    Only word characters survive, so user input can never inject boolean
+    operators. Words below the full-text minimum token size are dropped.
+    """
+    words = _WORD_RE.findall(text.lower())
+    return ' '.join(f"+{word}*" for word in words if len(word) >= MIN_FULLTEXT_WORD)
+
+
+class TermIndex:
+    """Prefix and trigram lookup over one field's distinct terms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._display = {}
+        self._sorted = []
+        self._grams = defaultdict(set)
+
+    def __len__(self):
+        return len(self._counts)
+
+    @staticmethod
+    def _parts(value):
+        # Free-text columns may hold several terms, e.g. "React, Node.js"
+        for part in _SEPARATOR_RE.split(value or ''):
+            term = normalize_term(part)
+            if term:
+                yield term, _SPACE_RE.sub(' ', part).strip()
+
+    @classmethod
+    def build(cls, values):
+        """Build an index from ``(value, count)`` pairs, sorting once at the end."""
+        index = cls()
+        for value, count in values:
+            for term, display in cls._parts(value):
+                index._counts[term] = index._counts.get(term, 0) + count
+                index._display.setdefault(term, display)
+        index._sorted = sorted(index._counts)
+        for term in index._sorted:
+            for gram in trigrams(term):
+                index._grams[gram].add(term)
+        return index
+
+    def add(self, value, count=1):
+        for term, display in self._parts(value):
+            self._add_term(term, display, count)
+
+    def _add_term(self, term, display, count):
+        with self._lock:
+            if term in self._counts:
+                self._counts[term] += count
+                return
+            self._counts[term] = count
+            self._display[term] = display
+            insort(self._sorted, term)
+            for gram in trigrams(term):
+                self._grams[gram].add(term)
+
+    def complete(self, text, limit=10):
+        """Return up to ``limit`` ``(display, count)`` pairs, best matches first."""
+        prefix = normalize_term(text)
+        if not prefix:
+            return []
+        with self._lock:
+            start = bisect_left(self._sorted, prefix)
+            matches = []
+            for term in self._sorted[start:]:
+                if not term.startswith(prefix):
+                    break
+                matches.append(term)
+            matches.sort(key=lambda term: (-self._counts[term], term))
+            results = matches[:limit]
+
+            if len(results) < limit and len(prefix) >= 3:
+                # Fall back to trigram similarity for infix matches and typos
+                wanted = trigrams(prefix)
+                scores = defaultdict(int)
+                for gram in wanted:
+                    for term in self._grams.get(gram, ()):
+                        scores[term] += 1
+                threshold = max(1, len(wanted) // 2)
+                seen = set(results)
+                fuzzy = [term for term, score in scores.items() if score >= threshold and term not in seen]
+                fuzzy.sort(key=lambda term: (-scores[term], -self._counts[term], term))
+                results.extend(fuzzy[:limit - len(results)])
+
+            return [(self._display[term], self._counts[term]) for term in results]
+
+
+class SeekerSearchIndex:
+    """Skill and location term indexes, rebuilt from the database every ``ttl`` seconds."""
+
+    FIELDS = ('skill', 'location')
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._fields = {field: TermIndex() for field in self.FIELDS}
+        self._loaded_at = None
+        self._refresh_lock = threading.Lock()
+
+    def is_stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def rebuild(self, rows):
+        """Replace the index from ``(field, value, count)`` rows."""
+        values = {field: [] for field in self.FIELDS}
+        for field, value, count in rows:
+            if field in values and value:
+                values[field].append((value, int(count)))
+        self._fields = {field: TermIndex.build(pairs) for field, pairs in values.items()}
+        self._loaded_at = time.monotonic()
+
+    def refresh(self, loader):
+        """Rebuild from ``loader()`` if stale; only one thread reloads at a time."""
+        if not self.is_stale() or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.rebuild(loader())
+        finally:
+            self._refresh_lock.release()
+
+    def add_seeker(self, skill, location):
+        """Make a newly registered seeker's terms visible before the next rebuild."""
+        if self._loaded_at is None:
+            return
+        self._fields['skill'].add(skill)
+        self._fields['location'].add(location)
+
+    def complete(self, field, text, limit=10):
+        return self._fields[field].complete(text, limit)
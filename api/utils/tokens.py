@@ -0,0 +1,147 @@
+"""JWT issuing and verification with key rotation and a decoded-claims cache.
+
+Tokens carry the signing key's id in the ``kid`` header, so keys can be
+rotated by adding a new key, making it active, and removing the old one
+once every token it signed has expired. Verified claims are cached per
+token string until the token's own expiry, so repeat requests with the same
+token skip signature verification entirely.
+
+Refresh tokens are single-use when the service has a ``spent`` store (a
+cache backend, see ``api/utils/cache.py``): ``spend()`` records a refresh
+token's ``jti`` until the token expires, and refuses it the second time.
+"""
+import datetime
+import math
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+ALGORITHM = 'HS256'
+
+
+class TokenService:
+    def __init__(self, keys, active_kid, access_ttl=900, refresh_ttl=14 * 24 * 3600, cache_size=10000, spent=None):
+        if active_kid not in keys:
+            raise ValueError(f"Active key id '{active_kid}' is not among the configured keys")
+        self._keys = dict(keys)
+        self.active_kid = active_kid
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self.cache_size = cache_size
+        self.spent = spent
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ----- KEYS -----
+
+    def add_key(self, kid, secret, activate=False):
+        with self._lock:
+            self._keys[kid] = secret
+            if activate:
+                self.active_kid = kid
+
+    def remove_key(self, kid):
+        """Stop accepting tokens signed with ``kid`` (including already-cached ones)."""
+        if kid == self.active_kid:
+            raise ValueError("Cannot remove the active signing key")
+        with self._lock:
+            self._keys.pop(kid, None)
+            self._cache.clear()
+
+    # ----- ISSUING -----
+
+    def _issue(self, user_id, user_type, token_use, ttl):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        payload = {
+            'exp': now + datetime.timedelta(seconds=ttl),
+            'iat': now,
+            'sub': str(user_id),
+            'type': user_type,
+            'token_use': token_use
+        }
+        if token_use == 'refresh':
+            payload['jti'] = secrets.token_urlsafe(16)
+        import jwt
+        kid = self.active_kid
+        return jwt.encode(payload, self._keys[kid], algorithm=ALGORITHM, headers={'kid': kid})
+
+    def issue_access_token(self, user_id, user_type):
+        return self._issue(user_id, user_type, 'access', self.access_ttl)
+
+    def issue_refresh_token(self, user_id, user_type):
+        return self._issue(user_id, user_type, 'refresh', self.refresh_ttl)
+
+    # ----- VERIFYING -----
+
+    def _decode(self, token):
+        # PyJWT is imported on first use so worker start-up does not pay for it
+        import jwt
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except jwt.InvalidTokenError:
+            return None
+        # Tokens issued before key ids existed were signed with the original (active) key
+        secret = self._keys.get(kid or self.active_kid)
+        if secret is None:
+            return None
+        try:
+            return jwt.decode(token, secret, algorithms=[ALGORITHM])
+        except jwt.InvalidTokenError:
+            return None
+
+    def verify(self, token, token_use='access'):
+        """Return the token's claims, or None if it is invalid, expired or of the wrong use."""
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None:
+                if cached['exp'] > now:
+                    self._cache.move_to_end(token)
+                    self.cache_hits += 1
+                    claims = cached
+                else:
+                    del self._cache[token]
+                    claims = None
+            else:
+                claims = None
+        if claims is None:
+            with self._lock:
+                self.cache_misses += 1
+            claims = self._decode(token)
+            if claims is None:
+                return None
+            with self._lock:
+                self._cache[token] = claims
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        # Tokens from before refresh tokens existed have no token_use and act as access tokens
+        if claims.get('token_use', 'access') != token_use:
+            return None
+        return claims
+
+    def spend(self, claims):
+        """Use up the verified refresh token with ``claims``; False if it was already used.
+
+        Without a ``spent`` store, refresh tokens stay reusable until they expire.
+        """
+        if self.spent is None:
+            return True
+        if not claims.get('jti'):
+            return False
+        ttl = max(1, math.ceil(claims['exp'] - time.time()))
+        return self.spent.add(f"refresh:{claims['jti']}", b'1', ttl)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'cached_tokens': len(self._cache),
+                'cache_size': self.cache_size,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'active_kid': self.active_kid,
+                'key_ids': sorted(self._keys),
+            }
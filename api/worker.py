@@ -0,0 +1,110 @@
+"""Background job worker CLI (see ``api/db/jobs.py`` and ``api/tasks.py``).
+
+Usage (from the repository root)::
+
+    python -m api.worker run                  # run jobs until SIGTERM/SIGINT
+    python -m api.worker run --threads 8
+    python -m api.worker run --once           # run every due job, then exit (e.g. from cron)
+    python -m api.worker status               # jobs by status and the latest failures
+    python -m api.worker retry-failed         # give failed jobs a fresh set of attempts
+    python -m api.worker purge                # delete old finished jobs now
+
+Server workers run ``jobs.workers`` job threads of their own; set it to 0
+(``FREELANCER_JOBS_WORKERS=0``) to leave every job to dedicated workers
+started with this command. Any number of workers can share one queue.
+"""
+import argparse
+import logging
+import signal
+import sys
+import threading
+from functools import partial
+
+import mysql.connector
+from mysql.connector import Error
+
+from api.config import ConfigError, as_dict, configure_logging, load_settings
+from api.db.jobs import JobQueue, JobWorker
+from api.db.pool import ConnectionPool, PoolError
+from api.tasks import create_handlers
+from api.utils.mail import Mailer
+
+logger = logging.getLogger(__name__)
+
+
+def print_status(queue):
+    counts = queue.counts()
+    for status in ('queued', 'running', 'done', 'failed'):
+        print(f"  {status:<8} {counts.get(status, 0):>8}")
+    failures = queue.recent_failures()
+    if failures:
+        print("Latest failures:")
+    for job in failures:
+        print(f"  {job['id']:>8}  {job['kind']}  after {job['attempts']} attempts at {job['finished_at']}: "
+              f"{job['last_error']}")
+
+
+def run(worker, once):
+    if once:
+        ran = worker.run_until_empty(f"{worker.worker_name()}/once")
+        logger.info(f"Ran {ran} job(s)")
+        return
+    stopping = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda received, frame: stopping.set())
+    worker.ensure_started()
+    stopping.wait()
+    logger.info("Stopping; waiting for running jobs to finish")
+    worker.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run or inspect Freelancer background jobs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_command = commands.add_parser('run', help='run queued jobs')
+    run_command.add_argument('--threads', type=int, default=2, help='jobs run at once (default: 2)')
+    run_command.add_argument('--once', action='store_true', help='run every due job on one thread, then exit')
+    commands.add_parser('status', help='count jobs by status and list recent failures')
+    commands.add_parser('retry-failed', help='requeue every failed job')
+    commands.add_parser('purge', help='delete finished jobs older than jobs.retention_days')
+    args = parser.parse_args(argv)
+
+    # Only the database, job and mail settings are needed; skip importing the web app
+    try:
+        settings = load_settings()
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 1
+    configure_logging(settings.server.log_level)
+    jobs = settings.jobs
+    threads = args.threads if args.command == 'run' else 1
+    if threads < 1:
+        parser.error("--threads must be at least 1")
+
+    pool = ConnectionPool(partial(mysql.connector.connect, **as_dict(settings.db)), name='jobs', size=threads,
+                          max_overflow=1, timeout=settings.pool.timeout, recycle=settings.pool.recycle,
+                          ping_after=settings.pool.ping_after)
+    queue = JobQueue(pool, max_attempts=jobs.max_attempts, backoff_base=jobs.backoff_base,
+                     backoff_max=jobs.backoff_max, lease=jobs.lease, retention_days=jobs.retention_days)
+    try:
+        if args.command == 'status':
+            print_status(queue)
+        elif args.command == 'retry-failed':
+            logger.info(f"Requeued {queue.retry_failed()} failed job(s)")
+        elif args.command == 'purge':
+            logger.info(f"Deleted {queue.purge()} finished job(s)")
+        else:
+            worker = JobWorker(queue, create_handlers(Mailer(**as_dict(settings.mail))), threads=threads,
+                               poll_interval=jobs.poll_interval)
+            logger.info(f"Running jobs on {threads} thread(s)")
+            run(worker, args.once)
+        return 0
+    except (PoolError, Error) as e:
+        logger.error(f"Job worker failed: {e}")
+        return 1
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
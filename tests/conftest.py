@@ -0,0 +1,45 @@
+"""Fixtures running ``create_app()`` against the SQLite stand-in (see ``api/db/sqlite.py``)."""
+import pytest
+
+import api.app as core
+from api.db.pool import ConnectionPool
+from api.db.routing import ReplicaRouter
+from api.db.sqlite import SQLiteConnection, create_schema
+from api.utils.cache import MemoryBackend
+from api.utils.search_index import SeekerSearchIndex
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / 'freelancer.sqlite3')
+    create_schema(path)
+    pool = ConnectionPool(lambda: SQLiteConnection(path), name='test', size=2)
+    monkeypatch.setattr(core, 'db_pool', pool)
+    monkeypatch.setattr(core, 'db_router', ReplicaRouter(pool))
+    monkeypatch.setattr(core.job_queue, 'pool', pool)
+    # Jobs stay queued; no worker threads or mail during tests
+    monkeypatch.setattr(core.job_worker, 'threads', 0)
+    monkeypatch.setattr(core.response_cache, 'backend', MemoryBackend())
+    monkeypatch.setattr(core.token_service, 'spent', MemoryBackend())
+    monkeypatch.setattr(core, 'seeker_search_index', SeekerSearchIndex())
+    # Tests register and log in far more often than the per-IP limit allows
+    monkeypatch.setitem(core.rate_limit_config, 'enabled', False)
+    # Cheap hashes, computed inline
+    monkeypatch.setattr(core.password_hasher, 'processes', 0)
+    monkeypatch.setattr(core.password_hasher, 'params', (1024, 8, 1))
+    yield core.create_app().test_client()
+    pool.close()
+
+
+def register(client, user_type, email, **fields):
+    """Register a ``user_type`` account and return its access token."""
+    account = {'name': email.split('@')[0], 'phone_number': '9000000000', 'email': email, 'password': 'secret'}
+    account.update(fields)
+    response = client.post(f'/api/{user_type}/register', json=account)
+    assert response.status_code == 201, response.get_json()
+    response = client.post(f'/api/{user_type}/login', json={'email': email, 'password': 'secret'})
+    return response.get_json()['token']
+
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
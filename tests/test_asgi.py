@@ -0,0 +1,139 @@
+"""The ASGI app against the same SQLite stand-in, through an aiomysql-shaped pool."""
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.testclient import TestClient
+
+import api.asgi as asgi
+from api.db.sqlite import SQLiteConnection
+from conftest import auth, register
+
+
+class AsyncCursor:
+    def __init__(self, connection, dictionary):
+        self.cursor = connection.cursor(dictionary=dictionary)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.cursor.close()
+
+    async def execute(self, query, params=()):
+        self.cursor.execute(query, params)
+
+    async def executemany(self, query, seq_of_params):
+        self.cursor.executemany(query, seq_of_params)
+
+    async def fetchone(self):
+        return self.cursor.fetchone()
+
+    async def fetchmany(self, size=1):
+        return self.cursor.fetchmany(size)
+
+    async def fetchall(self):
+        return self.cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+
+class AsyncConnection:
+    def __init__(self, path):
+        self.connection = SQLiteConnection(path)
+
+    def cursor(self, cursor_class=None):
+        return AsyncCursor(self.connection, cursor_class is not None)
+
+    async def begin(self):
+        pass
+
+    async def commit(self):
+        self.connection.commit()
+
+    async def rollback(self):
+        self.connection.rollback()
+
+
+class AsyncPool:
+    """Autocommit connections, like the aiomysql pool ``create_db_pool`` builds."""
+    size = freesize = maxsize = 1
+
+    def __init__(self, path):
+        self.path = path
+
+    @asynccontextmanager
+    async def acquire(self):
+        connection = AsyncConnection(self.path)
+        try:
+            yield connection
+        finally:
+            connection.connection.commit()
+            connection.connection.close()
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+@pytest.fixture
+def asgi_client(client, tmp_path, monkeypatch):
+    """Starlette test client sharing the ``client`` fixture's database and settings."""
+    async def create_db_pool():
+        return AsyncPool(str(tmp_path / 'freelancer.sqlite3'))
+
+    monkeypatch.setattr(asgi, 'create_db_pool', create_db_pool)
+    with TestClient(asgi.create_asgi_app()) as asgi_client:
+        yield asgi_client
+
+
+SEEKER = {'skill': 'Home Cleaning', 'location': 'Hyderabad', 'time_period': 'hour',
+          'years_of_experience': 3, 'base_price': 20}
+
+
+def test_asgi_serves_the_same_profile_as_the_sync_app(client, asgi_client):
+    register(client, 'seeker', 'cleaner@example.com', **SEEKER)
+    sync_response = client.get('/api/seeker/1')
+    response = asgi_client.get('/api/seeker/1')
+    assert response.json() == sync_response.get_json()
+    assert response.headers['ETag'] == sync_response.headers['ETag']
+
+    response = asgi_client.get('/api/seeker/1', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+
+def test_asgi_registration_login_and_search(asgi_client):
+    account = {'name': 'cleaner', 'phone_number': '9000000000', 'email': 'cleaner@example.com',
+               'password': 'secret', **SEEKER}
+    assert asgi_client.post('/api/seeker/register', json=account).status_code == 201
+    assert asgi_client.post('/api/seeker/register', json=account).status_code == 400
+
+    response = asgi_client.post('/api/seeker/login', json={'email': account['email'], 'password': 'wrong'})
+    assert response.status_code == 401
+    response = asgi_client.post('/api/seeker/login', json={'email': account['email'], 'password': 'secret'})
+    token = response.json()['token']
+    assert asgi_client.get('/api/me', headers=auth(token)).json()['userType'] == 'seeker'
+    assert [row['name'] for row in asgi_client.get('/api/seekers', params={'skill': 'clean'}).json()] == ['cleaner']
+
+
+def test_asgi_review_updates_the_cached_profile(client, asgi_client):
+    register(client, 'seeker', 'cleaner@example.com', **SEEKER)
+    token = register(client, 'provider', 'client@example.com')
+    assert asgi_client.get('/api/seeker/1').json()['reviews'] == 0
+
+    response = asgi_client.post('/api/seeker/1/reviews', json={'rating': 4}, headers=auth(token))
+    assert response.status_code == 201
+    assert asgi_client.get('/api/seeker/1').json()['reviews'] == 1
+    assert [row['rating'] for row in asgi_client.get('/api/seeker/1/reviews').json()] == [4]
+
+
+def test_asgi_probes(asgi_client):
+    assert asgi_client.get('/healthz').json() == {'status': 'alive'}
+    assert asgi_client.get('/readyz').json() == {'status': 'ready'}
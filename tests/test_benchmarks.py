@@ -0,0 +1,46 @@
+import api.app as core
+from api.benchmarks import suite
+from api.benchmarks.loadgen import percentile, summarize
+from api.db.pool import ConnectionPool
+from api.db.routing import ReplicaRouter
+from api.db.sqlite import SQLiteConnection
+
+
+def test_percentiles_use_the_nearest_rank():
+    values = [0.001 * i for i in range(1, 101)]
+    assert percentile(values, 0.50) == values[49]
+    assert percentile(values, 0.99) == values[98]
+    assert percentile([], 0.99) == 0.0
+
+    summary = summarize('get_seeker', values, errors=2, elapsed=2.0, statuses={200: 100, 500: 2})
+    assert summary['requests'] == 102 and summary['throughput_rps'] == 50.0
+    assert summary['latency_ms']['p99'] == 99.0 and summary['statuses'] == {'200': 100, '500': 2}
+
+
+def test_regressions_compare_like_with_like():
+    def result(scenario, p99, rps, rows=1000):
+        return {'rows': rows, 'scenario': scenario, 'latency_ms': {'p99': p99}, 'throughput_rps': rps}
+
+    baseline = {'results': [result('get_seeker', 10.0, 500.0), result('seekers_all', 10.0, 500.0)]}
+    results = [result('get_seeker', 11.0, 480.0), result('seekers_all', 20.0, 200.0),
+               result('seekers_all', 50.0, 1.0, rows=10000), result('healthz', 1.0, 1.0)]
+    assert suite.find_regressions(results, baseline, 0.2) == [
+        '1000/seekers_all: p99 10.0 -> 20.0 ms',
+        '1000/seekers_all: throughput 500.0 -> 200.0 rps',
+    ]
+
+
+def test_every_scenario_succeeds_against_a_seeded_database(client, tmp_path, monkeypatch):
+    path = str(tmp_path / 'bench.sqlite3')
+    assert suite.seed_database(path, 50)
+    assert not suite.seed_database(path, 50)
+
+    pool = ConnectionPool(lambda: SQLiteConnection(path), name='bench', size=2)
+    monkeypatch.setattr(core, 'db_pool', pool)
+    monkeypatch.setattr(core, 'db_router', ReplicaRouter(pool))
+    monkeypatch.setattr(core.job_queue, 'pool', pool)
+    for name, make_request in suite.scenarios(50, 'test').items():
+        method, url, body, *headers = make_request(3)
+        response = client.open(url, method=method, json=body, headers=headers[0] if headers else None)
+        assert response.status_code in (200, 201), (name, response.get_json())
+    pool.close()
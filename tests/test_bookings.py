@@ -0,0 +1,88 @@
+import api.app as core
+from api.db import queries
+from conftest import auth, register
+
+
+def seeker(client, email='cleaner@example.com'):
+    return register(client, 'seeker', email, skill='Home Cleaning', location='Hyderabad', time_period='hour',
+                    years_of_experience=3, base_price=20)
+
+
+def publish(client, token, *windows, seeker_id=1):
+    slots = [{'startsAt': starts_at, 'endsAt': ends_at} for starts_at, ends_at in windows]
+    return client.post(f'/api/seeker/{seeker_id}/slots', json={'slots': slots}, headers=auth(token))
+
+
+def test_overlapping_slots_are_rejected(client):
+    token = seeker(client)
+    response = publish(client, token, ('2030-01-01T09:00', '2030-01-01T12:00'), ('2030-01-01T13:00', '2030-01-01T17:00'))
+    assert response.status_code == 201
+    assert response.get_json() == {'created': 2, 'skipped': 0}
+
+    # Publishing the same availability again is harmless
+    response = publish(client, token, ('2030-01-01T09:00', '2030-01-01T12:00'))
+    assert response.get_json() == {'created': 0, 'skipped': 1}
+
+    response = publish(client, token, ('2030-01-01T11:00', '2030-01-01T14:00'), ('2030-01-02T09:00', '2030-01-02T12:00'))
+    assert response.status_code == 409
+    assert response.get_json()['conflicts'] == [{'startsAt': '2030-01-01 11:00:00', 'endsAt': '2030-01-01 14:00:00'}]
+
+    response = publish(client, token, ('2030-01-03T09:00', '2030-01-03T12:00'), ('2030-01-03T10:00', '2030-01-03T11:00'))
+    assert response.status_code == 400
+
+    # Nothing from the rejected requests was stored; back-to-back slots are fine
+    assert publish(client, token, ('2030-01-01T12:00', '2030-01-01T13:00')).status_code == 201
+    slots = client.get('/api/seeker/1/slots', query_string={'from': '2030-01-01', 'to': '2030-01-05'}).get_json()
+    assert [slot['startsAt'] for slot in slots] == ['2030-01-01 09:00:00', '2030-01-01 12:00:00', '2030-01-01 13:00:00']
+
+
+def test_started_slots_cannot_be_booked(client):
+    token = seeker(client)
+    provider = register(client, 'provider', 'client@example.com')
+    response = publish(client, token, ('2020-01-01T09:00', '2020-01-01T12:00'), ('2099-01-01T09:00', '2099-01-01T12:00'))
+    assert response.get_json()['created'] == 2
+
+    response = client.post('/api/bookings', json={'slotId': 1}, headers=auth(provider))
+    assert response.status_code == 409
+    assert response.get_json() == {'error': 'Slot has already started'}
+
+    response = client.post('/api/bookings', json={'slotId': 2}, headers=auth(provider))
+    assert response.status_code == 201
+    assert response.get_json()['slotId'] == 2
+
+
+def test_claim_checks_the_start_time(client):
+    # The fast-path check can pass just before a slot starts; the claim itself must still refuse it
+    seeker(client)
+    with core.db_pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(queries.SLOT_INSERT, (1, 'hour', '2030-01-01 09:00:00', '2030-01-01 10:00:00'))
+        cursor.execute(queries.SLOT_CLAIM, (1, 0, '2030-01-01 09:00:00'))
+        assert cursor.rowcount == 0
+        cursor.execute(queries.SLOT_CLAIM, (1, 0, '2029-12-31 23:59:59'))
+        assert cursor.rowcount == 1
+        connection.rollback()
+        cursor.close()
+
+
+def test_match_never_offers_a_booked_slot(client):
+    token = seeker(client)
+    provider = register(client, 'provider', 'client@example.com')
+    publish(client, token, ('2099-01-01T09:00', '2099-01-01T12:00'), ('2099-01-02T09:00', '2099-01-02T12:00'))
+    match = queries.SeekerMatch({'from': '2099-01-01', 'to': '2099-01-05'})
+
+    with core.db_pool.connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(*match.sql())
+        rows = cursor.fetchall()
+        connection.rollback()
+        # The next slot is booked between the match and the lookup of its details
+        assert client.post('/api/bookings', json={'slotId': 1}, headers=auth(provider)).status_code == 201
+        cursor.execute(*match.next_slots_sql(rows))
+        seeker_match, = match.format_rows(rows, cursor.fetchall())
+        cursor.close()
+    assert seeker_match['nextSlot'] is None
+
+    seeker_match, = client.get('/api/seekers/match', query_string={'from': '2099-01-01', 'to': '2099-01-05'}).get_json()
+    assert seeker_match['openSlots'] == 1
+    assert seeker_match['nextSlot']['id'] == 2
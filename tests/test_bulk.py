@@ -0,0 +1,53 @@
+import json
+
+import api.app as core
+from api.routes import bulk
+from conftest import auth, register
+
+
+def exported(client, token):
+    response = client.get('/api/seekers/export', headers=auth(token))
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_import_requires_admin(client, monkeypatch):
+    token = register(client, 'provider', 'anyone@example.com')
+    body = '{"name": "Ann", "email": "ann@example.com", "password": "secret"}\n'
+    headers = dict(auth(token), **{'Content-Type': 'application/x-ndjson'})
+
+    assert client.post('/api/providers/import', data=body, headers=headers).status_code == 403
+    assert client.post('/api/seekers/import', data=body, headers=headers).status_code == 403
+
+    monkeypatch.setattr(core, 'ADMIN_PROVIDERS', frozenset([1]))
+    assert client.post('/api/providers/import', data=body, headers=headers).status_code == 200
+
+
+def test_export_hides_contact_details_from_other_providers(client, monkeypatch):
+    register(client, 'seeker', 'cleaner@example.com', skill='Cleaning', location='Hyderabad', time_period='hour',
+             years_of_experience=2, base_price=20)
+    token = register(client, 'provider', 'anyone@example.com')
+
+    row, = exported(client, token)
+    assert 'email' not in row and 'phone_number' not in row
+
+    monkeypatch.setattr(core, 'ADMIN_PROVIDERS', frozenset([1]))
+    row, = exported(client, token)
+    assert row['email'] == 'cleaner@example.com'
+
+
+def test_abandoned_export_drops_its_connection(client, monkeypatch):
+    monkeypatch.setattr(bulk, 'BULK_EXPORT_BATCH', 1)
+    for number in range(3):
+        register(client, 'seeker', f'cleaner{number}@example.com', skill='Cleaning', location='Hyderabad',
+                 time_period='hour', years_of_experience=2, base_price=20)
+    token = register(client, 'provider', 'anyone@example.com')
+    discarded = core.db_pool.stats()['discarded']
+
+    response = client.get('/api/seekers/export', headers=auth(token), buffered=False)
+    next(response.response)
+    assert core.db_pool.stats()['in_use'] == 1
+    # The client goes away with rows left unread
+    response.close()
+    assert core.db_pool.stats()['in_use'] == 0
+    assert core.db_pool.stats()['discarded'] == discarded + 1
@@ -0,0 +1,83 @@
+import time
+
+import api.app as core
+from api.utils.cache import MemoryBackend, ResponseCache, make_entry
+from conftest import auth, register
+
+
+class BrokenBackend(MemoryBackend):
+    def get(self, key):
+        raise ConnectionError("cache server unavailable")
+
+    def set(self, key, value, ttl):
+        raise ConnectionError("cache server unavailable")
+
+
+def test_memory_backend_evicts_least_recently_used_within_its_bounds():
+    backend = MemoryBackend(max_entries=2, max_bytes=10)
+    backend.set('a', b'1', None)
+    backend.set('b', b'2', None)
+    backend.get('a')
+    backend.set('c', b'3', None)
+    assert [backend.get(key) for key in 'abc'] == [b'1', None, b'3']
+
+    backend.set('big', b'123456789', None)
+    assert backend.get('a') is None and backend.get('c') == b'3'
+    assert backend.stats()['bytes'] == 10 and backend.stats()['evictions'] == 2
+
+
+def test_memory_backend_expires_entries_but_not_counters():
+    backend = MemoryBackend(max_entries=1)
+    backend.set('a', b'1', 0.01)
+    assert not backend.add('a', b'2', 0.01)
+    time.sleep(0.02)
+    assert backend.get('a') is None
+    assert backend.add('a', b'2', None)
+    backend.incr('gen:seekers')
+    backend.set('b', b'3', None)
+    assert backend.get_counter('gen:seekers') == 1
+
+
+def test_backend_failures_are_misses():
+    cache = ResponseCache(BrokenBackend())
+    cache.set('seeker:1', make_entry('{}'), 60)
+    assert cache.get('seeker:1') is None
+    assert cache.stats()['errors'] == 2
+
+
+def seeker(client, email):
+    register(client, 'seeker', email, skill='Home Cleaning', location='Hyderabad',
+             time_period='hour', years_of_experience=3, base_price=20)
+
+
+def test_profile_answers_matching_etag_with_304_until_it_changes(client):
+    seeker(client, 'cleaner@example.com')
+    response = client.get('/api/seeker/1')
+    etag = response.headers['ETag']
+    assert response.headers['Cache-Control'].startswith('public, max-age=')
+
+    hits = core.response_cache.stats()['hits']
+    response = client.get('/api/seeker/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+    assert core.response_cache.stats()['hits'] == hits + 1
+
+    token = register(client, 'provider', 'client@example.com')
+    client.post('/api/seeker/1/reviews', json={'rating': 5}, headers=auth(token))
+    response = client.get('/api/seeker/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+    assert response.get_json()['reviews'] == 1
+
+
+def test_seeker_writes_retire_cached_searches(client):
+    seeker(client, 'first@example.com')
+
+    def names():
+        return [row['name'] for row in client.get('/api/seekers').get_json()]
+
+    assert names() == ['first']
+    hits = core.response_cache.stats()['hits']
+    assert names() == ['first']
+    assert core.response_cache.stats()['hits'] == hits + 1
+
+    seeker(client, 'second@example.com')
+    assert sorted(names()) == ['first', 'second']
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from api.config import ConfigError, Settings, load_settings
+
+
+def test_defaults_are_valid():
+    settings = load_settings(environ={})
+    assert settings == Settings()
+    assert settings.pool.size == 10 and settings.rate_limit.enabled
+
+
+def test_environment_values_are_coerced_to_each_field_type():
+    settings = load_settings(environ={
+        'FREELANCER_DB_PORT': '3306',
+        'FREELANCER_POOL_TIMEOUT': '2.5',
+        'FREELANCER_RATE_LIMIT_ENABLED': 'off',
+        'FREELANCER_CACHE_URL': '',
+        'FREELANCER_REPLICAS_HOSTS': '[{"host": "replica1", "port": 3307}]',
+        'FREELANCER_ADMIN_PROVIDERS': '[1, 7]',
+        'FREELANCER_UNRELATED': 'ignored',
+    })
+    assert settings.db.port == 3306
+    assert settings.pool.timeout == 2.5
+    assert settings.rate_limit.enabled is False
+    assert settings.cache.url is None
+    assert settings.replicas.hosts == [{'host': 'replica1', 'port': 3307}]
+    assert settings.admin.providers == [1, 7]
+
+
+def test_environment_overrides_the_config_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'db': {'host': 'db1', 'port': 3310}, 'pool': {'size': 20}}))
+    settings = load_settings(environ={'FREELANCER_CONFIG': str(path), 'FREELANCER_DB_HOST': 'db2'})
+    assert (settings.db.host, settings.db.port, settings.pool.size) == ('db2', 3310, 20)
+
+
+def test_every_problem_is_reported_at_once(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'pool': {'size': 0, 'sise': 5}, 'caches': {}, 'server': {'threads': '4'}}))
+    with pytest.raises(ConfigError) as error:
+        load_settings(environ={'FREELANCER_DB_PORT': 'mysql', 'FREELANCER_REPLICAS_HOSTS': 'replica1',
+                               'FREELANCER_CACHE_BACKEND': 'redis'}, path=str(path))
+    problems = error.value.problems
+    assert 'pool.sise is not a known setting' in problems
+    assert 'caches is not a known settings section' in problems
+    assert 'pool.size must be at least 1' in problems
+    assert 'cache.url is required with the redis backend' in problems
+    assert any(problem.startswith('db.port:') for problem in problems)
+    assert any(problem.startswith('replicas.hosts:') for problem in problems)
+    # Numbers may be quoted in the file, as they would be in the environment
+    assert not any(problem.startswith('server.threads') for problem in problems)
+
+
+@pytest.mark.parametrize('environ, problem', [
+    ({'FREELANCER_RATE_LIMIT_LIMITS': '{"auth_ip": [30, 0]}'}, 'rate_limit.limits.auth_ip'),
+    ({'FREELANCER_SERVER_LOG_LEVEL': 'LOUD'}, 'server.log_level'),
+    ({'FREELANCER_REPLICAS_STICKINESS': '1'}, 'replicas.stickiness'),
+    ({'FREELANCER_JWT_KEYS': '{"v2": "secret"}'}, 'jwt.active_kid'),
+    ({'FREELANCER_SERVER_CHECK_SCHEMA_ON_STARTUP': 'maybe'}, 'server.check_schema_on_startup'),
+])
+def test_invalid_values_are_rejected(environ, problem):
+    with pytest.raises(ConfigError) as error:
+        load_settings(environ=environ)
+    assert any(message.startswith(problem) for message in error.value.problems)
+
+
+def test_unreadable_config_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{"db": ')
+    with pytest.raises(ConfigError, match='cannot read config file'):
+        load_settings(environ={}, path=str(path))
+    path.write_text('[]')
+    with pytest.raises(ConfigError, match='must hold a JSON object'):
+        load_settings(environ={}, path=str(path))
@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from api.utils import geo
+from conftest import register
+
+
+def test_geohash_matches_the_reference_encoding():
+    assert geo.encode(57.64911, 10.40744) == 'u4pruydqq'
+    assert geo.encode(57.64911, 10.40744, precision=5) == 'u4pru'
+    assert geo.cell_size(5) == (180 / 2 ** 12, 360 / 2 ** 13)
+
+
+def test_locations_resolve_by_name_alias_or_part():
+    assert geo.geocode('Bangalore') == geo.geocode('  bengaluru ')
+    assert geo.geocode('Koramangala, Bengaluru') == geo.geocode('Bengaluru')
+    assert geo.resolve_point('Remote') == (None, None, None)
+    assert geo.resolve_point('Remote', '17.4', '78.4')[2] == geo.encode(17.4, 78.4)
+    with pytest.raises(ValueError):
+        geo.resolve_point('', 'north', '78.4')
+    with pytest.raises(ValueError):
+        geo.parse_point('91,0')
+
+
+@pytest.mark.parametrize('latitude, longitude, radius', [
+    (17.385, 78.4867, 5), (17.385, 78.4867, 120), (0.001, -0.001, 30), (-33.87, 151.21, 1), (89.5, 10.0, 50),
+])
+def test_covering_cells_contain_every_point_in_the_circle(latitude, longitude, radius):
+    cells = geo.covering_cells(latitude, longitude, radius)
+    assert 0 < len(cells) <= 32
+    rng = random.Random(1)
+    for _ in range(500):
+        # A random point inside the circle (or on its edge)
+        distance, bearing = radius * math.sqrt(rng.random()), rng.uniform(0, 2 * math.pi)
+        point_lat = latitude + distance / geo.KM_PER_DEGREE * math.cos(bearing)
+        point_lng = longitude + distance / (geo.KM_PER_DEGREE * math.cos(math.radians(point_lat))) * math.sin(bearing)
+        if not (-90 <= point_lat <= 90 and -180 <= point_lng <= 180):
+            continue
+        if geo.haversine_km(latitude, longitude, point_lat, point_lng) > radius:
+            continue
+        geohash = geo.encode(point_lat, point_lng)
+        assert any(geohash.startswith(cell) for cell in cells), (point_lat, point_lng)
+
+
+def test_haversine_distance():
+    assert geo.haversine_km(17.385, 78.4867, 17.385, 78.4867) == 0
+    assert 495 < geo.haversine_km(17.385, 78.4867, 12.9716, 77.5946) < 505
+
+
+def seeker(location, **fields):
+    return dict({'skill': 'Plumbing', 'location': location, 'time_period': 'hour',
+                 'years_of_experience': 3, 'base_price': 20}, **fields)
+
+
+def test_near_search_returns_seekers_inside_the_radius_nearest_first(client):
+    register(client, 'seeker', 'far@example.com', **seeker('Bengaluru'))
+    register(client, 'seeker', 'remote@example.com', **seeker('Remote'))
+    register(client, 'seeker', 'madhapur@example.com', **seeker('Madhapur', latitude='17.4483', longitude='78.3915'))
+    register(client, 'seeker', 'centre@example.com', **seeker('Hyderabad'))
+
+    response = client.get('/api/seekers', query_string={'near': '17.44,78.39', 'radius': 25})
+    rows = response.get_json()
+    assert [row['name'] for row in rows] == ['madhapur', 'centre']
+    assert rows[0]['distanceKm'] < rows[1]['distanceKm'] < 25
+
+    assert client.get('/api/seekers', query_string={'near': '17.44,78.39', 'radius': 0}).status_code == 400
+    assert client.get('/api/seekers', query_string={'near': 'hyderabad'}).status_code == 400
+    assert client.get('/api/seekers', query_string={'sort': 'distance'}).status_code == 400
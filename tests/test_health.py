@@ -0,0 +1,86 @@
+import argparse
+
+import pytest
+from mysql.connector import Error
+
+import api.app as core
+from api import server
+from api.db.pool import ConnectionPool
+
+
+@pytest.fixture
+def fresh_probe(monkeypatch):
+    monkeypatch.setattr(core, '_readiness', {'checked_at': None, 'ready': False, 'error': None})
+
+
+def refusing_pool():
+    def connect():
+        raise Error(msg="Can't connect to MySQL server (connection refused)", errno=2003)
+
+    return ConnectionPool(connect, size=1, max_overflow=0, name='down')
+
+
+def test_liveness_never_touches_the_database(client, monkeypatch):
+    monkeypatch.setattr(core, 'db_pool', refusing_pool())
+    assert client.get('/healthz').get_json() == {'status': 'alive'}
+
+
+def test_readiness_follows_the_database(client, fresh_probe, monkeypatch):
+    assert client.get('/readyz').get_json() == {'status': 'ready'}
+
+    pool = core.db_pool
+    monkeypatch.setattr(core, 'db_pool', refusing_pool())
+    # Within READINESS_TTL the last result is reused, so probes cannot pile onto the database
+    assert client.get('/readyz').status_code == 200
+
+    monkeypatch.setattr(core, 'READINESS_TTL', 0)
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    assert 'connection refused' in response.get_json()['error']
+
+    monkeypatch.setattr(core, 'db_pool', pool)
+    assert client.get('/readyz').status_code == 200
+
+
+def test_readiness_fails_on_an_unmigrated_database(client, fresh_probe):
+    with core.db_pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (core.migrations.LATEST_VERSION,))
+        connection.commit()
+        cursor.close()
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    assert 'migrate' in response.get_json()['error']
+
+
+def options(**overrides):
+    args = dict(bind='127.0.0.1:5000', workers=2, threads=4, timeout=30, graceful_timeout=30, keepalive=2,
+                max_requests=1000, access_log=None, preload=False, asgi=False)
+    args.update(overrides)
+    return server.build_options(argparse.Namespace(**args))
+
+
+def test_launcher_options():
+    sync = options()
+    assert sync['worker_class'] == 'gthread' and sync['threads'] == 4
+    assert sync['max_requests_jitter'] == 100
+    assert sync['post_fork'] is server.post_fork
+
+    asgi = options(asgi=True, max_requests=0)
+    assert asgi['worker_class'] == 'uvicorn.workers.UvicornWorker' and 'threads' not in asgi
+    assert asgi['max_requests_jitter'] == 0
+
+
+def test_forked_worker_starts_with_an_empty_pool(client):
+    inherited = core.db_pool.acquire()
+
+    class Worker:
+        pid = 1234
+
+    class Log:
+        def info(self, message):
+            pass
+
+    server.post_fork(type('Server', (), {'log': Log()})(), Worker())
+    assert core.db_pool.stats()['in_use'] == 0
+    assert core.db_pool.acquire() is not inherited
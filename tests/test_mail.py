@@ -0,0 +1,29 @@
+import smtplib
+
+from api.utils.mail import Mailer
+
+
+class RecordingSMTP:
+    sent = []
+
+    def __init__(self, host, port, timeout):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+
+def test_line_breaks_in_headers_are_flattened(monkeypatch):
+    monkeypatch.setattr(smtplib, 'SMTP', RecordingSMTP)
+    Mailer(host='mail.example.com').send('seeker@example.com', "Mallory\r\nBcc: victim@example.com reviewed you",
+                                         "Hi\n")
+
+    message = RecordingSMTP.sent[-1]
+    assert message['Subject'] == "Mallory Bcc: victim@example.com reviewed you"
+    assert message['Bcc'] is None
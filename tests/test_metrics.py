@@ -0,0 +1,49 @@
+import re
+
+from api.utils.metrics import MetricsRegistry
+from conftest import register
+
+
+def test_histograms_render_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route='/a"b')
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a\\"b"} 5.55',
+        'latency_seconds_count{route="/a\\"b"} 3',
+    ]
+
+
+def test_a_failing_gauge_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.gauge('broken', 'Broken', lambda: 1 / 0)
+    registry.counter('requests_total', 'Requests').inc(2)
+    lines = registry.render().splitlines()
+    assert lines[0].startswith('# broken unavailable')
+    assert lines[-1] == 'requests_total 2'
+
+
+def test_requests_are_counted_by_route_template(client):
+    register(client, 'seeker', 'cleaner@example.com', skill='Home Cleaning', location='Hyderabad',
+             time_period='hour', years_of_experience=3, base_price=20)
+    client.get('/api/seeker/1')
+    client.get('/api/seeker/1')
+
+    text = client.get('/metrics').get_data(as_text=True)
+    count = re.search(r'^http_requests_total\{method="GET",route="/api/seeker/<int:seeker_id>",status="200"\} (\d+)$',
+                      text, re.MULTILINE)
+    assert count and int(count.group(1)) >= 2
+    assert '# TYPE db_pool_connections gauge' in text
+
+
+def test_server_timing_reports_database_work(client):
+    register(client, 'seeker', 'cleaner@example.com', skill='Home Cleaning', location='Hyderabad',
+             time_period='hour', years_of_experience=3, base_price=20)
+    timing = client.get('/api/seeker/1').headers['Server-Timing']
+    assert re.fullmatch(r'total;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries, 1 rows", pool;dur=[\d.]+', timing)
+    # Served from the response cache: no database work at all
+    assert 'desc="0 queries, 0 rows"' in client.get('/api/seeker/1').headers['Server-Timing']
@@ -0,0 +1,165 @@
+import sqlite3
+
+import pytest
+
+from api.db import migrations
+from api.db.sqlite import SQLiteConnection, create_schema
+
+
+class ScriptedCursor:
+    """Records statements and answers the runner's lock, version and ``information_schema`` checks."""
+
+    def __init__(self, database):
+        self.database = database
+        self.answer = None
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        self.database.statements.append(query)
+        if 'GET_LOCK' in query:
+            self.answer = (self.database.lock,)
+        elif 'RELEASE_LOCK' in query:
+            self.answer = (1,)
+        elif 'MAX(version)' in query:
+            self.answer = (self.database.version,)
+        elif 'information_schema' in query:
+            self.answer = (1,) if self.database.existing else None
+        elif query == migrations.queries.SEEKER_ID_RANGE:
+            self.answer = (None, None)
+        elif query.startswith('INSERT INTO schema_migrations'):
+            self.database.version = params[0]
+
+    def fetchone(self):
+        return self.answer
+
+    def close(self):
+        pass
+
+
+class ScriptedDatabase:
+    def __init__(self, version=0, existing=False, lock=1):
+        self.version = version
+        self.existing = existing
+        self.lock = lock
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, **kwargs):
+        return ScriptedCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def ddl(self):
+        return [s for s in self.statements if s.startswith(('CREATE', 'ALTER'))]
+
+
+def test_registry_is_ordered_and_complete():
+    versions = [version for version, _, _ in migrations.MIGRATIONS]
+    assert versions == list(range(1, migrations.LATEST_VERSION + 1))
+    with pytest.raises(ValueError):
+        migrations.migration(migrations.LATEST_VERSION + 2, 'gap')(lambda cursor: None)
+
+
+def test_upgrade_applies_pending_migrations_in_order_under_the_lock():
+    database = ScriptedDatabase(version=2)
+    assert migrations.upgrade(database, target=4) == [3, 4]
+    assert database.version == 4 and database.commits == 2
+    assert 'GET_LOCK' in database.statements[0]
+    assert 'RELEASE_LOCK' in database.statements[-1]
+    # Online DDL only: no statement may fall back to a blocking table copy
+    for statement in database.ddl():
+        if statement.startswith('ALTER'):
+            assert 'ALGORITHM=INSTANT' in statement or 'LOCK=NONE' in statement
+
+
+def test_rerun_over_existing_objects_issues_no_ddl():
+    # A database created by the old /api/init-db, or a migration interrupted halfway
+    database = ScriptedDatabase(existing=True)
+    migrations.upgrade(database, target=6)
+    assert database.version == 6
+    assert database.ddl() == []
+
+
+def test_upgrade_refuses_to_run_without_the_lock():
+    database = ScriptedDatabase(lock=0)
+    with pytest.raises(migrations.MigrationLockError):
+        migrations.upgrade(database)
+    assert database.version == 0 and database.ddl() == []
+    assert 'RELEASE_LOCK' not in database.statements[-1]
+
+
+def test_fulltext_index_keeps_reads_open():
+    database = ScriptedDatabase()
+    migrations.ensure_index(database.cursor(), 'seeker', *migrations.SEEKER_FULLTEXT_INDEX, kind='FULLTEXT')
+    assert database.ddl()[0].endswith('ALGORITHM=INPLACE, LOCK=SHARED')
+
+
+def test_check_schema_refuses_a_database_behind_the_code(tmp_path):
+    path = str(tmp_path / 'schema.sqlite3')
+    create_schema(path)
+    connection = SQLiteConnection(path)
+    assert migrations.check_schema(connection) == migrations.LATEST_VERSION
+
+    connection.cursor().execute("DELETE FROM schema_migrations WHERE version = %s", (migrations.LATEST_VERSION,))
+    connection.commit()
+    with pytest.raises(migrations.SchemaMismatchError):
+        migrations.check_schema(connection)
+    assert [entry[0] for entry in migrations.pending(connection)] == [migrations.LATEST_VERSION]
+    connection.close()
+
+
+@pytest.fixture
+def seekers(tmp_path):
+    path = str(tmp_path / 'backfill.sqlite3')
+    create_schema(path)
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO seeker (id, name, phone_number, email, skill, years_of_experience, location, "
+            "time_period, base_price, rating, reviews, password) "
+            "VALUES (?, 'seeker', '9000000000', ?, 'plumbing', 3, ?, 'full-time', 500, 4.5, 2, 'x')",
+            [(seeker_id, f'seeker{seeker_id}@example.com', location)
+             for seeker_id, location in [(1, 'Pune'), (2, 'Remote'), (3, 'Bangalore'), (7, 'Pune'), (8, 'Pune')]]
+        )
+    connection = SQLiteConnection(path)
+    yield connection
+    connection.close()
+
+
+class CommitCounter:
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.commits = 0
+
+    def execute(self, query, params=()):
+        if query == "COMMIT":
+            self.commits += 1
+        self.cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+def test_id_ranges_cover_gaps_in_the_primary_key(seekers):
+    assert migrations.seeker_id_ranges(seekers.cursor(), batch=3) == [(1, 3), (4, 6), (7, 9)]
+
+
+def test_backfill_commits_each_range_and_skips_filled_rows(seekers, monkeypatch):
+    ranges = migrations.seeker_id_ranges
+    monkeypatch.setattr(migrations, 'seeker_id_ranges', lambda cursor: ranges(cursor, batch=3))
+    cursor = CommitCounter(seekers.cursor())
+
+    assert migrations.backfill_in_batches(cursor, migrations.queries.SEEKER_BACKFILL_RATING_TOTAL) == 5
+    assert cursor.commits == 2  # ids 1-3 and 7-9; the empty 4-6 range commits nothing
+    assert migrations.backfill_in_batches(cursor, migrations.queries.SEEKER_BACKFILL_RATING_TOTAL) == 0
+    assert cursor.commits == 2
+    cursor.execute("SELECT DISTINCT rating_total FROM seeker")
+    assert cursor.fetchall() == [(9,)]
+
+
+def test_geocoding_backfill_leaves_unknown_locations_empty(seekers):
+    cursor = seekers.cursor()
+    assert migrations.backfill_seeker_points(cursor) == 4
+    cursor.execute("SELECT id FROM seeker WHERE geohash IS NULL")
+    assert cursor.fetchall() == [(2,)]
+    assert migrations.backfill_seeker_points(cursor) == 0
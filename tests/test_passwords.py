@@ -0,0 +1,42 @@
+import hashlib
+
+import pytest
+
+from api.utils import passwords
+from api.utils.passwords import PasswordHasher
+
+
+@pytest.fixture
+def derivations(monkeypatch):
+    """Count key derivations run by a cheap inline hasher."""
+    calls = []
+    derive = passwords.derive
+
+    def counting_derive(*args):
+        calls.append(args[0])
+        return derive(*args)
+
+    monkeypatch.setattr(passwords, 'derive', counting_derive)
+    return calls
+
+
+def test_every_login_outcome_costs_one_derivation(derivations):
+    hasher = PasswordHasher(scrypt_n=1024, processes=0)
+    legacy = hashlib.sha256(b'secret').hexdigest()
+    current = hasher.hash('secret')
+
+    for stored, password in ((legacy, 'wrong'), (legacy, 'secret'), (current, 'wrong'), (current, 'secret'),
+                             (hasher.dummy_hash(), 'secret')):
+        derivations.clear()
+        hasher.verify(password, stored)
+        assert derivations == ['scrypt'], (stored, password)
+
+
+def test_legacy_hashes_are_upgraded_on_login():
+    hasher = PasswordHasher(scrypt_n=1024, processes=0)
+    legacy = hashlib.sha256(b'secret').hexdigest()
+
+    assert hasher.verify('wrong', legacy) == (False, None)
+    valid, new_hash = hasher.verify('secret', legacy)
+    assert valid and new_hash.startswith('scrypt$1024$')
+    assert hasher.verify('secret', new_hash) == (True, None)
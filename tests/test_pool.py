@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from api.db.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.closed = False
+        self.fail_rollback = False
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise OSError("connection lost")
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options):
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection(len(opened) + 1))
+        return opened[-1]
+
+    options.setdefault('ping', lambda connection: not connection.closed)
+    return ConnectionPool(connect, name='test', **options), opened
+
+
+def test_idle_connections_are_reused_and_overflow_is_closed():
+    pool, opened = make_pool(size=1, max_overflow=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert len(opened) == 2
+
+    pool.release(second)
+    pool.release(first)
+    # Only 'size' connections stay open between requests
+    assert second.closed and not first.closed
+    assert pool.acquire() is first
+    assert pool.stats()['connects'] == 2
+
+
+def test_checkout_times_out_when_every_connection_is_in_use():
+    pool, _ = make_pool(size=1, max_overflow=0)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_waiter_gets_the_released_connection():
+    pool, opened = make_pool(size=1, max_overflow=0)
+    connection = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(connection)
+    waiter.join(5)
+    assert borrowed == [connection]
+    assert len(opened) == 1
+
+
+def test_release_rolls_back_an_open_transaction():
+    pool, _ = make_pool(size=1)
+    with pool.connection() as connection:
+        connection.in_transaction = True
+    assert connection.rollbacks == 1 and not connection.closed
+
+    with pool.connection() as connection:
+        connection.in_transaction = True
+        connection.fail_rollback = True
+    # A connection that cannot be rolled back is never handed out again
+    assert connection.closed
+    assert pool.stats()['discarded'] == 1
+    assert pool.acquire() is not connection
+
+
+def test_old_and_dead_connections_are_replaced_on_checkout():
+    pool, opened = make_pool(size=1, recycle=60, ping_after=0)
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.closed = True  # the server dropped it while idle
+    assert pool.acquire() is opened[1]
+    assert pool.stats()['stale'] == 1
+
+    pool, opened = make_pool(size=1, recycle=0)
+    pool.release(pool.acquire())
+    assert pool.acquire() is opened[1]
+    assert pool.stats()['recycled'] == 1
+
+
+def test_failed_connect_frees_its_place():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("refused")
+        return FakeConnection(len(attempts))
+
+    pool = ConnectionPool(connect, size=1, max_overflow=0, name='test')
+    with pytest.raises(OSError):
+        pool.acquire(timeout=0.05)
+    assert pool.acquire(timeout=0.05).number == 2
+    assert pool.stats()['connect_errors'] == 1
+
+
+def test_forked_child_forgets_inherited_connections():
+    pool, opened = make_pool(size=1, max_overflow=0)
+    inherited = pool.acquire()
+    # As if this process were a child forked while 'inherited' was checked out
+    pool._pid = -1
+    connection = pool.acquire(timeout=0.05)
+    assert connection is not inherited and connection is opened[1]
+    assert pool.stats()['in_use'] == 1
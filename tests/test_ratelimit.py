@@ -0,0 +1,125 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import api.app as core
+from api.utils import ratelimit
+from api.utils.ratelimit import AdmissionController, AdmissionRejected, MemoryBucketStore, RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(ratelimit, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_bucket_allows_a_burst_then_refills_at_its_rate(clock):
+    store = MemoryBucketStore()
+    assert [store.take('ip', rate=0.5, burst=3) for _ in range(3)] == [0, 0, 0]
+    assert store.take('ip', rate=0.5, burst=3) == 2.0
+    clock.value += 1
+    assert store.take('ip', rate=0.5, burst=3) == 1.0
+    clock.value += 1
+    assert store.take('ip', rate=0.5, burst=3) == 0
+    # A bucket never fills beyond its burst, however long it was idle
+    clock.value += 3600
+    assert [store.take('ip', rate=0.5, burst=3) for _ in range(4)][-1] > 0
+
+
+def test_bucket_store_forgets_least_recent_keys(clock):
+    store = MemoryBucketStore(max_keys=2)
+    for key in ('a', 'b', 'a', 'c'):
+        store.take(key, rate=1, burst=1)
+    assert store.stats()['keys'] == 2
+    assert store.take('b', rate=1, burst=1) == 0  # evicted, so it starts full again
+    assert store.take('c', rate=1, burst=1) > 0
+
+
+def test_limiter_counts_rejections_and_fails_open(clock):
+    limiter = RateLimiter(MemoryBucketStore(), {'auth_ip': (60, 1)})
+    assert limiter.check('auth_ip', '10.0.0.1') == 0
+    assert limiter.check('auth_ip', '10.0.0.1') == 1.0
+    assert limiter.check('auth_ip', '10.0.0.2') == 0
+    assert limiter.stats()['rejected'] == {'auth_ip': 1}
+
+    class BrokenStore(MemoryBucketStore):
+        def take(self, key, rate, burst, cost=1):
+            raise ConnectionError("redis unavailable")
+
+    assert RateLimiter(BrokenStore(), {'auth_ip': (60, 1)}).check('auth_ip', '10.0.0.1') == 0
+
+
+def test_login_attempts_are_limited_per_client_and_per_email(client, monkeypatch):
+    monkeypatch.setitem(core.rate_limit_config, 'enabled', True)
+    monkeypatch.setitem(core.rate_limit_config, 'proxy_hops', 1)
+    monkeypatch.setattr(core, 'rate_limiter', RateLimiter(MemoryBucketStore(), {
+        'auth_ip': (1, 3), 'login_email': (1, 2), 'register_email': (1, 2)}))
+
+    def login(email, client_ip):
+        return client.post('/api/provider/login', json={'email': email, 'password': 'wrong'},
+                           headers={'X-Forwarded-For': client_ip})
+
+    assert [login('a@example.com', '10.0.0.1').status_code for _ in range(2)] == [401, 401]
+    response = login('a@example.com', '10.0.0.2')
+    assert response.status_code == 429 and int(response.headers['Retry-After']) >= 1
+    assert login('b@example.com', '10.0.0.1').status_code == 401
+    # The address comes from the trusted proxy's X-Forwarded-For, not the proxy itself
+    assert login('c@example.com', '10.0.0.1').status_code == 429
+    assert login('c@example.com', '10.0.0.3').status_code == 401
+
+
+def test_admission_times_out_waiters():
+    admission = AdmissionController(max_inflight=1, queue_timeout=0.05)
+    admission.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected):
+        admission.acquire()
+    assert time.monotonic() - started >= 0.05
+    assert admission.stats()['rejected_timeout'] == 1
+    assert admission.stats()['queued'] == 0
+
+
+def test_admission_hands_slots_to_waiters_in_arrival_order():
+    admission = AdmissionController(max_inflight=1, queue_timeout=5)
+    admission.acquire()
+    admitted = []
+
+    def wait(name):
+        admission.acquire()
+        admitted.append(name)
+
+    threads = []
+    for name in ('first', 'second'):
+        thread = threading.Thread(target=wait, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while admission.stats()['queued'] < len(threads):
+            time.sleep(0.001)
+
+    admission.release()
+    threads[0].join(1)
+    # The released slot went to the oldest waiter; the other still waits its turn
+    assert admitted == ['first']
+    assert admission.stats()['queued'] == 1
+    admission.release()
+    threads[1].join(1)
+    assert admitted == ['first', 'second']
+    assert admission.stats()['inflight'] == 1
+
+
+def test_busy_server_sheds_database_requests_but_keeps_probing(client, monkeypatch):
+    admission = AdmissionController(max_inflight=1, queue_timeout=0.01)
+    monkeypatch.setattr(core, 'admission', admission)
+    admission.acquire()
+
+    response = client.get('/api/seekers')
+    assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+    assert client.get('/healthz').status_code == 200
+
+    admission.release()
+    assert client.get('/api/seekers').status_code == 200
+    assert admission.stats()['inflight'] == 0
@@ -0,0 +1,49 @@
+from mysql.connector import Error, errorcode
+
+from api.db import queries
+from api.db.sqlite import SQLiteCursor
+from conftest import auth, register
+
+
+def deadlock_on(query, times, monkeypatch):
+    """Make the next ``times`` runs of ``query`` fail as an InnoDB deadlock victim would."""
+    execute = SQLiteCursor.execute
+    remaining = [times]
+
+    def failing_execute(self, statement, params=()):
+        if statement == query and remaining[0]:
+            remaining[0] -= 1
+            raise Error(msg="Deadlock found when trying to get lock", errno=errorcode.ER_LOCK_DEADLOCK)
+        return execute(self, statement, params)
+
+    monkeypatch.setattr(SQLiteCursor, 'execute', failing_execute)
+
+
+def seeker_and_provider(client):
+    """Register seeker 1 and a provider; returns the provider's token."""
+    register(client, 'seeker', 'cleaner@example.com', skill='Home Cleaning', location='Hyderabad',
+             time_period='hour', years_of_experience=3, base_price=20)
+    return register(client, 'provider', 'client@example.com')
+
+
+def review(client, token, rating):
+    return client.post('/api/seeker/1/reviews', json={'rating': rating}, headers=auth(token))
+
+
+def test_deadlocked_review_is_retried(client, monkeypatch):
+    token = seeker_and_provider(client)
+
+    deadlock_on(queries.REVIEW_INSERT, 1, monkeypatch)
+    response = review(client, token, 4)
+    assert response.status_code == 201
+    assert response.get_json()['reviews'] == 1
+
+
+def test_repeated_deadlock_is_a_conflict(client, monkeypatch):
+    token = seeker_and_provider(client)
+
+    deadlock_on(queries.REVIEW_INSERT, 2, monkeypatch)
+    assert review(client, token, 4).status_code == 409
+    response = review(client, token, 4)
+    assert response.status_code == 201
+    assert response.get_json()['reviews'] == 1
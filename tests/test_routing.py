@@ -0,0 +1,129 @@
+import time
+
+import pytest
+from mysql.connector import Error
+
+import api.app as core
+from api.db.pool import ConnectionPool
+from api.db.routing import ReplicaRouter
+from api.db.sqlite import SQLiteConnection
+from api.utils.cache import MemoryBackend
+from conftest import auth, register
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_pool(name, size=1, refuse=False):
+    def connect():
+        if refuse:
+            raise Error(msg=f"{name} refused the connection")
+        return FakeConnection()
+
+    return ConnectionPool(connect, size=size, max_overflow=0, name=name, ping=lambda connection: True)
+
+
+@pytest.fixture
+def pools():
+    return make_pool('primary'), make_pool('replica-1'), make_pool('replica-2')
+
+
+def read(router, scopes=()):
+    pool, connection = router.acquire(read_only=True, scopes=scopes)
+    pool.release(connection)
+    return pool.name
+
+
+def test_reads_rotate_over_replicas_and_writes_use_the_primary(pools):
+    primary, *replicas = pools
+    router = ReplicaRouter(primary, replicas, marks=MemoryBackend(), lag_probe=None)
+    assert sorted(read(router) for _ in range(4)) == ['replica-1', 'replica-1', 'replica-2', 'replica-2']
+    pool, _ = router.acquire()
+    assert pool is primary
+    assert router.stats()['replica_reads'] == 4
+
+
+def test_reads_after_a_write_stick_to_the_primary(pools):
+    primary, *replicas = pools
+    router = ReplicaRouter(primary, replicas, marks=MemoryBackend(), stickiness=0.05, lag_probe=None)
+    router.mark_written('seeker:1')
+    assert read(router, scopes=('seeker:1',)) == 'primary'
+    assert read(router, scopes=('seeker:2',)).startswith('replica')
+    assert router.stats()['sticky_reads'] == 1
+
+    # Once the window has passed the scope reads from replicas again
+    time.sleep(0.06)
+    assert read(router, scopes=('seeker:1',)).startswith('replica')
+
+
+def test_unreadable_marks_keep_reads_on_the_primary(pools):
+    class BrokenBackend(MemoryBackend):
+        def get(self, key):
+            raise ConnectionError("cache unavailable")
+
+    primary, *replicas = pools
+    router = ReplicaRouter(primary, replicas, marks=BrokenBackend(), lag_probe=None)
+    assert read(router, scopes=('seeker:1',)) == 'primary'
+
+
+def test_refusing_replica_is_taken_out_of_rotation():
+    primary = make_pool('primary')
+    router = ReplicaRouter(primary, [make_pool('down', refuse=True), make_pool('up')], lag_probe=None)
+    assert {read(router) for _ in range(4)} == {'up'}
+    assert router.healthy() == {'down': False, 'up': True}
+    assert router.stats()['failovers'] == 1
+    assert 'refused' in router.stats()['replicas'][0]['error']
+
+
+def test_busy_replica_falls_back_without_waiting_the_full_timeout(pools):
+    primary, replica, _ = pools
+    router = ReplicaRouter(primary, [replica], lag_probe=None, acquire_timeout=0.01)
+    replica.acquire()
+    assert read(router) == 'primary'
+    # Saturated is not broken: the replica stays in rotation
+    assert router.healthy() == {'replica-1': True}
+
+
+def test_lagging_replica_is_skipped_until_it_catches_up(pools):
+    primary, replica, _ = pools
+    lags = iter([30.0, 0.5])
+    router = ReplicaRouter(primary, [replica], check_interval=0, max_lag=5,
+                           lag_probe=lambda connection: next(lags))
+    assert read(router) == 'primary'
+    assert router.stats()['replicas'][0]['lag_seconds'] == 30.0
+    assert replica.stats()['in_use'] == 0
+    assert read(router) == 'replica-1'
+
+
+def test_broken_replication_counts_as_unhealthy(pools):
+    primary, replica, _ = pools
+    router = ReplicaRouter(primary, [replica], lag_probe=lambda connection: None)
+    assert read(router) == 'primary'
+    assert router.healthy() == {'replica-1': False}
+
+
+def test_new_account_reads_its_own_writes(client, tmp_path, monkeypatch):
+    path = str(tmp_path / 'freelancer.sqlite3')
+    replica = ConnectionPool(lambda: SQLiteConnection(path), name='replica', size=2)
+    router = ReplicaRouter(core.db_pool, [replica], marks=MemoryBackend(), stickiness=60, lag_probe=None)
+    monkeypatch.setattr(core, 'db_router', router)
+
+    assert client.get('/api/seekers').status_code == 200
+    assert router.stats()['replica_reads'] == 1
+
+    # Registering sets the sticky cookie, so this client's anonymous reads now see the write
+    token = register(client, 'seeker', 'new@example.com', skill='plumbing', location='Pune',
+                     time_period='full-time', years_of_experience=3, base_price=500)
+    seekers = client.get('/api/seekers').get_json()
+    assert [seeker['name'] for seeker in seekers] == ['new']
+    assert client.get('/api/seeker/1', headers=auth(token)).status_code == 200
+    assert router.stats()['sticky_reads'] == 2
+    assert router.stats()['replica_reads'] == 1
+    replica.close()
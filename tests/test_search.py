@@ -0,0 +1,111 @@
+import json
+
+import api.app as core
+from api.db.pool import ConnectionPool
+from api.db.routing import ReplicaRouter
+from api.db.sqlite import SQLiteConnection, create_schema
+from api.routes import search
+from api.utils.cache import MemoryBackend
+from conftest import register
+
+
+def seeker(skill, location, time_period='hour'):
+    return {'skill': skill, 'location': location, 'time_period': time_period,
+            'years_of_experience': 3, 'base_price': 20}
+
+
+def test_filters_match_mid_string(client):
+    register(client, 'seeker', 'cleaner@example.com', **seeker('Home Cleaning', 'Madhapur, Hyderabad'))
+    register(client, 'seeker', 'plumber@example.com', **seeker('Plumbing', 'Mumbai', 'day'))
+
+    def names(**params):
+        return [row['name'] for row in client.get('/api/seekers', query_string=params).get_json()]
+
+    assert names(skill='cleaning') == ['cleaner']
+    assert names(location='Hyderabad') == ['cleaner']
+    assert names(skill='lumb', location='mum') == ['plumber']
+    assert names(time_period='ou') == ['cleaner']
+
+
+def test_filters_escape_wildcards(client):
+    register(client, 'seeker', 'cleaner@example.com', **seeker('Home Cleaning', 'Hyderabad'))
+
+    assert client.get('/api/seekers', query_string={'skill': '%'}).get_json() == []
+    assert client.get('/api/seekers', query_string={'skill': 'e_c'}).get_json() == []
+
+
+def test_anonymous_search_sees_own_registration(client, tmp_path, monkeypatch):
+    # A replica that never catches up: only reads pinned to the primary see new accounts
+    replica_path = str(tmp_path / 'replica.sqlite3')
+    create_schema(replica_path)
+    replica = ConnectionPool(lambda: SQLiteConnection(replica_path), name='replica', size=1)
+    monkeypatch.setattr(core, 'db_router', ReplicaRouter(core.db_pool, [replica], marks=MemoryBackend(),
+                                                         lag_probe=None))
+    client.post('/api/seeker/register', json={'name': 'cleaner', 'phone_number': '9000000000',
+                                              'email': 'cleaner@example.com', 'password': 'secret',
+                                              **seeker('Home Cleaning', 'Hyderabad')})
+
+    assert client.application.test_client().get('/api/seekers').get_json() == []
+    assert [row['name'] for row in client.get('/api/seekers').get_json()] == ['cleaner']
+    replica.close()
+
+
+def test_abandoned_stream_drops_its_connection(client, monkeypatch):
+    monkeypatch.setattr(search, 'SEARCH_STREAM_BATCH', 1)
+    for number in range(3):
+        register(client, 'seeker', f'cleaner{number}@example.com', **seeker('Home Cleaning', 'Hyderabad'))
+    discarded = core.db_pool.stats()['discarded']
+
+    response = client.get('/api/seekers', query_string={'stream': 'ndjson'}, buffered=False)
+    next(response.response)
+    # The stream keeps its connection after the view returns...
+    assert core.db_pool.stats()['in_use'] == 1
+    # ...until the client goes away with rows left unread
+    response.close()
+    assert core.db_pool.stats()['in_use'] == 0
+    assert core.db_pool.stats()['discarded'] == discarded + 1
+
+    # A stream read to the end gives its connection back
+    with client.get('/api/seekers', query_string={'stream': 'ndjson'}) as response:
+        assert len(response.data.splitlines()) == 3
+    assert core.db_pool.stats()['discarded'] == discarded + 1
+    assert core.db_pool.stats()['in_use'] == 0
+
+
+def test_autocomplete_suggests_registered_terms(client):
+    register(client, 'seeker', 'cleaner@example.com', **seeker('Home Cleaning', 'Hyderabad'))
+    register(client, 'seeker', 'plumber@example.com', **seeker('Plumbing', 'Hyderabad'))
+
+    def suggest(**params):
+        response = client.get('/api/seekers/autocomplete', query_string=params)
+        return response.status_code, response.get_json()
+
+    assert suggest(q='pl') == (200, [{'value': 'Plumbing', 'count': 1}])
+    assert suggest(q='hyd', field='location') == (200, [{'value': 'Hyderabad', 'count': 2}])
+    # Registered after the index loaded, so only the incremental update can show it
+    register(client, 'seeker', 'painter@example.com', **seeker('Painting', 'Pune'))
+    assert suggest(q='pa') == (200, [{'value': 'Painting', 'count': 1}])
+    assert suggest(q='x', field='email')[0] == 400
+
+
+def test_streams_match_the_paged_results(client):
+    for number, price in enumerate([40, 20, 30, 20, 10, 20, 50]):
+        register(client, 'seeker', f'cleaner{number}@example.com',
+                 **dict(seeker('Home Cleaning', 'Hyderabad'), base_price=price))
+    query = {'sort': 'base_price', 'skill': 'clean'}
+
+    paged, cursor = [], None
+    while True:
+        response = client.get('/api/seekers', query_string=dict(query, limit=2, **({'cursor': cursor} if cursor else {})))
+        paged.extend(response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert [float(row['basePrice']) for row in paged] == [10, 20, 20, 20, 30, 40, 50]
+
+    with client.get('/api/seekers', query_string=dict(query, stream='json')) as response:
+        assert response.get_json() == paged
+    with client.get('/api/seekers', query_string=dict(query, stream='ndjson', limit=3)) as response:
+        assert response.mimetype == 'application/x-ndjson'
+        assert [json.loads(line) for line in response.data.splitlines()] == paged[:3]
+    assert client.get('/api/seekers', query_string={'stream': 'csv'}).status_code == 400
@@ -0,0 +1,43 @@
+from api.utils.search_index import SeekerSearchIndex, TermIndex, fulltext_query
+
+
+def test_fulltext_query_requires_every_word_and_drops_operators():
+    assert fulltext_query('Home  cleaning') == '+home* +cleaning*'
+    assert fulltext_query('-plumb* "AC" (repair) ~ab') == '+plumb* +repair*'
+    assert fulltext_query('a b') == ''
+
+
+def test_prefix_matches_rank_by_usage():
+    index = TermIndex.build([('Plumbing', 2), ('Plasterer', 5), ('Painting', 9), ('plumbing', 1)])
+    assert index.complete('pl') == [('Plasterer', 5), ('Plumbing', 3)]
+    assert index.complete('PL', limit=1) == [('Plasterer', 5)]
+    assert index.complete('   ') == []
+
+
+def test_multi_term_values_are_split():
+    index = TermIndex.build([('React, Node.js', 1), ('react', 2)])
+    assert len(index) == 2
+    assert index.complete('re') == [('React', 3)]
+    assert index.complete('node') == [('Node.js', 1)]
+
+
+def test_trigrams_fill_in_infix_matches_and_typos():
+    index = TermIndex.build([('Home Cleaning', 4), ('Carpet Cleaning', 1), ('Carpentry', 2)])
+    assert {value for value, _ in index.complete('cleaning')} == {'Home Cleaning', 'Carpet Cleaning'}
+    assert index.complete('carpnetry')[0] == ('Carpentry', 2)
+    # Prefix matches always come before fuzzy ones
+    assert index.complete('carp')[:2] == [('Carpentry', 2), ('Carpet Cleaning', 1)]
+
+
+def test_added_terms_are_visible_before_the_next_rebuild():
+    index = SeekerSearchIndex(ttl=300)
+    index.add_seeker('Welding', 'Pune')
+    assert index.complete('skill', 'wel') == []  # nothing loaded yet; the first lookup rebuilds
+
+    loads = []
+    index.refresh(lambda: loads.append(1) or [('skill', 'Plumbing', 3), ('location', 'Pune', 3)])
+    index.refresh(lambda: loads.append(1) or [])
+    assert loads == [1]
+    index.add_seeker('Welding', 'Pune')
+    assert index.complete('skill', 'wel') == [('Welding', 1)]
+    assert index.complete('location', 'pu') == [('Pune', 4)]
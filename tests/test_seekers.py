@@ -0,0 +1,46 @@
+import pytest
+
+from api.db import queries
+from conftest import register
+
+
+@pytest.fixture
+def seekers(client):
+    for number, skill in enumerate(['Plumbing', 'Painting', 'Carpentry'], start=1):
+        register(client, 'seeker', f'seeker{number}@example.com', skill=skill, location='Pune',
+                 time_period='hour', years_of_experience=number, base_price=20)
+
+
+def test_batch_returns_the_profiles_in_request_order(client, seekers):
+    response = client.get('/api/seekers/batch', query_string={'ids': '3,9,1,3'})
+    body = response.get_json()
+    assert [seeker['id'] for seeker in body['seekers']] == [3, 1]
+    assert body['missing'] == [9]
+    # Each profile is exactly what GET /api/seeker/<id> returns
+    assert body['seekers'][0] == client.get('/api/seeker/3').get_json()
+
+    assert client.post('/api/seekers/batch', json={'ids': [3, 9, 1, 3]}).get_json() == body
+    assert client.post('/api/seekers/batch', json=[3, 9, 1]).get_json() == body
+
+
+def test_batch_fetches_uncached_profiles_in_one_query(client, seekers):
+    client.get('/api/seeker/2')
+
+    def queries_for(ids):
+        timing = client.get('/api/seekers/batch', query_string={'ids': ids}).headers['Server-Timing']
+        return timing.split('desc="')[1].split(' queries')[0]
+
+    assert queries_for('1,2,3') == '1'
+    # Every profile is cached now
+    assert queries_for('3,2,1') == '0'
+
+
+@pytest.mark.parametrize('ids', ['', ',', '1,x', '0', '-2', '1.5'])
+def test_batch_rejects_malformed_ids(client, ids):
+    assert client.get('/api/seekers/batch', query_string={'ids': ids}).status_code == 400
+
+
+@pytest.mark.parametrize('body', [{'ids': []}, {'ids': [True]}, {'ids': [None]}, 'ids',
+                                  {'ids': list(range(1, queries.MAX_BATCH_IDS + 2))}])
+def test_batch_rejects_malformed_bodies(client, body):
+    assert client.post('/api/seekers/batch', json=body).status_code == 400
@@ -0,0 +1,32 @@
+import api.app as core
+from conftest import register
+
+
+def login(client, email):
+    register(client, 'provider', email)
+    return client.post('/api/provider/login', json={'email': email, 'password': 'secret'}).get_json()
+
+
+def refresh(client, refresh_token):
+    return client.post('/api/token/refresh', json={'refreshToken': refresh_token})
+
+
+def test_refresh_tokens_work_once(client):
+    tokens = login(client, 'client@example.com')
+
+    response = refresh(client, tokens['refreshToken'])
+    assert response.status_code == 200
+    assert refresh(client, tokens['refreshToken']).status_code == 401
+    # The replacement is good for one more refresh
+    assert refresh(client, response.get_json()['refreshToken']).status_code == 200
+
+
+def test_refresh_requires_an_existing_account(client):
+    tokens = login(client, 'client@example.com')
+    with core.db_pool.connection() as connection:
+        connection.cursor().execute("DELETE FROM provider WHERE email = %s", ('client@example.com',))
+        connection.commit()
+
+    response = refresh(client, tokens['refreshToken'])
+    assert response.status_code == 401
+    assert response.get_json() == {'error': 'Account no longer exists'}